@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+import numpy as np
+
+from brainlet.jsonl import read_jsonl
+
+DEFAULT_QUESTIONS = [
+    "what is anarchism?",
+    "what is albedo?",
+    "who wrote the declaration of independence?",
+    "when did the second world war end?",
+    "what is the capital of france?",
+]
+
+
+def load_questions(filename: Optional[str]) -> list[str]:
+    if filename is None:
+        return DEFAULT_QUESTIONS
+    return [sample["question"] for sample in read_jsonl(filename)]
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    questions: list[str],
+    concurrency: int,
+    requests: int,
+    use_cache: bool = False,
+) -> dict:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int):
+        async with semaphore:
+            question = questions[i % len(questions)]
+            start = time.perf_counter()
+            # Questions repeat, so cached answers would make every request after the first a cache hit.
+            params = {"question": question, "cache": str(use_cache).lower()}
+            response = await client.get("/", params=params)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+        "rps": requests / elapsed,
+    }
+
+
+async def run(
+    url: str,
+    concurrency: list[int],
+    requests: int,
+    questions_file: Optional[str] = None,
+    timeout: float = 300.0,
+    use_cache: bool = False,
+    **kwargs,
+):
+    questions = load_questions(questions_file)
+    limits = httpx.Limits(max_connections=max(concurrency))
+
+    async with httpx.AsyncClient(
+        base_url=url, timeout=timeout, limits=limits
+    ) as client:
+        # Warm up connections and weaviate caches before measuring.
+        await measure(client, questions, 1, len(questions), use_cache)
+
+        print(
+            f"{'in-flight':>9} {'requests':>8} {'p50, s':>8} {'p99, s':>8} {'rps':>8}"
+        )
+        for level in concurrency:
+            result = await measure(client, questions, level, requests, use_cache)
+            print(
+                f"{result['concurrency']:>9} {result['requests']:>8} "
+                f"{result['p50']:>8.3f} {result['p99']:>8.3f} {result['rps']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure brainlet API latency with different number of in-flight requests"
+    )
+    parser.add_argument("-u", "--url", type=str, default="http://127.0.0.1:80")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    parser.add_argument(
+        "-n", "--requests", type=int, default=64, help="requests per concurrency level"
+    )
+    parser.add_argument(
+        "-q",
+        "--questions-file",
+        type=str,
+        help="jsonl file with questions. Each sample have to has `question` property",
+    )
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="answer repeated questions from the answer cache, by default the cache is bypassed",
+    )
+
+    asyncio.run(run(**vars(parser.parse_args())))
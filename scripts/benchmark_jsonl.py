@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import random
+import string
+import tempfile
+import time
+from typing import Iterator, Optional
+
+from brainlet import jsonl
+
+
+def generate_documents(size: int, seed: int = 0) -> Iterator[dict]:
+    # Wikipedia-like documents: several paragraphs of random words. Generation stops after `size` bytes of text.
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(10000)
+    ]
+    generated, i = 0, 0
+    while generated < size:
+        paragraphs = [
+            " ".join(rng.choices(words, k=rng.randint(20, 120)))
+            for _ in range(rng.randint(1, 12))
+        ]
+        generated += sum(map(len, paragraphs))
+        yield {
+            "url": f"https://en.wikipedia.org/wiki?curid={i}",
+            "title": f"Article {i}",
+            "paragraphs": paragraphs,
+        }
+        i += 1
+
+
+def read_stdlib(filename: str) -> int:
+    # Reading as it was done before `brainlet.jsonl`.
+    count = 0
+    with open(filename) as file:
+        for line in file:
+            json.loads(line)
+            count += 1
+    return count
+
+
+def write_stdlib(filename: str, source: str):
+    with open(filename, "w") as file:
+        for sample in jsonl.read_jsonl(source):
+            print(json.dumps(sample, ensure_ascii=False), file=file)
+
+
+def measure(name: str, function, size: int) -> float:
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:>8.2f} {size / 2**20 / elapsed:>8.1f}")
+    return elapsed
+
+
+def main(
+    size_gb: float,
+    input_filename: Optional[str] = None,
+    compressions: Optional[list[str]] = None,
+    directory: Optional[str] = None,
+):
+    with tempfile.TemporaryDirectory(dir=directory) as temporary_directory:
+        if input_filename is None:
+            input_filename = os.path.join(temporary_directory, "corpus.jsonl")
+            jsonl.write_jsonl(
+                generate_documents(int(size_gb * 2**30)), input_filename
+            )
+        size = os.path.getsize(input_filename)
+
+        backend = "orjson" if jsonl.orjson is not None else "stdlib json"
+        print(f"corpus: {size / 2**30:.2f} GB, backend: {backend}")
+        print(f"{'operation':<28} {'time, s':>8} {'MB/s':>8}")
+
+        measure("read stdlib", lambda: read_stdlib(input_filename), size)
+        measure(
+            "read brainlet.jsonl",
+            lambda: sum(1 for _ in jsonl.read_jsonl(input_filename)),
+            size,
+        )
+
+        output = os.path.join(temporary_directory, "output.jsonl")
+        measure("write stdlib", lambda: write_stdlib(output, input_filename), size)
+        for extension in [""] + [f".{c}" for c in compressions or []]:
+            filename = output + extension
+            measure(
+                f"write brainlet.jsonl{extension}",
+                lambda: jsonl.write_jsonl(jsonl.read_jsonl(input_filename), filename),
+                size,
+            )
+            if extension:
+                measure(
+                    f"read brainlet.jsonl{extension}",
+                    lambda: sum(1 for _ in jsonl.read_jsonl(filename)),
+                    size,
+                )
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure jsonl read and write throughput of stdlib and brainlet.jsonl. "
+        "Write measurements include reading of input corpus"
+    )
+    parser.add_argument(
+        "-s",
+        "--size-gb",
+        type=float,
+        default=2.0,
+        help="size of generated corpus, GB. Ignored if input file is set",
+    )
+    parser.add_argument(
+        "-i", "--input-filename", type=str, help="existing jsonl corpus to measure"
+    )
+    parser.add_argument(
+        "-c",
+        "--compressions",
+        nargs="*",
+        choices=["gz", "bz2", "zst"],
+        default=["gz"],
+        help="compressed formats to measure",
+    )
+    parser.add_argument(
+        "-d",
+        "--directory",
+        type=str,
+        help="directory for temporary files. Needs about twice the corpus size",
+    )
+
+    main(**vars(parser.parse_args()))
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import datetime
+import os
+import subprocess
+import time
+from typing import Callable, Optional
+
+import httpx
+import numpy as np
+import weaviate
+
+from benchmark_api import measure
+from brainlet.core import ask_question, create_schema, import_data
+from brainlet.testing.fake_weaviate import FakeWeaviate
+from brainlet.jsonl import read_jsonl, write_jsonl
+
+
+def generate_documents(num_documents: int, num_paragraphs: int) -> list[dict]:
+    return [
+        {
+            "url": f"https://en.wikipedia.org/wiki?curid={i}",
+            "title": f"Article {i}",
+            "paragraphs": [
+                f"Paragraph {j} of article {i} about topic number {i % 97}. " * 4
+                for j in range(num_paragraphs)
+            ],
+        }
+        for i in range(num_documents)
+    ]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def measure_import(client: weaviate.Client, documents: list[dict], batch_size: int):
+    create_schema(client, overwrite=True)
+    return import_data(client, documents, batch_size=batch_size).objects_per_second
+
+
+def measure_ask(client: weaviate.Client, questions: list[str]) -> dict:
+    latencies = []
+    for question in questions:
+        start = time.perf_counter()
+        ask_question(client, question)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+async def measure_api(
+    url: str, questions: list[str], concurrency: list[int], requests: int
+) -> list[dict]:
+    # The API reads settings on import. Cache is disabled, so every request reaches weaviate.
+    os.environ["WEAVIATE_CLIENT_URL"] = url
+    os.environ["ANSWER_CACHE_SIZE"] = "0"
+    os.environ.pop("ANSWER_CACHE_FILE", None)
+    from brainlet.app import app
+
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://brainlet", timeout=300
+    ) as client:
+        await measure(client, questions, 1, len(questions))
+        return [
+            await measure(client, questions, level, requests) for level in concurrency
+        ]
+
+
+def api_rps(level: int) -> Callable[[dict], float]:
+    return lambda result: result["api"][level]["rps"]
+
+
+def print_comparison(result: dict, previous: Optional[dict]):
+    rows: list[tuple[str, Callable[[dict], float]]] = [
+        ("import, obj/s", lambda r: r["import_objects_per_second"]),
+        ("ask p50, ms", lambda r: r["ask"]["p50"] * 1000),
+        ("ask p99, ms", lambda r: r["ask"]["p99"] * 1000),
+    ]
+    for i, level in enumerate(result["api"]):
+        rows.append((f"api rps x{level['concurrency']}", api_rps(i)))
+
+    base = previous["commit"] if previous is not None else "-"
+    print(f"{'metric':<20} {result['commit'] or '-':>14} {base:>14} {'change':>8}")
+    for name, value in rows:
+        current = value(result)
+        if previous is None:
+            print(f"{name:<20} {current:>14.2f}")
+            continue
+        before = value(previous)
+        change = (current - before) / before * 100 if before else 0.0
+        print(f"{name:<20} {current:>14.2f} {before:>14.2f} {change:>+7.1f}%")
+
+
+def main(
+    documents: int,
+    paragraphs: int,
+    questions: int,
+    batch_size: int,
+    graphql_latency: float,
+    batch_latency: float,
+    concurrency: list[int],
+    requests: int,
+    output_file: str,
+):
+    parameters = {
+        "documents": documents,
+        "paragraphs": paragraphs,
+        "questions": questions,
+        "batch_size": batch_size,
+        "graphql_latency": graphql_latency,
+        "batch_latency": batch_latency,
+        "concurrency": concurrency,
+        "requests": requests,
+    }
+    question_texts = [f"what is topic number {i}?" for i in range(questions)]
+
+    with FakeWeaviate(graphql_latency, batch_latency) as fake:
+        client = weaviate.Client(fake.url, startup_period=10)
+        objects_per_second = measure_import(
+            client, generate_documents(documents, paragraphs), batch_size
+        )
+        ask = measure_ask(client, question_texts)
+        api = asyncio.run(measure_api(fake.url, question_texts, concurrency, requests))
+
+    result = {
+        "commit": git_commit(),
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "parameters": parameters,
+        "import_objects_per_second": objects_per_second,
+        "ask": ask,
+        "api": api,
+    }
+
+    # Compare with the last result measured with the same parameters.
+    previous = None
+    if os.path.exists(output_file):
+        for record in read_jsonl(output_file):
+            if record["parameters"] == parameters:
+                previous = record
+    print_comparison(result, previous)
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    write_jsonl([result], output_file, append=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure brainlet overhead against in-process fake weaviate and compare with previous commits"
+    )
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--paragraphs", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("-b", "--batch-size", type=int, default=64)
+    parser.add_argument(
+        "--graphql-latency",
+        type=float,
+        default=0.0,
+        help="injected delay of every graphql request, seconds",
+    )
+    parser.add_argument(
+        "--batch-latency",
+        type=float,
+        default=0.0,
+        help="injected delay of every batch request, seconds",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument(
+        "-n", "--requests", type=int, default=200, help="requests per concurrency level"
+    )
+    parser.add_argument(
+        "-o",
+        "--output-file",
+        type=str,
+        default="./data/benchmarks/offline.jsonl",
+        help="results are appended to this file",
+    )
+
+    main(**vars(parser.parse_args()))
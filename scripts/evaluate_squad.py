@@ -7,6 +7,7 @@ that a question is unanswerable.
 """
 import argparse
 import collections
+import functools
 import json
 import numpy as np
 import os
@@ -16,6 +17,9 @@ import sys
 
 OPTS = None
 
+RE_ARTICLES = re.compile(r"\b(a|an|the)\b", re.UNICODE)
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -49,6 +53,11 @@ def parse_args():
         default=None,
         help="Save precision-recall curves to directory.",
     )
+    parser.add_argument(
+        "--per-question-file",
+        metavar="per_question.json",
+        help="Write exact and F1 scores of every question to file, see `brainlet calibrate`.",
+    )
     parser.add_argument("--verbose", "-v", action="store_true")
     if len(sys.argv) == 1:
         parser.print_help()
@@ -65,19 +74,21 @@ def make_qid_to_has_ans(dataset):
     return qid_to_has_ans
 
 
+@functools.lru_cache(maxsize=None)
 def normalize_answer(s):
-    """Lower text and remove punctuation, articles and extra whitespace."""
+    """Lower text and remove punctuation, articles and extra whitespace.
+
+    Results are memoized: gold answers and frequent predictions are normalized once.
+    """
 
     def remove_articles(text):
-        regex = re.compile(r"\b(a|an|the)\b", re.UNICODE)
-        return re.sub(regex, " ", text)
+        return RE_ARTICLES.sub(" ", text)
 
     def white_space_fix(text):
         return " ".join(text.split())
 
     def remove_punc(text):
-        exclude = set(string.punctuation)
-        return "".join(ch for ch in text if ch not in exclude)
+        return text.translate(PUNCTUATION_TABLE)
 
     def lower(text):
         return text.lower()
@@ -86,9 +97,19 @@ def normalize_answer(s):
 
 
 def get_tokens(s):
+    return list(_get_tokens(s))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tokens(s):
     if not s:
-        return []
-    return normalize_answer(s).split()
+        return ()
+    return tuple(normalize_answer(s).split())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_token_counts(s):
+    return collections.Counter(_get_tokens(s))
 
 
 def compute_exact(a_gold, a_pred):
@@ -96,9 +117,9 @@ def compute_exact(a_gold, a_pred):
 
 
 def compute_f1(a_gold, a_pred):
-    gold_toks = get_tokens(a_gold)
-    pred_toks = get_tokens(a_pred)
-    common = collections.Counter(gold_toks) & collections.Counter(pred_toks)
+    gold_toks = _get_tokens(a_gold)
+    pred_toks = _get_tokens(a_pred)
+    common = _get_token_counts(a_gold) & _get_token_counts(a_pred)
     num_same = sum(common.values())
     if len(gold_toks) == 0 or len(pred_toks) == 0:
         # If either is no-answer, then F1 is 1 if they agree, 0 otherwise
@@ -128,12 +149,29 @@ def get_raw_scores(dataset, preds):
                     print("Missing prediction for %s" % qid)
                     continue
                 a_pred = preds[qid]
-                # Take max over all gold answers
-                exact_scores[qid] = max(compute_exact(a, a_pred) for a in gold_answers)
-                f1_scores[qid] = max(compute_f1(a, a_pred) for a in gold_answers)
+                exact_scores[qid], f1_scores[qid] = compute_scores(gold_answers, a_pred)
     return exact_scores, f1_scores
 
 
+def compute_scores(gold_answers, a_pred):
+    """Exact match and F1 of prediction against all gold answers at once, max over gold answers."""
+    pred_norm = normalize_answer(a_pred)
+    exact = max(int(normalize_answer(a) == pred_norm) for a in gold_answers)
+    f1 = max(compute_f1(a, a_pred) for a in gold_answers)
+    return exact, f1
+
+
+def sort_by_na_prob(na_probs):
+    """Question ids and no-answer probabilities sorted by probability.
+
+    Sort is stable, so questions with equal probabilities keep their order as in the original `sorted`.
+    """
+    qid_list = list(na_probs)
+    probs = np.array([na_probs[k] for k in qid_list], dtype=np.float64)
+    order = np.argsort(probs, kind="stable")
+    return [qid_list[i] for i in order], probs[order]
+
+
 def apply_no_ans_threshold(scores, na_probs, qid_to_has_ans, na_prob_thresh):
     new_scores = {}
     for qid, s in scores.items():
@@ -186,23 +224,21 @@ def plot_pr_curve(precisions, recalls, out_image, title):
 def make_precision_recall_eval(
     scores, na_probs, num_true_pos, qid_to_has_ans, out_image=None, title=None
 ):
-    qid_list = sorted(na_probs, key=lambda k: na_probs[k])
-    true_pos = 0.0
-    cur_p = 1.0
-    cur_r = 0.0
-    precisions = [1.0]
-    recalls = [0.0]
-    avg_prec = 0.0
-    for i, qid in enumerate(qid_list):
-        if qid_to_has_ans[qid]:
-            true_pos += scores[qid]
-        cur_p = true_pos / float(i + 1)
-        cur_r = true_pos / float(num_true_pos)
-        if i == len(qid_list) - 1 or na_probs[qid] != na_probs[qid_list[i + 1]]:
-            # i.e., if we can put a threshold after this point
-            avg_prec += cur_p * (cur_r - recalls[-1])
-            precisions.append(cur_p)
-            recalls.append(cur_r)
+    qid_list, probs = sort_by_na_prob(na_probs)
+    gains = np.array(
+        [float(scores[qid]) if qid_to_has_ans[qid] else 0.0 for qid in qid_list],
+        dtype=np.float64,
+    )
+    # `cumsum` adds sequentially, so partial sums are the same as in a python loop.
+    true_pos = np.cumsum(gains)
+    cur_p = true_pos / np.arange(1.0, len(qid_list) + 1.0)
+    cur_r = true_pos / float(num_true_pos)
+    # We can put a threshold after the last point and between points with different probabilities.
+    is_threshold = np.append(probs[:-1] != probs[1:], True)[: len(qid_list)]
+    precisions = [1.0] + cur_p[is_threshold].tolist()
+    recalls = [0.0] + cur_r[is_threshold].tolist()
+    terms = np.array(precisions[1:]) * np.diff(recalls)
+    avg_prec = float(np.cumsum(np.append(0.0, terms))[-1])
     if out_image:
         plot_pr_curve(precisions, recalls, out_image, title)
     return {"ap": 100.0 * avg_prec}
@@ -261,24 +297,21 @@ def histogram_na_prob(na_probs, qid_list, image_dir, name):
 
 def find_best_thresh(preds, scores, na_probs, qid_to_has_ans):
     num_no_ans = sum(1 for k in qid_to_has_ans if not qid_to_has_ans[k])
-    cur_score = num_no_ans
-    best_score = cur_score
+    best_score = num_no_ans
     best_thresh = 0.0
-    qid_list = sorted(na_probs, key=lambda k: na_probs[k])
-    for i, qid in enumerate(qid_list):
-        if qid not in scores:
-            continue
-        if qid_to_has_ans[qid]:
-            diff = scores[qid]
-        else:
-            if preds[qid]:
-                diff = -1
-            else:
-                diff = 0
-        cur_score += diff
-        if cur_score > best_score:
-            best_score = cur_score
-            best_thresh = na_probs[qid]
+    qid_list, _ = sort_by_na_prob(na_probs)
+    qid_list = [qid for qid in qid_list if qid in scores]
+    diffs = [
+        scores[qid] if qid_to_has_ans[qid] else (-1 if preds[qid] else 0)
+        for qid in qid_list
+    ]
+    cur_scores = np.cumsum(np.array([num_no_ans] + diffs, dtype=np.float64))[1:]
+    if len(cur_scores) > 0:
+        # The first point reaching the maximum wins, as the score has to strictly increase to move threshold.
+        i = int(np.argmax(cur_scores))
+        if cur_scores[i] > best_score:
+            best_score = float(cur_scores[i])
+            best_thresh = na_probs[qid_list[i]]
     return 100.0 * best_score / len(scores), best_thresh
 
 
@@ -308,6 +341,19 @@ def main():
     has_ans_qids = [k for k, v in qid_to_has_ans.items() if v]
     no_ans_qids = [k for k, v in qid_to_has_ans.items() if not v]
     exact_raw, f1_raw = get_raw_scores(dataset, preds)
+    if OPTS.per_question_file:
+        with open(OPTS.per_question_file, "w") as f:
+            json.dump(
+                {
+                    qid: {
+                        "exact": exact_raw[qid],
+                        "f1": f1_raw[qid],
+                        "has_answer": qid_to_has_ans[qid],
+                    }
+                    for qid in exact_raw
+                },
+                f,
+            )
     exact_thresh = apply_no_ans_threshold(
         exact_raw, na_probs, qid_to_has_ans, OPTS.na_prob_thresh
     )
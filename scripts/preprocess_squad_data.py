@@ -1,14 +1,9 @@
 import argparse
 import json
 import os.path
-from typing import Iterator, Iterable, Optional
+from typing import Iterator, Optional
 
-
-def save_jsonl(data: Iterable[dict], filename: str):
-    with open(filename, "w") as file:
-        for sample in data:
-            dumps = json.dumps(sample, ensure_ascii=False)
-            print(dumps, file=file)
+from brainlet.jsonl import write_jsonl
 
 
 def convert_to_import_format(data: list[dict]) -> Iterator[dict]:
@@ -45,10 +40,10 @@ def main(
     questions_filename = os.path.join(output_directory, "questions.jsonl")
 
     knowledge_base = convert_to_import_format(data)
-    save_jsonl(knowledge_base, knowledge_base_filename)
+    write_jsonl(knowledge_base, knowledge_base_filename)
 
     questions = fetch_questions(data)
-    save_jsonl(questions, questions_filename)
+    write_jsonl(questions, questions_filename)
 
     dev_set_filename = os.path.join(output_directory, "squad-2.0-dev.json")
     original_file_dump["data"] = data
@@ -1,26 +1,44 @@
 import argparse
 import html
-import json
+import multiprocessing
+import os
 import re
+import time
 import unicodedata
 from typing import Iterable, Iterator
 
+from tqdm import tqdm
+
+from brainlet.jsonl import dumps, loads, open_binary
+
 RE_PARAGRAPH_SPLIT = re.compile(r"\n+")
 RE_ABNORMAL_PARANTHESIS = re.compile(r"\([,;\s]*\)")
 RE_WORD = re.compile(r"\w+")
 
 
-def iter_jsonl(filename: str) -> Iterator[dict]:
-    with open(filename) as file:
-        for line in file:
-            yield json.loads(line)
+def list_input_files(path: str) -> list[str]:
+    # Wikiextractor writes shards into nested directories: AA/wiki_00, AA/wiki_01, ..., AB/wiki_00.
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(directory, filename)
+        for directory, _, filenames in os.walk(path)
+        for filename in filenames
+    )
 
 
-def save_jsonl(data: Iterable[dict], filename: str):
-    with open(filename, "w") as file:
-        for sample in data:
-            dumps = json.dumps(sample, ensure_ascii=False)
-            print(dumps, file=file)
+def iter_chunks(filenames: list[str], chunk_size: int) -> Iterator[list[bytes]]:
+    chunk = []
+    for filename in filenames:
+        # Shards compressed with `wikiextractor --compress` have `.bz2` extension.
+        with open_binary(filename) as file:
+            for line in file:
+                chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
 
 
 def normalize_text(text: str) -> str:
@@ -55,10 +73,44 @@ def filter_wiki_data(data: Iterable[dict]) -> Iterator[dict]:
         }
 
 
-def main(input_filename: str, output_filename: str):
-    wiki_data = iter_jsonl(input_filename)
-    filtered_data = filter_wiki_data(wiki_data)
-    save_jsonl(filtered_data, output_filename)
+def process_chunk(lines: list[bytes]) -> tuple[int, list[bytes]]:
+    articles = (loads(line) for line in lines)
+    documents = filter_wiki_data(articles)
+    return len(lines), [dumps(document) + b"\n" for document in documents]
+
+
+def main(
+    input_filename: str,
+    output_filename: str,
+    workers: int = 1,
+    chunk_size: int = 256,
+    unordered: bool = False,
+):
+    chunks = iter_chunks(list_input_files(input_filename), chunk_size)
+    progress_bar = tqdm(unit=" articles", smoothing=0.0)
+    start = time.perf_counter()
+    articles, documents = 0, 0
+
+    with open_binary(output_filename, "wb") as file, multiprocessing.Pool(
+        workers
+    ) as pool:
+        # Unordered output doesn't wait for slow chunks, but order of documents differs from input.
+        if unordered:
+            results = pool.imap_unordered(process_chunk, chunks)
+        else:
+            results = pool.imap(process_chunk, chunks)
+        for chunk_articles, lines in results:
+            file.writelines(lines)
+            articles += chunk_articles
+            documents += len(lines)
+            progress_bar.update(chunk_articles)
+
+    progress_bar.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{articles} articles, {documents} documents in {elapsed:.1f}s: "
+        f"{articles / elapsed if elapsed > 0 else 0.0:.1f} articles/s"
+    )
 
 
 if __name__ == "__main__":
@@ -68,10 +120,29 @@ if __name__ == "__main__":
         "--input-filename",
         type=str,
         required=True,
-        help="input jsonl file after wikiextractor processing",
+        help="input jsonl file or directory of shards after wikiextractor processing. "
+        "Shards may be compressed (.bz2, .gz)",
     )
     parser.add_argument(
         "-o", "--output-filename", type=str, help="output jsonl filename"
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of processes",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=256,
+        help="number of articles sent to a process at once",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="write documents as soon as they are processed, not in the order of input",
+    )
 
     main(**vars(parser.parse_args()))
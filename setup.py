@@ -6,6 +6,7 @@ required_packages = [
     "fastapi~=0.95.2",
     "uvicorn~=0.22.0",
     "tqdm~=4.65.0",
+    "numpy~=1.24.3",
 ]
 
 dev_packages = [
@@ -14,7 +15,15 @@ dev_packages = [
     "pytest~=7.3.1",
     "mypy~=1.3.0",
     "httpx~=0.24.0",
-    "numpy~=1.24.3",
+]
+
+embedding_packages = [
+    "sentence-transformers~=2.2.2",
+]
+
+fast_packages = [
+    "orjson~=3.8.3",
+    "zstandard~=0.21.0",
 ]
 
 setup(
@@ -23,7 +32,11 @@ setup(
     author="Andrey Sokolov",
     python_requires=">=3.9",
     install_requires=required_packages,
-    extras_require={"dev": dev_packages},
+    extras_require={
+        "dev": dev_packages,
+        "embedding": embedding_packages,
+        "fast": fast_packages,
+    },
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     entry_points={"console_scripts": ["brainlet=brainlet.cli:cli"]},
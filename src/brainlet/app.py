@@ -1,16 +1,243 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
 from weaviate import Client
 
-from brainlet.core import ask_question, Answer
+from brainlet.cache import AnswerCache, SQLiteCacheBackend, normalize_question
+from brainlet.client import ClientConfig, ManagedClient
+from brainlet.core import (
+    ask_question_async,
+    ask_questions_async,
+    add_index_listener,
+    Answer,
+    RE_TENANT,
+)
+from brainlet.embedding import Encoder
+from brainlet.lexical import LexicalIndex
+from brainlet.metrics import REGISTRY, timer
 
 WEAVIATE_CLIENT_URL = os.getenv("WEAVIATE_CLIENT_URL", "http://127.0.0.1:8080")
+# Maximum number of questions processed concurrently by one worker.
+ASK_MAX_WORKERS = int(os.getenv("ASK_MAX_WORKERS", "16"))
+# Weaviate connection settings, see `brainlet.client.ClientConfig`. Pool holds a connection per ask worker.
+WEAVIATE_POOL_SIZE = int(os.getenv("WEAVIATE_POOL_SIZE", str(ASK_MAX_WORKERS)))
+WEAVIATE_CONNECT_TIMEOUT = float(os.getenv("WEAVIATE_CONNECT_TIMEOUT", "10"))
+WEAVIATE_READ_TIMEOUT = float(os.getenv("WEAVIATE_READ_TIMEOUT", "60"))
+WEAVIATE_STARTUP_PERIOD = float(os.getenv("WEAVIATE_STARTUP_PERIOD", "60"))
+# Maximum random delay of connection at startup, seconds. Spreads the first requests of many workers.
+WEAVIATE_STARTUP_JITTER = float(os.getenv("WEAVIATE_STARTUP_JITTER", "1"))
+# Retrieval mode, see `brainlet.core.RETRIEVAL_MODES`.
+ASK_RETRIEVAL = os.getenv("ASK_RETRIEVAL", "two-stage")
+# Top-k document fan-out, see `brainlet.core.ask_questions`. Certainty and budget are unset by default.
+ASK_TOP_K = int(os.getenv("ASK_TOP_K", "1"))
+ASK_CONFIDENT_CERTAINTY = os.getenv("ASK_CONFIDENT_CERTAINTY")
+ASK_LATENCY_BUDGET = os.getenv("ASK_LATENCY_BUDGET")
+# Early exit thresholds fitted by `brainlet calibrate`, unset by default.
+ASK_SKIP_BELOW = os.getenv("ASK_SKIP_BELOW")
+ASK_MIN_CERTAINTY = os.getenv("ASK_MIN_CERTAINTY")
+# Whether schema links paragraphs to documents with plain properties, see `brainlet init --flat-links`.
+ASK_FLAT_LINKS = os.getenv("ASK_FLAT_LINKS", "false").lower() in ("1", "true")
+# Whether paragraphs are chunks, see `brainlet init --chunked`.
+ASK_CHUNKED = os.getenv("ASK_CHUNKED", "false").lower() in ("1", "true")
+# Local BM25 index of documents and number of its candidates for hybrid search, see `brainlet.lexical`.
+# It is built for one knowledge base, so only questions without tenant use it.
+LEXICAL_INDEX = os.getenv("LEXICAL_INDEX")
+LEXICAL_CANDIDATES = int(os.getenv("LEXICAL_CANDIDATES", "100"))
+# Model of in-process question encoder, see `brainlet.embedding.Encoder`.
+ENCODER_MODEL = os.getenv("ENCODER_MODEL")
+# Answer cache settings. Cache file is shared by workers and invalidated by `brainlet init` and `brainlet index`.
+# Without cache file, indexing in other processes doesn't invalidate cached answers until they expire.
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "10000"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_FILE = os.getenv("ANSWER_CACHE_FILE")
+ANSWER_CACHE_FILE_SIZE = int(os.getenv("ANSWER_CACHE_FILE_SIZE", "100000"))
+# Batch endpoint limits: maximum number of questions in request, number of questions sent to weaviate
+# in one graphql request and maximum number of such concurrent requests per batch.
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "256"))
+BATCH_GROUP_SIZE = int(os.getenv("BATCH_GROUP_SIZE", "16"))
+BATCH_PARALLELISM = int(os.getenv("BATCH_PARALLELISM", "4"))
 
 app = FastAPI()
-client = Client(WEAVIATE_CLIENT_URL, startup_period=60)
+weaviate_client = ManagedClient(
+    ClientConfig(
+        url=WEAVIATE_CLIENT_URL,
+        pool_size=WEAVIATE_POOL_SIZE,
+        connect_timeout=WEAVIATE_CONNECT_TIMEOUT,
+        read_timeout=WEAVIATE_READ_TIMEOUT,
+        startup_period=WEAVIATE_STARTUP_PERIOD,
+    )
+)
+encoder = Encoder(ENCODER_MODEL) if ENCODER_MODEL is not None else None
+executor = ThreadPoolExecutor(ASK_MAX_WORKERS, thread_name_prefix="brainlet-ask")
+ask_options: dict = dict(
+    retrieval=ASK_RETRIEVAL,
+    encoder=encoder,
+    top_k=ASK_TOP_K,
+    confident_certainty=float(ASK_CONFIDENT_CERTAINTY)
+    if ASK_CONFIDENT_CERTAINTY
+    else None,
+    latency_budget=float(ASK_LATENCY_BUDGET) if ASK_LATENCY_BUDGET else None,
+    skip_below=float(ASK_SKIP_BELOW) if ASK_SKIP_BELOW else None,
+    min_certainty=float(ASK_MIN_CERTAINTY) if ASK_MIN_CERTAINTY else None,
+    flat_links=ASK_FLAT_LINKS,
+    chunked=ASK_CHUNKED,
+    lexical_index=LexicalIndex(LEXICAL_INDEX, LEXICAL_CANDIDATES)
+    if LEXICAL_INDEX is not None
+    else None,
+)
+# Tenants are passed as `tenant` parameter, see `brainlet.core.get_collection`.
+TENANT_PATTERN = f"^{RE_TENANT.pattern}$"
+
+
+def tenant_options(tenant: Optional[str]) -> dict:
+    if tenant is None:
+        return ask_options
+    return dict(ask_options, tenant=tenant, lexical_index=None)
+
+
+cache = AnswerCache(
+    ANSWER_CACHE_SIZE,
+    ANSWER_CACHE_TTL,
+    (
+        SQLiteCacheBackend(ANSWER_CACHE_FILE, ANSWER_CACHE_FILE_SIZE, ANSWER_CACHE_TTL)
+        if ANSWER_CACHE_FILE
+        else None
+    ),
+)
+add_index_listener(cache.invalidate)
+
+
+@app.on_event("startup")
+async def connect():
+    # Connect in background, so health checks are answered while weaviate is starting.
+    weaviate_client.connect_in_background(WEAVIATE_STARTUP_JITTER)
+
+
+@app.on_event("shutdown")
+async def close():
+    weaviate_client.close()
+
+
+async def get_client() -> Client:
+    # Requests that come before connection wait for it in executor thread.
+    if weaviate_client.connected:
+        return weaviate_client.get()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, weaviate_client.get
+    )
+
+
+@app.middleware("http")
+async def measure_request_time(request: Request, call_next):
+    # Unknown paths share one stage, so the number of histograms stays bounded.
+    # Routes are collected on the first request, when all of them are registered.
+    routes = getattr(app.state, "route_paths", None)
+    if routes is None:
+        routes = app.state.route_paths = {
+            getattr(route, "path", None) for route in app.routes
+        }
+    path = request.url.path if request.url.path in routes else "other"
+    with timer(f"api.request {request.method} {path}"):
+        return await call_next(request)
 
 
 @app.get("/", response_model_exclude_none=True)
-async def ask(question: str) -> Answer:
-    return ask_question(client, question)
+async def ask(
+    question: str,
+    tenant: Optional[str] = Query(None, regex=TENANT_PATTERN),
+    # Disabled by benchmarks, so repeated questions measure the whole pipeline.
+    use_cache: bool = Query(True, alias="cache"),
+) -> Answer:
+    answer = cache.get(question, tenant) if use_cache else None
+    if answer is None:
+        client = await get_client()
+        answer = await ask_question_async(
+            client, question, executor, **tenant_options(tenant)
+        )
+        if use_cache:
+            cache.set(question, answer, tenant)
+    return answer
+
+
+@app.get("/health")
+async def health() -> dict:
+    """
+    Liveness check. Answers right away, weaviate connection state is reported but doesn't fail the check.
+    """
+    if weaviate_client.connected:
+        status = "connected"
+    elif weaviate_client.error is not None:
+        status = f"error: {weaviate_client.error}"
+    else:
+        status = "connecting"
+    return {"status": "ok", "weaviate": status}
+
+
+@app.get("/cache")
+async def cache_stats() -> dict:
+    return cache.stats()
+
+
+class BatchRequest(BaseModel):
+    questions: list[str] = Field(..., max_items=BATCH_MAX_SIZE)
+    tenant: Optional[str] = Field(None, regex=TENANT_PATTERN)
+
+
+@app.post("/batch", response_model_exclude_none=True)
+async def ask_batch(request: BatchRequest) -> list[Answer]:
+    answers: dict[str, Answer] = {}
+    missing: dict[str, str] = {}
+
+    # Deduplicate questions and look up cached answers.
+    for question in request.questions:
+        key = normalize_question(question)
+        if key in answers or key in missing:
+            continue
+        cached = cache.get(question, request.tenant)
+        if cached is not None:
+            answers[key] = cached
+        else:
+            missing[key] = question
+
+    semaphore = asyncio.Semaphore(BATCH_PARALLELISM)
+    client = await get_client() if missing else None
+
+    async def ask_group(questions: list[str]) -> list[Answer]:
+        async with semaphore:
+            return await ask_questions_async(
+                client, questions, executor, **tenant_options(request.tenant)
+            )
+
+    keys, questions = list(missing), list(missing.values())
+    groups = [
+        questions[start : start + BATCH_GROUP_SIZE]
+        for start in range(0, len(questions), BATCH_GROUP_SIZE)
+    ]
+    group_answers = await asyncio.gather(*map(ask_group, groups))
+
+    for key, question, answer in zip(
+        keys, questions, (a for group in group_answers for a in group)
+    ):
+        cache.set(question, answer, request.tenant)
+        answers[key] = answer
+
+    return [answers[normalize_question(question)] for question in request.questions]
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> str:
+    cache_stats = cache.stats()
+    return REGISTRY.prometheus() + "\n".join(
+        [
+            "# TYPE brainlet_answer_cache_hits_total counter",
+            f"brainlet_answer_cache_hits_total {cache_stats['hits']}",
+            "# TYPE brainlet_answer_cache_misses_total counter",
+            f"brainlet_answer_cache_misses_total {cache_stats['misses']}",
+            "",
+        ]
+    )
@@ -0,0 +1,268 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import weaviate
+
+from brainlet.client import ClientConfig, create_client
+from brainlet.core import (
+    INDEX_PROFILES,
+    ask_question,
+    build_schema,
+    create_schema,
+    import_data,
+    import_data_parallel,
+    iter_data,
+    iter_objects,
+)
+
+
+@dataclass
+class IndexBenchmark:
+    profile: str
+    objects: int
+    build_seconds: float
+    # Estimated size of vectors and layer zero of HNSW graph, see :func:`estimate_index_memory`.
+    memory_bytes: int
+    query_p50: float
+    query_p99: float
+    recall: float
+
+
+def estimate_index_memory(num_objects: int, dim: int, max_connections: int) -> int:
+    """
+    Estimate memory used by HNSW index: float32 vectors and 64-bit ids of `2 * maxConnections` neighbours
+    of layer zero. Upper layers hold a small fraction of objects and are ignored.
+    """
+    return num_objects * (dim * 4 + 2 * max_connections * 8)
+
+
+def brute_force_neighbours(vectors: np.ndarray, query: np.ndarray, k: int) -> set:
+    """
+    Exact cosine nearest neighbours.
+
+    Args:
+        vectors: normalized vectors with shape `(n, dim)`.
+        query: normalized query vector.
+        k: number of neighbours.
+
+    Returns: set of row indices of the nearest vectors.
+    """
+    scores = vectors @ query
+    k = min(k, len(scores))
+    return set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+
+def measure_queries(
+    client: weaviate.Client,
+    class_name: str,
+    ids: list[str],
+    vectors: np.ndarray,
+    k: int = 10,
+    num_queries: int = 100,
+    seed: int = 0,
+) -> tuple[list[float], float]:
+    """
+    Query index with stored vectors and compare results with brute-force search on the same vectors.
+
+    Returns: query latencies, seconds, and mean recall@k.
+    """
+    rng = np.random.default_rng(seed)
+    positions = {id_: i for i, id_ in enumerate(ids)}
+    queries = rng.choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+
+    latencies, recalls = [], []
+    for i in queries:
+        start = time.perf_counter()
+        found = (
+            client.query.get(class_name)
+            .with_additional(["id"])
+            .with_near_vector({"vector": vectors[i].tolist()})
+            .with_limit(k)
+            .do()
+        )["data"]["Get"][class_name]
+        latencies.append(time.perf_counter() - start)
+
+        expected = brute_force_neighbours(vectors, vectors[i], k)
+        hits = {positions[obj["_additional"]["id"]] for obj in found} & expected
+        recalls.append(len(hits) / len(expected))
+
+    return latencies, float(np.mean(recalls)) if recalls else 0.0
+
+
+def benchmark_index_profiles(
+    client: weaviate.Client,
+    source: str,
+    profiles: Optional[Sequence[str]] = None,
+    k: int = 10,
+    num_queries: int = 100,
+    client_vectors: bool = False,
+    **kwargs,
+) -> list[IndexBenchmark]:
+    """
+    Import the same corpus under every index profile and measure the resulting `Paragraph` index.
+
+    Existing schema and data are deleted.
+
+    Args:
+        client: weaviate client.
+        source: jsonl file with documents.
+        profiles: names of :data:`brainlet.core.INDEX_PROFILES`. If None, all profiles are measured.
+        k: number of neighbours for query latency and recall.
+        num_queries: number of stored paragraph vectors used as queries.
+        client_vectors: whether schema is built for in-process encoder, pass `encoder` in `kwargs` then.
+        kwargs: other arguments of :func:`brainlet.core.import_data`.
+
+    Returns: results in the order of profiles.
+    """
+    results = []
+    for profile in profiles or list(INDEX_PROFILES):
+        create_schema(client, build_schema(client_vectors, profile), overwrite=True)
+
+        start = time.perf_counter()
+        import_data(client, iter_data(source), **kwargs)
+        build_seconds = time.perf_counter() - start
+
+        ids, vectors = [], []
+        for obj in iter_objects(client, "Paragraph", with_vector=True):
+            ids.append(obj["_additional"]["id"])
+            vectors.append(obj["_additional"]["vector"])
+        if not ids:
+            raise ValueError(f"No paragraphs imported from {source}")
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+        latencies, recall = measure_queries(
+            client, "Paragraph", ids, matrix, k, num_queries
+        )
+        results.append(
+            IndexBenchmark(
+                profile=profile,
+                objects=len(ids),
+                build_seconds=build_seconds,
+                memory_bytes=estimate_index_memory(
+                    len(ids),
+                    matrix.shape[1],
+                    INDEX_PROFILES[profile]["maxConnections"],
+                ),
+                query_p50=float(np.percentile(latencies, 50)) if latencies else 0.0,
+                query_p99=float(np.percentile(latencies, 99)) if latencies else 0.0,
+                recall=recall,
+            )
+        )
+    return results
+
+
+@dataclass
+class ClusterBenchmark:
+    shards: int
+    replicas: int
+    objects: int
+    import_seconds: float
+    ask_p50: float
+    ask_p99: float
+    ask_rps: float
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.import_seconds if self.import_seconds > 0 else 0.0
+
+
+def measure_asks(
+    clients: Sequence[weaviate.Client], questions: list[str], concurrency: int
+) -> tuple[list[float], float]:
+    """
+    Ask questions with `concurrency` threads. Questions are sent to the clients in turn.
+
+    Returns: ask latencies, seconds, and questions per second.
+    """
+
+    def ask(i: int) -> float:
+        start = time.perf_counter()
+        ask_question(clients[i % len(clients)], questions[i])
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        latencies = list(executor.map(ask, range(len(questions))))
+    return latencies, len(questions) / (time.perf_counter() - start)
+
+
+def benchmark_cluster(
+    node_urls: Sequence[str],
+    source: str,
+    shards: Sequence[int] = (1,),
+    replicas: Sequence[int] = (1,),
+    virtual_per_physical: Optional[int] = None,
+    processes: int = 1,
+    concurrency: int = 8,
+    num_questions: int = 100,
+    **kwargs,
+) -> list[ClusterBenchmark]:
+    """
+    Import the same corpus with every combination of shard count and replication factor, and measure import
+    and ask throughput of the cluster.
+
+    Existing `Document` and `Paragraph` classes are deleted.
+
+    Args:
+        node_urls: urls of weaviate cluster nodes. Import processes and ask threads use them in turn.
+        source: jsonl file with documents. Questions are made of its first `num_questions` titles.
+        shards: numbers of physical shards.
+        replicas: replication factors, at most the number of nodes.
+        virtual_per_physical: number of virtual shards per physical one, see :func:`brainlet.core.build_schema`.
+        processes: number of import processes, see :func:`brainlet.core.import_data_parallel`.
+        concurrency: number of questions asked concurrently.
+        num_questions: number of questions.
+        kwargs: other arguments of :func:`brainlet.core.import_data`.
+
+    Returns: results in the order of configurations.
+    """
+    if max(replicas) > len(node_urls):
+        raise ValueError(
+            f"Replication factor {max(replicas)} exceeds the number of nodes {len(node_urls)}"
+        )
+    clients = [
+        create_client(ClientConfig(url, pool_size=concurrency)) for url in node_urls
+    ]
+    questions = [
+        f"what is {document['title']}?"
+        for document in itertools.islice(iter_data(source), num_questions)
+    ]
+    if not questions:
+        raise ValueError(f"No documents in {source}")
+
+    results = []
+    for num_shards, factor in itertools.product(shards, replicas):
+        schema = build_schema(
+            shards=num_shards,
+            virtual_per_physical=virtual_per_physical,
+            replicas=factor,
+        )
+        create_schema(clients[0], schema, overwrite=True)
+
+        start = time.perf_counter()
+        if processes > 1:
+            stats = import_data_parallel(
+                node_urls[0], source, processes, node_urls=node_urls, **kwargs
+            )
+        else:
+            stats = [import_data(clients[0], source, **kwargs)]
+        import_seconds = time.perf_counter() - start
+
+        latencies, rps = measure_asks(clients, questions, concurrency)
+        results.append(
+            ClusterBenchmark(
+                shards=num_shards,
+                replicas=factor,
+                objects=sum(shard_stats.objects for shard_stats in stats),
+                import_seconds=import_seconds,
+                ask_p50=float(np.percentile(latencies, 50)),
+                ask_p99=float(np.percentile(latencies, 99)),
+                ask_rps=rps,
+            )
+        )
+    return results
@@ -0,0 +1,258 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional
+
+from brainlet.core import Answer, Source
+
+RE_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize question to be used as a cache key: lower text, remove punctuation and extra whitespace.
+    """
+    question = RE_NON_WORD.sub(" ", question.lower())
+    return " ".join(question.split())
+
+
+def _cache_key(question: str, tenant: Optional[str]) -> str:
+    # Normalized questions have no slashes, so keys of tenants don't collide with other questions.
+    key = normalize_question(question)
+    return key if tenant is None else f"{tenant}/{key}"
+
+
+def answer_to_dict(answer: Answer) -> dict:
+    return asdict(answer)
+
+
+def answer_from_dict(data: dict) -> Answer:
+    source = Source(**data["source"]) if data["source"] is not None else None
+    return Answer(**dict(data, source=source))
+
+
+class CacheBackend(ABC):
+    """
+    Shared storage of cached answers. Answers are stored as dicts with `created` timestamp.
+
+    Generation is changed on every :meth:`clear`, so processes sharing the backend can drop their local caches.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: dict):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def generation(self) -> int:
+        ...
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache backend stored in a local SQLite database. The file can be shared by several processes, e.g. API workers.
+
+    Expired answers and the oldest answers beyond `maxsize` are deleted every `cleanup_interval` writes
+    of a process, so the file stays bounded.
+
+    Args:
+        filename: database filename.
+        maxsize: maximum number of stored answers. If None, the number is not limited.
+        ttl: answer time-to-live, seconds. If None, answers don't expire.
+        cleanup_interval: number of writes between deletions of expired and excess answers.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cleanup_interval: int = 100,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            filename, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        # Creation time is read from stored answers, so files of previous versions need no migration.
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS answers_created ON answers (json_extract(value, '$.created'))"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS generation (id INTEGER PRIMARY KEY CHECK (id = 0), value INTEGER)"
+        )
+        self._connection.execute(
+            "INSERT OR IGNORE INTO generation (id, value) VALUES (0, 0)"
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: dict):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO answers (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False)),
+            )
+            self._writes += 1
+            if self._writes % self.cleanup_interval == 0:
+                self._cleanup()
+
+    def _cleanup(self):
+        if self.ttl is not None:
+            self._connection.execute(
+                "DELETE FROM answers WHERE json_extract(value, '$.created') < ?",
+                (time.time() - self.ttl,),
+            )
+        if self.maxsize is not None:
+            self._connection.execute(
+                "DELETE FROM answers WHERE key IN (SELECT key FROM answers "
+                "ORDER BY json_extract(value, '$.created') DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("DELETE FROM answers")
+            self._connection.execute("UPDATE generation SET value = value + 1")
+            self._connection.execute("COMMIT")
+
+    def generation(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM generation").fetchone()
+        return row[0]
+
+
+class AnswerCache:
+    """
+    In-process LRU cache of answers with time-to-live and optional shared backend.
+
+    Questions are normalized with :func:`normalize_question`, so near-identical questions share one answer.
+    Local cache is dropped when the generation of the shared backend changes.
+
+    Args:
+        maxsize: maximum number of answers stored in process.
+        ttl: answer time-to-live, seconds. If None, answers don't expire.
+        backend: shared cache backend. Answers missing in process are looked up there.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: Optional[float] = 3600,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._answers: OrderedDict[str, dict] = OrderedDict()
+        self._generation = backend.generation() if backend is not None else 0
+
+    def _expired(self, value: dict) -> bool:
+        return self.ttl is not None and time.time() - value["created"] > self.ttl
+
+    def _sync_generation(self):
+        if self.backend is None:
+            return
+        generation = self.backend.generation()
+        if generation != self._generation:
+            self._answers.clear()
+            self._generation = generation
+
+    def get(self, question: str, tenant: Optional[str] = None) -> Optional[Answer]:
+        """
+        Get cached answer.
+
+        Args:
+            question: string question.
+            tenant: tenant the question is asked to. Tenants have separate answers.
+
+        Returns: answer or None if there is no valid cached answer.
+        """
+        key = _cache_key(question, tenant)
+
+        with self._lock:
+            self._sync_generation()
+            value = self._answers.get(key)
+            if value is None and self.backend is not None:
+                value = self.backend.get(key)
+                if value is not None:
+                    self._store(key, value)
+
+            if value is None or self._expired(value):
+                self._answers.pop(key, None)
+                self.misses += 1
+                return None
+
+            # Without local storage, answers found in backend are not kept in process.
+            if key in self._answers:
+                self._answers.move_to_end(key)
+            self.hits += 1
+            return answer_from_dict(value["answer"])
+
+    def set(self, question: str, answer: Answer, tenant: Optional[str] = None):
+        """
+        Cache answer.
+
+        Args:
+            question: string question.
+            answer: answer object.
+            tenant: tenant the question is asked to.
+        """
+        key = _cache_key(question, tenant)
+        value = {"answer": answer_to_dict(answer), "created": time.time()}
+
+        with self._lock:
+            self._sync_generation()
+            self._store(key, value)
+            if self.backend is not None:
+                self.backend.set(key, value)
+
+    def _store(self, key: str, value: dict):
+        if self.maxsize <= 0:
+            return
+        self._answers[key] = value
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.maxsize:
+            self._answers.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Drop all cached answers, including ones in shared backend.
+        """
+        with self._lock:
+            self._answers.clear()
+            if self.backend is not None:
+                self.backend.clear()
+                self._generation = self.backend.generation()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._answers)}
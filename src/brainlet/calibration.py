@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class Thresholds:
+    # Vector certainty of the nearest document below which questions are not asked, see :func:`brainlet.core.ask_questions`.
+    skip_below: Optional[float]
+    # Certainty below which answers are replaced with no answer.
+    min_certainty: Optional[float]
+    # F1 score of the dataset with these thresholds, percent.
+    f1: float
+    # Fraction of questions answered without asking paragraphs.
+    skipped: float
+
+
+def threshold_curve(
+    scores: dict[str, dict], evaluation: dict[str, dict], num_certainties: int = 101
+) -> list[Thresholds]:
+    """
+    Estimate F1 score and reader savings of every `skip_below` threshold together with the best `min_certainty`
+    for it. Estimates reuse answers of one inference run without thresholds: a skipped or gated question scores
+    as no answer, i.e. 1 if it is unanswerable and 0 otherwise.
+
+    Args:
+        scores: score and answer certainty of every question, written by `brainlet inference --scores-file`.
+        evaluation: exact and F1 scores of every question and whether it has answer, written by
+            `scripts/evaluate_squad.py --per-question-file`.
+        num_certainties: number of `min_certainty` candidates, quantiles of answer certainties.
+
+    Returns: thresholds ordered by `skip_below`, the first one skips nothing.
+    """
+    missing = evaluation.keys() - scores.keys()
+    if missing:
+        raise ValueError(
+            f"Scores of {len(missing)} evaluated questions are missing, e.g. {next(iter(missing))}"
+        )
+    if not evaluation:
+        raise ValueError("No evaluated questions")
+
+    qids = sorted(evaluation)
+    # Questions without score, e.g. confident lexical matches, are never skipped.
+    score = np.array(
+        [scores[q]["score"] if scores[q]["score"] is not None else np.inf for q in qids]
+    )
+    certainty = np.array([scores[q]["certainty"] or 0.0 for q in qids])
+    no_answer_f1 = np.array([0.0 if evaluation[q]["has_answer"] else 1.0 for q in qids])
+    # Change of F1 if a question is asked rather than answered with no answer.
+    gain = np.array([evaluation[q]["f1"] for q in qids]) - no_answer_f1
+
+    answered = certainty[[scores[q]["certainty"] is not None for q in qids]]
+    certainties: list[Optional[float]] = [None]
+    if len(answered):
+        certainties += [
+            float(c)
+            for c in np.unique(
+                np.quantile(answered, np.linspace(0, 1, num_certainties))
+            )
+        ]
+
+    # Questions ordered by score, best first. Skipping below a threshold keeps a prefix of them.
+    order = np.argsort(-score, kind="stable")
+    gains = np.zeros((len(certainties), len(qids) + 1))
+    for i, min_certainty in enumerate(certainties):
+        kept = (
+            gain[order]
+            if min_certainty is None
+            else np.where(certainty[order] >= min_certainty, gain[order], 0.0)
+        )
+        np.cumsum(kept, out=gains[i, 1:])
+    f1 = (no_answer_f1.sum() + gains) / len(qids) * 100
+
+    ascending = np.sort(score)
+    candidates: list[Optional[float]] = [None]
+    # The lowest score skips nothing, like no threshold.
+    candidates += [float(s) for s in np.unique(score[np.isfinite(score)])[1:]]
+    curve = []
+    for skip_below in candidates:
+        skipped = (
+            0 if skip_below is None else int(np.searchsorted(ascending, skip_below))
+        )
+        best = int(np.argmax(f1[:, len(qids) - skipped]))
+        curve.append(
+            Thresholds(
+                skip_below,
+                certainties[best],
+                float(f1[best, len(qids) - skipped]),
+                skipped / len(qids),
+            )
+        )
+    return curve
+
+
+def calibrate_thresholds(
+    scores: dict[str, dict], evaluation: dict[str, dict], max_f1_loss: float = 1.0
+) -> Thresholds:
+    """
+    Find thresholds that skip the most questions while F1 score is at most `max_f1_loss` points below
+    F1 score without thresholds. See :func:`threshold_curve` for arguments.
+    """
+    curve = threshold_curve(scores, evaluation)
+    baseline = float(np.mean([result["f1"] for result in evaluation.values()])) * 100
+    # Tolerance absorbs rounding, so the curve start without skipping always qualifies.
+    return max(
+        (t for t in curve if t.f1 >= baseline - max_f1_loss - 1e-9),
+        key=lambda t: (t.skipped, t.f1),
+    )
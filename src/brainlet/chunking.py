@@ -0,0 +1,197 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Words and single punctuation marks. It approximates subword tokens from below: rare words are split
+# into several word pieces by BERT-like tokenizers, so keep `max_tokens` below the model limit.
+RE_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass
+class Chunk:
+    text: str
+    # Index of the first source paragraph and number of merged paragraphs. Merged paragraphs are consecutive
+    # except split ones, which are skipped, see :meth:`Chunker.chunk`.
+    paragraph: int
+    paragraphs: int
+    # Character offsets of text in the source paragraph. Merged chunks start at the first paragraph
+    # and end in the last one.
+    start: int
+    end: int
+    # Index of window and number of windows the source paragraph is split into. Merged and whole paragraphs
+    # are one window.
+    window: int = 0
+    windows: int = 1
+
+
+class Chunker:
+    """
+    Split long paragraphs into evenly sized, optionally overlapping windows and merge short neighbouring
+    paragraphs, so that indexed texts fit the vectorizer and reader token limits.
+
+    Args:
+        max_tokens: maximum number of tokens in a chunk.
+        min_tokens: paragraphs shorter than this are merged with the next paragraphs while the merged chunk
+            fits `max_tokens`.
+        overlap: number of tokens shared by neighbouring windows of a split paragraph.
+        tokenizer: Hugging Face tokenizer name or path to count model tokens exactly. If None, tokens are
+            approximated by :data:`RE_TOKEN`. Requires `transformers` package: `pip install "brainlet[embedding]"`.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 200,
+        min_tokens: int = 32,
+        overlap: int = 0,
+        tokenizer: Optional[str] = None,
+    ):
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("Overlap has to be non-negative and less than max_tokens")
+        if min_tokens > max_tokens:
+            raise ValueError("min_tokens has to be at most max_tokens")
+
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.overlap = overlap
+        self.tokenizer = None
+        if tokenizer is not None:
+            try:
+                from transformers import AutoTokenizer
+            except ImportError as error:
+                raise ImportError(
+                    'Model tokenizer requires transformers: pip install "brainlet[embedding]"'
+                ) from error
+            self.tokenizer = AutoTokenizer.from_pretrained(tokenizer)
+
+    def token_spans(self, text: str) -> list[tuple[int, int]]:
+        """
+        Character offsets of tokens of text.
+        """
+        if self.tokenizer is None:
+            return [match.span() for match in RE_TOKEN.finditer(text)]
+        encoding = self.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True
+        )
+        return [(start, end) for start, end in encoding["offset_mapping"]]
+
+    def split(self, paragraph: str) -> list[tuple[int, int]]:
+        """
+        Split paragraph into windows of at most `max_tokens` tokens. All windows have the same number of tokens,
+        so there are no short tails.
+
+        Returns: character offsets of windows.
+        """
+        spans = self.token_spans(paragraph)
+        if len(spans) <= self.max_tokens:
+            return [(0, len(paragraph))]
+
+        stride = self.max_tokens - self.overlap
+        num_windows = math.ceil((len(spans) - self.overlap) / stride)
+        size = math.ceil((len(spans) + (num_windows - 1) * self.overlap) / num_windows)
+
+        # Windows have the same size and are spread evenly, so neighbours share at least `overlap` tokens.
+        windows = []
+        for i in range(num_windows):
+            first = round(i * (len(spans) - size) / (num_windows - 1))
+            last = first + size - 1
+            start = 0 if i == 0 else spans[first][0]
+            end = len(paragraph) if i == num_windows - 1 else spans[last][1]
+            windows.append((start, end))
+        return windows
+
+    def chunk(self, paragraphs: list[str]) -> list[Chunk]:
+        """
+        Chunk paragraphs of one document. Short paragraphs next to a split one are merged with whole paragraphs
+        on the other side of it, if there are no whole neighbours to merge with on their side.
+
+        Returns: chunks in the order of their first paragraphs.
+        """
+        chunks: list[Chunk] = []
+        # Whole paragraphs of the current chunk and its number of tokens.
+        merged: list[int] = []
+        merged_tokens = 0
+        # Position of the last chunk made of whole paragraphs and its number of tokens.
+        last: Optional[int] = None
+        last_tokens = 0
+
+        def fits_last() -> bool:
+            return last is not None and last_tokens + merged_tokens <= self.max_tokens
+
+        def flush():
+            nonlocal merged_tokens, last, last_tokens
+            if not merged:
+                return
+            text = "\n".join(paragraphs[i] for i in merged)
+            end = len(paragraphs[merged[-1]])
+            if merged_tokens < self.min_tokens and fits_last():
+                # Short tail is merged into the previous chunk.
+                previous = chunks[last]  # type: ignore[index]
+                previous.text += "\n" + text
+                previous.paragraphs += len(merged)
+                previous.end = end
+                last_tokens += merged_tokens
+            else:
+                # Chunk carried over a split paragraph goes before its windows.
+                position = len(chunks)
+                while position > 0 and chunks[position - 1].paragraph > merged[0]:
+                    position -= 1
+                chunks.insert(position, Chunk(text, merged[0], len(merged), 0, end))
+                last, last_tokens = position, merged_tokens
+            merged.clear()
+            merged_tokens = 0
+
+        for i, paragraph in enumerate(paragraphs):
+            num_tokens = len(self.token_spans(paragraph))
+            if num_tokens > self.max_tokens:
+                # Short chunk is carried over the split paragraph unless the previous chunk takes it.
+                if merged_tokens >= self.min_tokens or fits_last():
+                    flush()
+                windows = self.split(paragraph)
+                for window, (start, end) in enumerate(windows):
+                    chunks.append(
+                        Chunk(
+                            paragraph[start:end],
+                            i,
+                            1,
+                            start,
+                            end,
+                            window,
+                            len(windows),
+                        )
+                    )
+                continue
+
+            if merged and (
+                merged_tokens >= self.min_tokens
+                or merged_tokens + num_tokens > self.max_tokens
+            ):
+                flush()
+            merged.append(i)
+            merged_tokens += num_tokens
+        flush()
+        return chunks
+
+    def chunk_document(self, document: dict) -> dict:
+        """
+        Replace paragraphs of document with chunk texts. Chunks are kept under "chunks" key.
+        """
+        chunks = self.chunk(document["paragraphs"])
+        return dict(
+            document, paragraphs=[chunk.text for chunk in chunks], chunks=chunks
+        )
+
+
+def rebuild_paragraph(windows: list[tuple[str, int, int]]) -> str:
+    """
+    Rebuild split paragraph from its windows.
+
+    Args:
+        windows: text, start and end offsets of every window of the paragraph.
+
+    Returns: paragraph text. Whitespace between windows is replaced with spaces.
+    """
+    text = ""
+    for window_text, start, _ in sorted(windows, key=lambda window: window[1]):
+        text = text[:start].ljust(start) + window_text
+    return text
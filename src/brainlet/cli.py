@@ -1,60 +1,506 @@
 import argparse
 import json
+import os
 import sys
-from typing import Iterator
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
 
 import weaviate
 from tqdm import tqdm
 
-from brainlet.core import create_schema, import_data, ask_question
+from brainlet.core import (
+    create_schema,
+    delete_schema,
+    import_data,
+    import_data_parallel,
+    ask_question,
+    ask_questions,
+    Answer,
+    RETRIEVAL_MODES,
+    build_schema,
+    add_index_listener,
+    INDEX_PROFILES,
+)
+from brainlet.benchmark import benchmark_cluster, benchmark_index_profiles
+from brainlet.calibration import Thresholds, calibrate_thresholds, threshold_curve
+from brainlet.cache import SQLiteCacheBackend
+from brainlet.chunking import Chunker
+from brainlet.client import ClientConfig, create_client
+from brainlet.embedding import Encoder, DEFAULT_MODEL
+from brainlet.export import export_index
+from brainlet.jsonl import read_jsonl
+from brainlet.lexical import LexicalIndex
+from brainlet.metrics import REGISTRY
 
 
-def iter_jsonl(filename: str) -> Iterator[dict]:
-    with open(filename) as file:
-        yield from map(json.loads, file)
+def load_encoder(model: Optional[str]) -> Optional[Encoder]:
+    return Encoder(model) if model is not None else None
+
+
+def load_lexical_index(
+    directory: Optional[str], candidates: int
+) -> Optional[LexicalIndex]:
+    return LexicalIndex(directory, candidates) if directory is not None else None
 
 
-def init(client: weaviate.Client, overwrite: bool = False, **kwargs):
+def init(
+    client: weaviate.Client,
+    overwrite: bool = False,
+    client_vectors: bool = False,
+    index_profile: Optional[str] = None,
+    flat_links: bool = False,
+    chunked: bool = False,
+    tenant: Optional[str] = None,
+    shards: Optional[int] = None,
+    virtual_per_physical: Optional[int] = None,
+    replicas: Optional[int] = None,
+    **kwargs,
+):
     try:
-        create_schema(client, overwrite=overwrite)
+        create_schema(
+            client,
+            build_schema(
+                client_vectors,
+                index_profile,
+                flat_links,
+                chunked,
+                tenant,
+                shards,
+                virtual_per_physical,
+                replicas,
+            ),
+            overwrite=overwrite,
+        )
     except RuntimeError:
         msg = "Data Schema already exists. Use --overwrite flag to overwrite schema."
         sys.exit(msg)
 
 
+def drop(client: weaviate.Client, tenant: Optional[str] = None, **kwargs):
+    if not delete_schema(client, tenant):
+        print("Nothing to drop: schema doesn't exist")
+
+
 def index(
     client: weaviate.Client,
+    weaviate_client: str,
     source: str,
     batch_size: int,
+    dynamic: bool = False,
+    num_workers: int = 1,
+    processes: int = 1,
+    timeout: float = 60,
+    timeout_retries: int = 3,
+    error_retries: int = 0,
+    pool_document_vectors: bool = False,
+    no_document_text: bool = False,
+    encoder: Optional[str] = None,
+    flat_links: bool = False,
+    incremental: bool = False,
+    max_tokens: Optional[int] = None,
+    min_tokens: int = 32,
+    overlap: int = 0,
+    tokenizer: Optional[str] = None,
+    lexical_index: Optional[str] = None,
+    tenant: Optional[str] = None,
+    node_urls: Optional[list[str]] = None,
+    progress: bool = False,
+    **kwargs,
+):
+    options: dict = dict(
+        batch_size=batch_size,
+        progress=progress,
+        dynamic=dynamic,
+        num_workers=num_workers,
+        timeout_retries=timeout_retries,
+        error_retries=error_retries,
+        pool_document_vectors=pool_document_vectors,
+        store_document_text=not no_document_text,
+        flat_links=flat_links,
+        incremental=incremental,
+        chunker=Chunker(max_tokens, min_tokens, overlap, tokenizer)
+        if max_tokens is not None
+        else None,
+        lexical_index=lexical_index,
+        tenant=tenant,
+    )
+
+    if processes > 1:
+        stats = import_data_parallel(
+            weaviate_client,
+            source,
+            processes,
+            timeout_config=(10, timeout),
+            encoder_model=encoder,
+            node_urls=node_urls,
+            **options,
+        )
+    else:
+        client.timeout_config = (10, timeout)
+        stats = [import_data(client, source, encoder=load_encoder(encoder), **options)]
+
+    print(
+        f"{'shard':>5} {'documents':>10} {'objects':>10} {'failures':>8} {'obj/s':>8} "
+        f"{'skipped':>8} {'deleted':>8}"
+    )
+    for shard_stats in stats:
+        print(
+            f"{shard_stats.shard:>5} {shard_stats.documents:>10} {shard_stats.objects:>10} "
+            f"{shard_stats.failures:>8} {shard_stats.objects_per_second:>8.2f} "
+            f"{shard_stats.skipped:>8} {shard_stats.deleted:>8}"
+        )
+    print(REGISTRY.summary("import."))
+
+
+def export(
+    client: weaviate.Client,
+    output_directory: str,
+    page_size: int = 256,
     progress: bool = False,
-    **kwargs
+    tenant: Optional[str] = None,
+    **kwargs,
+):
+    meta = export_index(client, output_directory, page_size, progress, tenant)
+    print(f"{'class':<10} {'objects':>10} {'dim':>6}")
+    for class_name, exported in meta["classes"].items():
+        print(f"{class_name:<10} {exported['count']:>10} {exported['dim']:>6}")
+    print(REGISTRY.summary("export."))
+
+
+def ask(
+    client: weaviate.Client,
+    question: str,
+    retrieval: str,
+    encoder: Optional[str] = None,
+    top_k: int = 1,
+    confident_certainty: Optional[float] = None,
+    latency_budget: Optional[float] = None,
+    flat_links: bool = False,
+    chunked: bool = False,
+    lexical_index: Optional[str] = None,
+    lexical_candidates: int = 100,
+    skip_below: Optional[float] = None,
+    min_certainty: Optional[float] = None,
+    tenant: Optional[str] = None,
+    **kwargs,
 ):
-    import_data(client, source, batch_size, progress)
+    print(
+        ask_question(
+            client,
+            question,
+            retrieval=retrieval,
+            encoder=load_encoder(encoder),
+            top_k=top_k,
+            confident_certainty=confident_certainty,
+            latency_budget=latency_budget,
+            flat_links=flat_links,
+            chunked=chunked,
+            lexical_index=load_lexical_index(lexical_index, lexical_candidates),
+            skip_below=skip_below,
+            min_certainty=min_certainty,
+            tenant=tenant,
+        )
+    )
+
+
+def load_answers(filename: str) -> dict:
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as file:
+        return json.load(file)
 
 
-def ask(client: weaviate.Client, question: str, **kwargs):
-    print(ask_question(client, question))
+def save_answers(answers: dict, filename: str):
+    # Write to temporary file first, so crash during writing doesn't corrupt already saved answers.
+    temporary_filename = filename + ".tmp"
+    with open(temporary_filename, "w") as file:
+        json.dump(answers, file, ensure_ascii=False)
+    os.replace(temporary_filename, filename)
 
 
 def inference(
     client: weaviate.Client,
     questions_file: str,
     output_file: str,
+    retrieval: str,
+    concurrency: int = 1,
+    batch_size: int = 16,
+    encoder: Optional[str] = None,
+    top_k: int = 1,
+    confident_certainty: Optional[float] = None,
+    latency_budget: Optional[float] = None,
+    flat_links: bool = False,
+    chunked: bool = False,
+    lexical_index: Optional[str] = None,
+    lexical_candidates: int = 100,
+    skip_below: Optional[float] = None,
+    min_certainty: Optional[float] = None,
+    scores_file: Optional[str] = None,
+    tenant: Optional[str] = None,
     progress: bool = False,
-    **kwargs
+    **kwargs,
 ):
-    questions = iter_jsonl(questions_file)
-    result: dict[str, str] = {}
+    question_encoder = load_encoder(encoder)
+    question_lexical_index = load_lexical_index(lexical_index, lexical_candidates)
 
-    if progress:
-        questions = tqdm(list(questions), smoothing=0.0)
+    # Resume previous run: questions with saved answers are skipped.
+    result = load_answers(output_file)
+    scores = load_answers(scores_file) if scores_file is not None else {}
+    questions = [q for q in read_jsonl(questions_file) if q["id"] not in result]
 
-    for question in questions:
-        answer = ask_question(client, question["question"])
-        result[question["id"]] = answer.answer if answer.answer is not None else ""
+    progress_bar = tqdm(total=len(questions), smoothing=0.0, disable=not progress)
 
-    with open(output_file, "w") as file:
-        json.dump(result, file, ensure_ascii=False)
+    def answer_batch(batch: list[dict]) -> list[Answer]:
+        # Every retrieval stage of the batch is sent to weaviate in one request.
+        return ask_questions(
+            client,
+            [question["question"] for question in batch],
+            retrieval=retrieval,
+            encoder=question_encoder,
+            top_k=top_k,
+            confident_certainty=confident_certainty,
+            latency_budget=latency_budget,
+            flat_links=flat_links,
+            chunked=chunked,
+            lexical_index=question_lexical_index,
+            skip_below=skip_below,
+            min_certainty=min_certainty,
+            tenant=tenant,
+        )
+
+    def save():
+        if scores_file is not None:
+            save_answers(scores, scores_file)
+        save_answers(result, output_file)
+
+    # Batches are submitted ahead of answered ones, so workers stay busy while answers are saved.
+    # The number of batches in flight is bounded, so they don't pile up in memory.
+    pending: deque[tuple[list[dict], Future]] = deque()
+
+    def collect():
+        # Answers are collected in the order of questions file.
+        batch, future = pending.popleft()
+        for question, answer in zip(batch, future.result()):
+            result[question["id"]] = answer.answer or ""
+            scores[question["id"]] = {
+                "score": answer.score,
+                "certainty": answer.certainty,
+            }
+        progress_bar.update(len(batch))
+        save()
+
+    try:
+        with ThreadPoolExecutor(concurrency) as executor:
+            for start in range(0, len(questions), batch_size):
+                batch = questions[start : start + batch_size]
+                pending.append((batch, executor.submit(answer_batch, batch)))
+                if len(pending) >= 2 * concurrency:
+                    collect()
+            while pending:
+                collect()
+    finally:
+        # Answers collected before a failure are kept for the next run.
+        progress_bar.close()
+        save()
+
+    print(REGISTRY.summary("ask."))
+
+
+def calibrate(
+    scores_file: str,
+    evaluation_file: str,
+    max_f1_loss: float = 1.0,
+    **kwargs,
+):
+    scores = load_answers(scores_file)
+    evaluation = load_answers(evaluation_file)
+
+    # Curve points at every tenth of skipped questions.
+    print(f"{'skip below':>12} {'min certainty':>14} {'skipped':>8} {'f1':>7}")
+    curve = threshold_curve(scores, evaluation)
+    shown = -1.0
+    for thresholds in curve:
+        if thresholds.skipped >= shown + 0.1 or thresholds is curve[-1]:
+            shown = thresholds.skipped
+            print(_format_thresholds(thresholds))
+
+    best = calibrate_thresholds(scores, evaluation, max_f1_loss)
+    print(f"\nSkipping the most questions within {max_f1_loss} F1 points:")
+    print(_format_thresholds(best))
+    options = [
+        f"--{name.replace('_', '-')} {value}"
+        for name, value in (
+            ("skip_below", best.skip_below),
+            ("min_certainty", best.min_certainty),
+        )
+        if value is not None
+    ]
+    if options:
+        print("Use " + " ".join(options))
+
+
+def _format_thresholds(thresholds: Thresholds) -> str:
+    skip_below, min_certainty = (
+        f"{value:.6g}" if value is not None else "-"
+        for value in (thresholds.skip_below, thresholds.min_certainty)
+    )
+    return f"{skip_below:>12} {min_certainty:>14} {thresholds.skipped:>8.1%} {thresholds.f1:>7.2f}"
+
+
+def benchmark_index(
+    client: weaviate.Client,
+    source: str,
+    profiles: list[str],
+    k: int = 10,
+    num_queries: int = 100,
+    batch_size: int = 8,
+    encoder: Optional[str] = None,
+    **kwargs,
+):
+    question_encoder = load_encoder(encoder)
+    results = benchmark_index_profiles(
+        client,
+        source,
+        profiles,
+        k=k,
+        num_queries=num_queries,
+        client_vectors=question_encoder is not None,
+        batch_size=batch_size,
+        encoder=question_encoder,
+    )
+
+    print(
+        f"{'profile':<12} {'objects':>8} {'build, s':>9} {'memory, MB':>10} "
+        f"{'p50, ms':>8} {'p99, ms':>8} {f'recall@{k}':>9}"
+    )
+    for result in results:
+        print(
+            f"{result.profile:<12} {result.objects:>8} {result.build_seconds:>9.2f} "
+            f"{result.memory_bytes / 2**20:>10.1f} {result.query_p50 * 1000:>8.2f} "
+            f"{result.query_p99 * 1000:>8.2f} {result.recall:>9.3f}"
+        )
+
+
+def benchmark_cluster_scaling(
+    weaviate_client: str,
+    source: str,
+    node_urls: Optional[list[str]],
+    shards: list[int],
+    replicas: list[int],
+    virtual_per_physical: Optional[int] = None,
+    processes: Optional[int] = None,
+    concurrency: int = 8,
+    num_questions: int = 100,
+    batch_size: int = 8,
+    **kwargs,
+):
+    node_urls = node_urls or [weaviate_client]
+    results = benchmark_cluster(
+        node_urls,
+        source,
+        shards,
+        replicas,
+        virtual_per_physical,
+        processes=processes or len(node_urls),
+        concurrency=concurrency,
+        num_questions=num_questions,
+        batch_size=batch_size,
+    )
+
+    print(
+        f"{'shards':>6} {'replicas':>8} {'objects':>8} {'obj/s':>8} "
+        f"{'ask p50, ms':>11} {'ask p99, ms':>11} {'ask/s':>8}"
+    )
+    for result in results:
+        print(
+            f"{result.shards:>6} {result.replicas:>8} {result.objects:>8} "
+            f"{result.objects_per_second:>8.2f} {result.ask_p50 * 1000:>11.2f} "
+            f"{result.ask_p99 * 1000:>11.2f} {result.ask_rps:>8.2f}"
+        )
+
+
+def add_node_urls_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--node-urls",
+        type=str,
+        nargs="+",
+        help="urls of weaviate cluster nodes to spread requests over. By default only --weaviate-client is used",
+    )
+
+
+def add_reranking_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-k",
+        "--top-k",
+        type=int,
+        default=1,
+        help="number of candidate documents. The most certain answer among them is returned",
+    )
+    parser.add_argument(
+        "--confident-certainty",
+        type=float,
+        help="ask the rest of top-k documents only if answer from the first one is less certain",
+    )
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        help="don't ask the rest of top-k documents after this time, seconds",
+    )
+
+
+def add_threshold_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--skip-below",
+        type=float,
+        help="answer with no answer without asking paragraphs if vector certainty of the nearest document is lower. "
+        "See calibrate",
+    )
+    parser.add_argument(
+        "--min-certainty",
+        type=float,
+        help="replace answers less certain than this with no answer",
+    )
+
+
+def add_flat_links_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--flat-links",
+        action="store_true",
+        help="link paragraphs to documents with plain properties instead of cross-references. "
+        "Use the same flag for init, index and asking",
+    )
+
+
+def add_chunked_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="paragraphs are chunks imported with index --max-tokens. Use the same flag for init and asking",
+    )
+
+
+def add_tenant_argument(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--tenant",
+        type=str,
+        help="knowledge base with its own classes, e.g. acme uses AcmeDocument and AcmeParagraph. "
+        "By default Document and Paragraph are used",
+    )
+
+
+def add_lexical_index_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--lexical-index",
+        type=str,
+        help="local BM25 index built by index --lexical-index. Confident title matches skip hybrid search",
+    )
+    parser.add_argument(
+        "--lexical-candidates",
+        type=int,
+        default=100,
+        help="number of lexical candidates hybrid search is limited to. Zero disables the limit",
+    )
 
 
 def cli():
@@ -62,26 +508,180 @@ def cli():
     parser.add_argument(
         "-c", "--weaviate-client", type=str, default="http://127.0.0.1:8080"
     )
+    parser.add_argument(
+        "--answer-cache-file",
+        type=str,
+        default=os.getenv("ANSWER_CACHE_FILE"),
+        help="API answer cache file to invalidate after index changes",
+    )
     subparsers = parser.add_subparsers(required=True)
 
     init_parser = subparsers.add_parser("init", help="Initialize index schema")
     init_parser.add_argument(
         "--overwrite", action="store_true", help="whether to overwrite existing schema"
     )
+    init_parser.add_argument(
+        "--client-vectors",
+        action="store_true",
+        help="create schema for vectors computed by in-process encoder (see --encoder)",
+    )
+    init_parser.add_argument(
+        "--index-profile",
+        choices=list(INDEX_PROFILES),
+        help="HNSW settings. Default ones are the same as high-recall",
+    )
+    add_flat_links_argument(init_parser)
+    add_chunked_argument(init_parser)
+    add_tenant_argument(init_parser)
+    init_parser.add_argument(
+        "--shards",
+        type=int,
+        help="number of shards of every class. By default weaviate creates one shard per node",
+    )
+    init_parser.add_argument(
+        "--virtual-per-physical",
+        type=int,
+        help="number of virtual shards per shard. Objects are spread over them by id hash",
+    )
+    init_parser.add_argument(
+        "--replicas",
+        type=int,
+        help="replication factor, at most the number of nodes. By default data isn't replicated",
+    )
     init_parser.set_defaults(func=init)
 
+    drop_parser = subparsers.add_parser(
+        "drop", help="Delete schema and data of a tenant, other tenants are kept"
+    )
+    add_tenant_argument(drop_parser)
+    drop_parser.set_defaults(func=drop)
+
     index_parser = subparsers.add_parser(
         "index", help="Import data and perform indexing"
     )
     index_parser.add_argument(
-        "-s", "--source", type=str, required=True, help="Source .jsonl file"
+        "-s",
+        "--source",
+        type=str,
+        required=True,
+        help="Source .jsonl file or directory written by brainlet export",
     )
     index_parser.add_argument("-b", "--batch-size", type=int, default=8)
+    index_parser.add_argument(
+        "--dynamic",
+        action="store_true",
+        help="adjust batch size dynamically based on weaviate processing time",
+    )
+    index_parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="number of threads sending batches concurrently in each process",
+    )
+    index_parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="number of processes. Source file is split into the same number of shards",
+    )
+    index_parser.add_argument(
+        "--timeout", type=float, default=60, help="batch request timeout, seconds"
+    )
+    index_parser.add_argument("--timeout-retries", type=int, default=3)
+    index_parser.add_argument(
+        "--error-retries",
+        type=int,
+        default=0,
+        help="number of retries of objects failed by weaviate",
+    )
+    index_parser.add_argument(
+        "--pool-document-vectors",
+        action="store_true",
+        help="compute document vectors as the mean of paragraph vectors instead of vectorizing document text",
+    )
+    index_parser.add_argument(
+        "--no-document-text",
+        action="store_true",
+        help="don't store document text. Document hybrid search uses title only",
+    )
+    index_parser.add_argument(
+        "--encoder",
+        type=str,
+        help=f"sentence-transformers model of in-process encoder, e.g. {DEFAULT_MODEL}",
+    )
+    add_flat_links_argument(index_parser)
+    index_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="import only new and changed documents, delete documents missing from source",
+    )
+    index_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        help="split paragraphs longer than this into windows and merge short ones. "
+        "Requires schema initialized with --chunked",
+    )
+    index_parser.add_argument(
+        "--min-tokens",
+        type=int,
+        default=32,
+        help="merge paragraphs shorter than this with neighbours",
+    )
+    index_parser.add_argument(
+        "--overlap",
+        type=int,
+        default=0,
+        help="number of tokens shared by neighbouring windows",
+    )
+    index_parser.add_argument(
+        "--tokenizer",
+        type=str,
+        help=f"count tokens with tokenizer of this model, e.g. {DEFAULT_MODEL}. "
+        "By default words and punctuation are counted",
+    )
+    index_parser.add_argument(
+        "--lexical-index",
+        type=str,
+        help="directory to save local BM25 index of imported documents to",
+    )
+    add_tenant_argument(index_parser)
+    add_node_urls_argument(index_parser)
     index_parser.add_argument("-p", "--progress", action="store_true")
     index_parser.set_defaults(func=index)
 
+    export_parser = subparsers.add_parser(
+        "export", help="Export objects and vectors of the index"
+    )
+    export_parser.add_argument(
+        "-o",
+        "--output-directory",
+        type=str,
+        required=True,
+        help="directory for meta.json, objects .jsonl and vectors .f32 files",
+    )
+    export_parser.add_argument(
+        "--page-size", type=int, default=256, help="objects fetched per request"
+    )
+    add_tenant_argument(export_parser)
+    export_parser.add_argument("-p", "--progress", action="store_true")
+    export_parser.set_defaults(func=export)
+
     ask_parser = subparsers.add_parser("ask", help="CLI interface for asking")
     ask_parser.add_argument("question", type=str)
+    ask_parser.add_argument(
+        "-r", "--retrieval", choices=RETRIEVAL_MODES, default="two-stage"
+    )
+    ask_parser.add_argument(
+        "--encoder",
+        type=str,
+        help=f"sentence-transformers model of in-process encoder, e.g. {DEFAULT_MODEL}",
+    )
+    add_reranking_arguments(ask_parser)
+    add_threshold_arguments(ask_parser)
+    add_flat_links_argument(ask_parser)
+    add_chunked_argument(ask_parser)
+    add_lexical_index_arguments(ask_parser)
+    add_tenant_argument(ask_parser)
     ask_parser.set_defaults(func=ask)
 
     inference_parser = subparsers.add_parser(
@@ -97,12 +697,142 @@ def cli():
         "--output-file",
         required=True,
         type=str,
-        help="file to output answers in squad-2.0 format",
+        help="file to output answers in squad-2.0 format. Questions already answered in this file are skipped",
+    )
+    inference_parser.add_argument(
+        "-r", "--retrieval", choices=RETRIEVAL_MODES, default="two-stage"
+    )
+    inference_parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=1,
+        help="number of question batches processed concurrently",
+    )
+    inference_parser.add_argument(
+        "-b",
+        "--batch-size",
+        type=int,
+        default=16,
+        help="number of questions asked in one weaviate request. Answers are saved to output file after every batch",
+    )
+    inference_parser.add_argument(
+        "--encoder",
+        type=str,
+        help=f"sentence-transformers model of in-process encoder, e.g. {DEFAULT_MODEL}",
+    )
+    add_reranking_arguments(inference_parser)
+    add_threshold_arguments(inference_parser)
+    add_flat_links_argument(inference_parser)
+    add_chunked_argument(inference_parser)
+    add_lexical_index_arguments(inference_parser)
+    add_tenant_argument(inference_parser)
+    inference_parser.add_argument(
+        "--scores-file",
+        type=str,
+        help="file to output score and answer certainty of every question to, see calibrate",
     )
     inference_parser.add_argument("-p", "--progress", action="store_true")
     inference_parser.set_defaults(func=inference)
 
+    calibrate_parser = subparsers.add_parser(
+        "calibrate",
+        help="Fit --skip-below and --min-certainty to inference results",
+    )
+    calibrate_parser.add_argument(
+        "--scores-file",
+        type=str,
+        required=True,
+        help="scores file of inference run without thresholds",
+    )
+    calibrate_parser.add_argument(
+        "--evaluation-file",
+        type=str,
+        required=True,
+        help="per-question file of evaluate_squad.py --per-question-file for the same run",
+    )
+    calibrate_parser.add_argument(
+        "--max-f1-loss",
+        type=float,
+        default=1.0,
+        help="maximum F1 loss, points",
+    )
+    # Calibration reads files only.
+    calibrate_parser.set_defaults(func=calibrate, connect=False)
+
+    benchmark_parser = subparsers.add_parser(
+        "benchmark-index",
+        help="Compare index profiles: build time, memory, query latency and recall. Deletes existing data!",
+    )
+    benchmark_parser.add_argument(
+        "-s", "--source", type=str, required=True, help="Sample .jsonl corpus"
+    )
+    benchmark_parser.add_argument(
+        "--profiles",
+        choices=list(INDEX_PROFILES),
+        nargs="+",
+        default=list(INDEX_PROFILES),
+    )
+    benchmark_parser.add_argument(
+        "-k", type=int, default=10, help="number of neighbours for recall@k"
+    )
+    benchmark_parser.add_argument(
+        "-n",
+        "--num-queries",
+        type=int,
+        default=100,
+        help="number of stored paragraph vectors used as queries",
+    )
+    benchmark_parser.add_argument("-b", "--batch-size", type=int, default=8)
+    benchmark_parser.add_argument(
+        "--encoder",
+        type=str,
+        help=f"sentence-transformers model of in-process encoder, e.g. {DEFAULT_MODEL}",
+    )
+    benchmark_parser.set_defaults(func=benchmark_index)
+
+    cluster_parser = subparsers.add_parser(
+        "benchmark-cluster",
+        help="Compare import and ask throughput of shard counts and replication factors. Deletes existing data!",
+    )
+    cluster_parser.add_argument(
+        "-s", "--source", type=str, required=True, help="Sample .jsonl corpus"
+    )
+    add_node_urls_argument(cluster_parser)
+    cluster_parser.add_argument("--shards", type=int, nargs="+", default=[1])
+    cluster_parser.add_argument("--replicas", type=int, nargs="+", default=[1])
+    cluster_parser.add_argument("--virtual-per-physical", type=int)
+    cluster_parser.add_argument(
+        "--processes",
+        type=int,
+        help="number of import processes. By default one per node",
+    )
+    cluster_parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="number of questions asked concurrently",
+    )
+    cluster_parser.add_argument(
+        "-n",
+        "--num-questions",
+        type=int,
+        default=100,
+        help="number of questions made of document titles",
+    )
+    cluster_parser.add_argument("-b", "--batch-size", type=int, default=8)
+    # Clients of all nodes are created by the benchmark.
+    cluster_parser.set_defaults(func=benchmark_cluster_scaling, connect=False)
+
     args = parser.parse_args()
-    client = weaviate.Client(args.weaviate_client, startup_period=60)
+    if args.answer_cache_file is not None:
+        add_index_listener(SQLiteCacheBackend(args.answer_cache_file).clear)
+
+    client = (
+        create_client(ClientConfig(args.weaviate_client))
+        if getattr(args, "connect", True)
+        else None
+    )
 
     args.func(client=client, **vars(args))
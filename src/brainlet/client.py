@@ -0,0 +1,135 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import requests  # type: ignore[import]
+import weaviate
+from weaviate.exceptions import WeaviateStartUpError
+
+DEFAULT_URL = "http://127.0.0.1:8080"
+
+
+@dataclass
+class ClientConfig:
+    url: str = DEFAULT_URL
+    # Maximum number of kept-alive connections. Should be at least the number of threads sharing the client,
+    # otherwise connections above the limit are closed after every request and reopened by the next one.
+    pool_size: int = 20
+    # Timeouts of every request, seconds.
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    # Time to wait for weaviate readiness, seconds.
+    startup_period: float = 60.0
+    # Maximum delay between readiness checks, seconds. Actual delays are randomized.
+    max_retry_delay: float = 8.0
+
+
+def wait_for_weaviate(
+    url: str, startup_period: float, max_retry_delay: float = 8.0
+) -> None:
+    """
+    Wait until weaviate is ready. Unlike the client's own wait, delays between checks grow exponentially
+    and are randomized, so many processes started together don't poll weaviate in lockstep.
+
+    Args:
+        url: weaviate url.
+        startup_period: time to wait, seconds.
+        max_retry_delay: maximum delay between checks, seconds.
+
+    Raises:
+        WeaviateStartUpError: if weaviate is not ready after `startup_period` seconds.
+    """
+    deadline = time.monotonic() + startup_period
+    delay = 0.25
+    while True:
+        try:
+            requests.get(f"{url}/v1/.well-known/ready", timeout=5).raise_for_status()
+            return
+        except requests.RequestException as error:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise WeaviateStartUpError(
+                    f"Weaviate at {url} is not ready after {startup_period} seconds"
+                ) from error
+            time.sleep(min(remaining, random.uniform(delay / 2, delay)))
+            delay = min(delay * 2, max_retry_delay)
+
+
+def create_client(config: ClientConfig) -> weaviate.Client:
+    """
+    Wait for weaviate and create client with connection pool and timeouts of `config`.
+    """
+    wait_for_weaviate(config.url, config.startup_period, config.max_retry_delay)
+    return weaviate.Client(
+        config.url,
+        timeout_config=(config.connect_timeout, config.read_timeout),
+        startup_period=None,
+        additional_config=weaviate.Config(
+            connection_config=weaviate.ConnectionConfig(
+                session_pool_connections=config.pool_size,
+                session_pool_maxsize=config.pool_size,
+            )
+        ),
+    )
+
+
+class ManagedClient:
+    """
+    Weaviate client shared by threads and created on first use, so that the process starts without waiting
+    for weaviate. If connection fails, the next use tries again.
+
+    Args:
+        config: client settings.
+    """
+
+    def __init__(self, config: ClientConfig):
+        self.config = config
+        # Error of the last failed connection attempt.
+        self.error: Optional[Exception] = None
+        self._client: Optional[weaviate.Client] = None
+        self._lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> weaviate.Client:
+        """
+        Return client, connect if needed. Blocks while weaviate is starting.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    try:
+                        self._client = create_client(self.config)
+                        self.error = None
+                    except Exception as error:
+                        self.error = error
+                        raise
+        return self._client
+
+    def connect_in_background(self, jitter: float = 0.0) -> threading.Thread:
+        """
+        Connect in a daemon thread after random delay of up to `jitter` seconds. The delay spreads the first
+        requests of many workers started together. Errors are kept in `error`.
+        """
+
+        def connect():
+            time.sleep(random.uniform(0, jitter))
+            try:
+                self.get()
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=connect, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                # Client 3.x has no public close, its connection closes pooled sessions.
+                self._client._connection.close()
+                self._client = None
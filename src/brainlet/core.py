@@ -1,10 +1,30 @@
+import asyncio
+import copy
+import hashlib
 import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterator, Iterable, Union, Optional
+from functools import partial
+from typing import Callable, Iterator, Iterable, Union, Optional, Sequence
 
+import numpy as np
 import weaviate
 from tqdm import tqdm
-from weaviate.util import generate_uuid5
+from weaviate import WeaviateErrorRetryConf
+from weaviate.batch import Batch
+from weaviate.gql.get import GetBuilder
+from weaviate.util import generate_uuid5, check_batch_result
+
+from brainlet.chunking import Chunker, rebuild_paragraph
+from brainlet.client import ClientConfig, create_client
+from brainlet.embedding import Encoder
+from brainlet.lexical import LexicalIndex, LexicalIndexBuilder
+from brainlet.jsonl import is_compressed, open_binary, read_jsonl
+from brainlet.metrics import REGISTRY, timer
 
 # This schema describes data storage, index and ann-search setting.
 DEFAULT_SCHEMA = {
@@ -40,6 +60,12 @@ DEFAULT_SCHEMA = {
                         }
                     },
                 },
+                {
+                    "name": "contentHash",
+                    "dataType": ["string"],
+                    "indexInverted": False,
+                    "moduleConfig": {"text2vec-transformers": {"skip": True}},
+                },
                 {"name": "hasParagraphs", "dataType": ["Paragraph"]},
             ],
             "vectorizer": "text2vec-transformers",
@@ -83,14 +109,272 @@ DEFAULT_SCHEMA = {
 }
 
 
-def iter_data(jsonl_filename: str) -> Iterator[dict]:
-    with open(jsonl_filename) as file:
-        for line in file:
-            yield json.loads(line)
+# HNSW settings of both classes. `high-recall` is the one of `DEFAULT_SCHEMA`.
+# Negative `ef` means dynamic `ef` chosen by weaviate from query limit.
+INDEX_PROFILES = {
+    "fast-build": {"ef": 64, "efConstruction": 64, "maxConnections": 16},
+    "balanced": {"ef": -1, "efConstruction": 128, "maxConnections": 32},
+    "high-recall": {"ef": -1, "efConstruction": 512, "maxConnections": 128},
+}
+
+
+# Callbacks called after indexed data is changed, e.g. to invalidate cached answers.
+_index_listeners: list[Callable[[], None]] = []
+
+
+def add_index_listener(listener: Callable[[], None]):
+    """
+    Register callback called after :func:`create_schema` or :func:`import_data` changes the index.
+
+    Args:
+        listener: callback without arguments.
+    """
+    _index_listeners.append(listener)
+
+
+def _notify_index_changed():
+    for listener in _index_listeners:
+        listener()
+
+
+def iter_data(
+    jsonl_filename: str, shard: int = 0, num_shards: int = 1
+) -> Iterator[dict]:
+    """
+    Iterate over samples of jsonl file.
+
+    Args:
+        jsonl_filename: path to jsonl file. Compressed files are supported, see :func:`brainlet.jsonl.open_binary`.
+        shard: index of shard to read.
+        num_shards: number of shards. File is split into contiguous byte ranges of equal size,
+            and a line belongs to the shard whose range contains the first byte of the line.
+            Compressed files can't be sharded.
+
+    Yields: samples of the shard.
+    """
+    if num_shards == 1:
+        yield from read_jsonl(jsonl_filename)
+        return
+
+    if is_compressed(jsonl_filename):
+        raise ValueError(f"Compressed file {jsonl_filename} can't be read by shards")
+
+    size = os.path.getsize(jsonl_filename)
+    start, end = size * shard // num_shards, size * (shard + 1) // num_shards
+    yield from read_jsonl(jsonl_filename, start, end)
+
+
+def count_lines(filename: str, chunk_size: int = 1 << 20) -> int:
+    """
+    Count lines of a file without decoding it. Reads file by chunks, so memory usage doesn't depend on file size.
+    Compressed files are decompressed on the fly.
+
+    Args:
+        filename: path to file.
+        chunk_size: size of chunk in bytes.
+
+    Returns: number of lines. The last line is counted even if it doesn't end with a newline.
+    """
+    count = 0
+    last_chunk = b""
+    with open_binary(filename) as file:
+        while chunk := file.read(chunk_size):
+            count += chunk.count(b"\n")
+            last_chunk = chunk
+    if last_chunk and not last_chunk.endswith(b"\n"):
+        count += 1
+    return count
+
+
+# Tenant names are prefixes of class names, so they follow weaviate class name rules.
+RE_TENANT = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+
+
+@dataclass(frozen=True)
+class Collection:
+    # Pair of classes holding one knowledge base. Every tenant has its own pair, with its own vector
+    # and inverted indexes.
+    document: str = "Document"
+    paragraph: str = "Paragraph"
+
+
+DEFAULT_COLLECTION = Collection()
+
+
+def get_collection(tenant: Optional[str] = None) -> Collection:
+    """
+    Classes of a tenant, e.g. `AcmeDocument` and `AcmeParagraph` of tenant "acme".
+    If tenant is None, the classes of :data:`DEFAULT_SCHEMA` are used.
+    """
+    if tenant is None:
+        return DEFAULT_COLLECTION
+    if not RE_TENANT.fullmatch(tenant):
+        raise ValueError(
+            f"Invalid tenant {tenant!r}: use letters, digits and underscores, starting with a letter"
+        )
+    prefix = tenant[0].upper() + tenant[1:]
+    return Collection(prefix + "Document", prefix + "Paragraph")
+
+
+def _rename_classes(schema: dict, source: Collection, target: Collection) -> dict:
+    # Rename classes of schema and the data types of references to them.
+    names = {source.document: target.document, source.paragraph: target.paragraph}
+    schema = copy.deepcopy(schema)
+    for object_class in schema["classes"]:
+        object_class["class"] = names.get(object_class["class"], object_class["class"])
+        for class_property in object_class["properties"]:
+            class_property["dataType"] = [
+                names.get(data_type, data_type)
+                for data_type in class_property["dataType"]
+            ]
+    return schema
+
+
+def _apply_cluster_config(
+    schema: dict,
+    shards: Optional[int],
+    virtual_per_physical: Optional[int],
+    replicas: Optional[int],
+):
+    for name, value in (
+        ("shards", shards),
+        ("virtual_per_physical", virtual_per_physical),
+        ("replicas", replicas),
+    ):
+        if value is not None and value < 1:
+            raise ValueError(f"{name} has to be positive")
+
+    sharding_config = {}
+    if shards is not None:
+        sharding_config["desiredCount"] = shards
+    if virtual_per_physical is not None:
+        sharding_config["virtualPerPhysical"] = virtual_per_physical
+    for object_class in schema["classes"]:
+        if sharding_config:
+            object_class["shardingConfig"] = dict(sharding_config)
+        if replicas is not None:
+            object_class["replicationConfig"] = {"factor": replicas}
+
+
+def _get_class(schema: dict, class_name: str) -> dict:
+    return next(c for c in schema["classes"] if c["class"] == class_name)
+
+
+def _apply_index_profile(schema: dict, index_profile: str):
+    if index_profile not in INDEX_PROFILES:
+        raise ValueError(
+            f"Unknown index profile {index_profile}. Use one of {list(INDEX_PROFILES)}"
+        )
+    for object_class in schema["classes"]:
+        object_class["vectorIndexConfig"] = dict(INDEX_PROFILES[index_profile])
+
+
+# Paragraph properties linking it to its document, used instead of cross-references with `flat_links`.
+# Only the id is indexed to filter paragraphs of a document.
+FLAT_LINK_PROPERTIES = [
+    {
+        "name": "documentId",
+        "dataType": ["string"],
+        "tokenization": "field",
+        "indexInverted": True,
+        "moduleConfig": {"text2vec-transformers": {"skip": True}},
+    },
+    {
+        "name": "documentTitle",
+        "dataType": ["string"],
+        "indexInverted": False,
+        "moduleConfig": {"text2vec-transformers": {"skip": True}},
+    },
+    {
+        "name": "documentUrl",
+        "dataType": ["string"],
+        "indexInverted": False,
+        "moduleConfig": {"text2vec-transformers": {"skip": True}},
+    },
+]
+
+
+# Paragraph properties of chunks, see :class:`brainlet.chunking.Chunk`. Offsets of windows of a split paragraph
+# are used to rebuild it as answer support text.
+CHUNK_PROPERTIES = [
+    {
+        "name": name,
+        "dataType": ["int"],
+        "indexInverted": False,
+        "moduleConfig": {"text2vec-transformers": {"skip": True}},
+    }
+    for name in ("paragraphIndex", "startOffset", "endOffset", "window", "windows")
+]
+
+
+def build_schema(
+    client_vectors: bool = False,
+    index_profile: Optional[str] = None,
+    flat_links: bool = False,
+    chunked: bool = False,
+    tenant: Optional[str] = None,
+    shards: Optional[int] = None,
+    virtual_per_physical: Optional[int] = None,
+    replicas: Optional[int] = None,
+) -> dict:
+    """
+    Build data schema based on `DEFAULT_SCHEMA`.
+
+    Args:
+        client_vectors: whether vectors are computed on client side, see :class:`brainlet.embedding.Encoder`.
+            `Document` class gets `none` vectorizer. `Paragraph` class keeps its vectorizer, because `ask` search
+            vectorizes question inside weaviate, but imported paragraphs are never vectorized by it.
+        index_profile: name of HNSW settings from :data:`INDEX_PROFILES`. If None, keep `DEFAULT_SCHEMA` settings.
+        flat_links: whether to link paragraphs to documents with :data:`FLAT_LINK_PROPERTIES` instead of
+            `hasParagraphs` and `inDocument` cross-references. Data has to be imported with the same option.
+        chunked: whether paragraphs have :data:`CHUNK_PROPERTIES`. Required to import data with `chunker`.
+        tenant: if set, classes are named after the tenant, see :func:`get_collection`.
+        shards: number of physical shards of every class. Weaviate places them on different nodes of a cluster.
+            If None, weaviate creates one shard per node.
+        virtual_per_physical: number of virtual shards per physical one. Objects are assigned to virtual shards
+            by hash of their id, so shards fill evenly in any order of import. If None, weaviate default is used.
+        replicas: replication factor of every class, at most the number of nodes. If None, data isn't replicated.
+
+    Returns: data and index schema.
+    """
+    schema = copy.deepcopy(DEFAULT_SCHEMA)
+
+    if flat_links:
+        document_class = _get_class(schema, "Document")
+        paragraph_class = _get_class(schema, "Paragraph")
+        document_class["properties"] = [
+            p for p in document_class["properties"] if p["name"] != "hasParagraphs"
+        ]
+        paragraph_class["properties"] = [
+            p for p in paragraph_class["properties"] if p["name"] != "inDocument"
+        ] + copy.deepcopy(FLAT_LINK_PROPERTIES)
+
+    if chunked:
+        _get_class(schema, "Paragraph")["properties"] += copy.deepcopy(CHUNK_PROPERTIES)
+
+    if index_profile is not None:
+        _apply_index_profile(schema, index_profile)
+
+    _apply_cluster_config(schema, shards, virtual_per_physical, replicas)
+
+    if client_vectors:
+        document_class = _get_class(schema, "Document")
+        document_class["vectorizer"] = "none"
+        del document_class["moduleConfig"]
+        for document_property in document_class["properties"]:
+            document_property.pop("moduleConfig", None)
+
+    if tenant is not None:
+        schema = _rename_classes(schema, DEFAULT_COLLECTION, get_collection(tenant))
+    return schema
 
 
 def create_schema(
-    client: weaviate.Client, schema: Optional[dict] = None, overwrite: bool = False
+    client: weaviate.Client,
+    schema: Optional[dict] = None,
+    overwrite: bool = False,
+    index_profile: Optional[str] = None,
+    tenant: Optional[str] = None,
 ):
     """
     Create weaviate data schema.
@@ -98,12 +382,24 @@ def create_schema(
     Args:
         client: weaviate client.
         schema: data and index schema. If None, use `DEFAULT_SCHEMA`.
-        overwrite: whether to force overwrite schema if one already exists.
+        overwrite: whether to force overwrite classes of the schema if they already exist. Other classes,
+            e.g. of other tenants, are kept.
+        index_profile: name of HNSW settings from :data:`INDEX_PROFILES` applied to all classes of the schema.
+        tenant: tenant of the default schema, see :func:`get_collection`. Build schema with the same option
+            instead if `schema` is given.
     """
-    if overwrite:
-        client.schema.delete_all()
+    if schema is None:
+        schema = build_schema(index_profile=index_profile, tenant=tenant)
+    elif tenant is not None:
+        raise ValueError("Tenant of a given schema is set by build_schema")
+    elif index_profile is not None:
+        schema = copy.deepcopy(schema)
+        _apply_index_profile(schema, index_profile)
 
-    schema = DEFAULT_SCHEMA if schema is None else schema
+    if overwrite:
+        for object_class in schema["classes"]:
+            if client.schema.exists(object_class["class"]):
+                client.schema.delete_class(object_class["class"])
 
     for object_class in schema["classes"]:
         class_name = object_class["class"]
@@ -113,6 +409,418 @@ def create_schema(
             )
 
     client.schema.create(schema)
+    _notify_index_changed()
+
+
+def delete_schema(client: weaviate.Client, tenant: Optional[str] = None) -> bool:
+    """
+    Delete classes of a tenant with all their objects. Classes of other tenants are kept.
+
+    Args:
+        client: weaviate client.
+        tenant: tenant name. If None, the classes of :data:`DEFAULT_SCHEMA` are deleted.
+
+    Returns: whether any class existed.
+    """
+    collection = get_collection(tenant)
+    existed = False
+    for class_name in (collection.document, collection.paragraph):
+        if client.schema.exists(class_name):
+            client.schema.delete_class(class_name)
+            existed = True
+    _notify_index_changed()
+    return existed
+
+
+# Number of documents which paragraph vectors are fetched or encoded together.
+POOLING_CHUNK_SIZE = 64
+
+
+def _paragraph_uuid(url: str, order: int) -> str:
+    return generate_uuid5(f"{url}#{order}")
+
+
+def content_hash(document: dict) -> str:
+    """
+    Hash of document title and paragraphs. Stored with document to skip unchanged documents on re-import.
+    """
+    # Stdlib serialization keeps hashes independent of installed json backend.
+    content = json.dumps(
+        [document["title"], document["paragraphs"]], ensure_ascii=False
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _add_document(
+    batch: Batch,
+    document: dict,
+    store_text: bool = True,
+    vector: Optional[Sequence[float]] = None,
+    flat_links: bool = False,
+    collection: Collection = DEFAULT_COLLECTION,
+):
+    doc_uuid = generate_uuid5(document["url"])
+    doc_object = {
+        "title": document["title"],
+        "url": document["url"],
+        # Chunked documents carry the hash of source document.
+        "contentHash": document.get("contentHash") or content_hash(document),
+    }
+    if store_text:
+        doc_object["text"] = "\n".join(document["paragraphs"])
+    batch.add_data_object(doc_object, collection.document, doc_uuid, vector)
+
+    if flat_links:
+        return
+
+    for order in range(len(document["paragraphs"])):
+        par_uuid = _paragraph_uuid(document["url"], order)
+        batch.add_reference(
+            doc_uuid,
+            collection.document,
+            "hasParagraphs",
+            par_uuid,
+            collection.paragraph,
+        )
+
+
+def _add_paragraphs(
+    batch: Batch,
+    document: dict,
+    vectors: Optional[np.ndarray] = None,
+    flat_links: bool = False,
+    collection: Collection = DEFAULT_COLLECTION,
+):
+    doc_uuid = generate_uuid5(document["url"])
+    chunks = document.get("chunks")
+
+    for order, paragraph in enumerate(document["paragraphs"]):
+        par_uuid = _paragraph_uuid(document["url"], order)
+        paragraph_object = {"text": paragraph, "order": order}
+        if chunks is not None:
+            chunk = chunks[order]
+            paragraph_object.update(
+                paragraphIndex=chunk.paragraph,
+                startOffset=chunk.start,
+                endOffset=chunk.end,
+                window=chunk.window,
+                windows=chunk.windows,
+            )
+        if flat_links:
+            paragraph_object.update(
+                documentId=doc_uuid,
+                documentTitle=document["title"],
+                documentUrl=document["url"],
+            )
+        vector = vectors[order] if vectors is not None else None
+        batch.add_data_object(paragraph_object, collection.paragraph, par_uuid, vector)
+        if not flat_links:
+            batch.add_reference(
+                par_uuid,
+                collection.paragraph,
+                "inDocument",
+                doc_uuid,
+                collection.document,
+            )
+
+
+def _any_of(operands: list[dict]) -> dict:
+    return (
+        operands[0] if len(operands) == 1 else {"operator": "Or", "operands": operands}
+    )
+
+
+def _ids_filter(uuids: list[str]) -> dict:
+    return _any_of(
+        [{"path": ["id"], "operator": "Equal", "valueString": uuid} for uuid in uuids]
+    )
+
+
+def _paragraphs_filter(
+    document_ids: list[str],
+    flat_links: bool,
+    collection: Collection = DEFAULT_COLLECTION,
+) -> dict:
+    # Filter of paragraphs belonging to any of documents.
+    return _any_of(
+        [
+            {
+                "path": ["documentId"]
+                if flat_links
+                else ["inDocument", collection.document, "id"],
+                "operator": "Equal",
+                "valueString": document_id,
+            }
+            for document_id in document_ids
+        ]
+    )
+
+
+def fetch_vectors(
+    client: weaviate.Client, class_name: str, uuids: list[str], chunk_size: int = 256
+) -> dict[str, list[float]]:
+    """
+    Fetch vectors of objects.
+
+    Args:
+        client: weaviate client.
+        class_name: class of objects.
+        uuids: ids of objects.
+        chunk_size: number of objects fetched in one request.
+
+    Returns: mapping from object id to its vector. Missing objects are skipped.
+    """
+    vectors = {}
+    for start in range(0, len(uuids), chunk_size):
+        chunk = uuids[start : start + chunk_size]
+        objects = (
+            client.query.get(class_name)
+            .with_additional(["id", "vector"])
+            .with_where(_ids_filter(chunk))
+            .with_limit(len(chunk))
+            .do()
+        )["data"]["Get"][class_name]
+        for obj in objects:
+            vectors[obj["_additional"]["id"]] = obj["_additional"]["vector"]
+    return vectors
+
+
+def iter_objects(
+    client: weaviate.Client,
+    class_name: str,
+    properties: Optional[list[str]] = None,
+    with_vector: bool = False,
+    page_size: int = 256,
+) -> Iterator[dict]:
+    """
+    Iterate over all objects of a class with cursor paging. Objects are ordered by id.
+
+    Args:
+        client: weaviate client.
+        class_name: class of objects.
+        properties: properties to fetch.
+        with_vector: whether to fetch object vectors into `_additional`.
+        page_size: number of objects fetched in one request.
+
+    Yields: objects with `_additional` id and, optionally, vector.
+    """
+    additional = ["id", "vector"] if with_vector else ["id"]
+    after = None
+    while True:
+        query = (
+            client.query.get(class_name, properties or [])
+            .with_additional(additional)
+            .with_limit(page_size)
+        )
+        if after is not None:
+            query = query.with_after(after)
+        objects = query.do()["data"]["Get"][class_name]
+        yield from objects
+        if len(objects) < page_size:
+            return
+        after = objects[-1]["_additional"]["id"]
+
+
+def fetch_document_hashes(
+    client: weaviate.Client, tenant: Optional[str] = None
+) -> dict[str, str]:
+    """
+    Fetch content hashes of all imported documents of a tenant.
+
+    Returns: mapping from document url to its content hash. Documents imported without hash map to empty string.
+    """
+    document_class = get_collection(tenant).document
+    return {
+        document["url"]: document.get("contentHash") or ""
+        for document in iter_objects(client, document_class, ["url", "contentHash"])
+    }
+
+
+def delete_documents(
+    client: weaviate.Client,
+    urls: list[str],
+    flat_links: bool = False,
+    chunk_size: int = 64,
+    tenant: Optional[str] = None,
+) -> int:
+    """
+    Delete documents and their paragraphs.
+
+    Args:
+        client: weaviate client.
+        urls: urls of documents.
+        flat_links: whether paragraphs are linked to documents with plain properties, see :func:`build_schema`.
+        chunk_size: number of documents deleted in one request.
+        tenant: tenant of documents, see :func:`get_collection`.
+
+    Returns: number of deleted documents.
+    """
+    collection = get_collection(tenant)
+    deleted = 0
+    for start in range(0, len(urls), chunk_size):
+        document_ids = [generate_uuid5(url) for url in urls[start : start + chunk_size]]
+        client.batch.delete_objects(
+            collection.paragraph,
+            _paragraphs_filter(document_ids, flat_links, collection),
+        )
+        result = client.batch.delete_objects(
+            collection.document, _ids_filter(document_ids)
+        )
+        deleted += result["results"]["successful"]
+    return deleted
+
+
+def _delete_stale_paragraphs(
+    client: weaviate.Client,
+    url: str,
+    num_paragraphs: int,
+    flat_links: bool,
+    collection: Collection,
+):
+    # Paragraphs with order beyond the new number of paragraphs are left from the previous import.
+    client.batch.delete_objects(
+        collection.paragraph,
+        {
+            "operator": "And",
+            "operands": [
+                _paragraphs_filter([generate_uuid5(url)], flat_links, collection),
+                {
+                    "path": ["order"],
+                    "operator": "GreaterThanEqual",
+                    "valueInt": num_paragraphs,
+                },
+            ],
+        },
+    )
+
+
+def _mean_vector(vectors: list[list[float]]) -> list[float]:
+    return [sum(component) / len(vectors) for component in zip(*vectors)]
+
+
+def _add_pooled_documents(
+    client: weaviate.Client,
+    batch: Batch,
+    documents: list[dict],
+    store_text: bool,
+    flat_links: bool,
+    collection: Collection,
+):
+    for document in documents:
+        _add_paragraphs(batch, document, flat_links=flat_links, collection=collection)
+
+    # Paragraphs have to be vectorized by weaviate before their vectors are pooled.
+    with timer("import.flush"):
+        batch.flush()
+
+    paragraph_uuids = [
+        [
+            _paragraph_uuid(document["url"], order)
+            for order in range(len(document["paragraphs"]))
+        ]
+        for document in documents
+    ]
+    with timer("import.fetch_vectors"):
+        vectors = fetch_vectors(
+            client,
+            collection.paragraph,
+            [uuid for uuids in paragraph_uuids for uuid in uuids],
+        )
+
+    for document, uuids in zip(documents, paragraph_uuids):
+        paragraph_vectors = [vectors[uuid] for uuid in uuids if uuid in vectors]
+        # Document without paragraphs is vectorized by weaviate.
+        vector = _mean_vector(paragraph_vectors) if paragraph_vectors else None
+        _add_document(batch, document, store_text, vector, flat_links, collection)
+
+
+def _add_encoded_documents(
+    batch: Batch,
+    documents: list[dict],
+    encoder: Encoder,
+    store_text: bool,
+    pool_vectors: bool,
+    flat_links: bool,
+    collection: Collection,
+):
+    # Encode paragraphs of all documents at once to make large batches.
+    paragraphs = [
+        paragraph for document in documents for paragraph in document["paragraphs"]
+    ]
+    with timer("import.encode"):
+        paragraph_vectors = encoder.encode(paragraphs)
+
+        if not pool_vectors:
+            texts = [
+                document["title"] + "\n" + "\n".join(document["paragraphs"])
+                for document in documents
+            ]
+            document_vectors = encoder.encode(texts)
+
+    offset = 0
+    for i, document in enumerate(documents):
+        vectors = paragraph_vectors[offset : offset + len(document["paragraphs"])]
+        offset += len(document["paragraphs"])
+
+        if not pool_vectors:
+            vector = document_vectors[i]
+        elif len(vectors) > 0:
+            vector = vectors.mean(axis=0)
+        else:
+            vector = encoder.encode([document["title"]])[0]
+
+        _add_document(batch, document, store_text, vector, flat_links, collection)
+        _add_paragraphs(batch, document, vectors, flat_links, collection)
+
+
+@dataclass
+class ImportStats:
+    shard: int = 0
+    documents: int = 0
+    objects: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+    # Incremental import only: unchanged documents and documents missing from source.
+    skipped: int = 0
+    deleted: int = 0
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects / self.seconds if self.seconds > 0 else 0.0
+
+
+def _configure_batch(
+    client: weaviate.Client,
+    stats: ImportStats,
+    batch_size: int,
+    dynamic: bool,
+    num_workers: int,
+    timeout_retries: int,
+    connection_error_retries: int,
+    error_retries: int,
+):
+    # The callback runs in batch worker threads when `num_workers` > 1.
+    lock = threading.Lock()
+
+    def count_failures(results: Optional[list[dict]]):
+        check_batch_result(results)
+        failures = sum(
+            1 for result in results or [] if "errors" in result.get("result", {})
+        )
+        with lock:
+            stats.failures += failures
+
+    client.batch(
+        batch_size=batch_size,
+        dynamic=dynamic,
+        num_workers=num_workers,
+        timeout_retries=timeout_retries,
+        connection_error_retries=connection_error_retries,
+        weaviate_error_retries=(
+            WeaviateErrorRetryConf(error_retries) if error_retries > 0 else None
+        ),
+        callback=count_failures,
+    )
 
 
 def import_data(
@@ -120,43 +828,328 @@ def import_data(
     source: Union[str, Iterable[dict]],
     batch_size: int = 8,
     progress: bool = False,
-):
+    dynamic: bool = False,
+    num_workers: int = 1,
+    timeout_retries: int = 3,
+    connection_error_retries: int = 3,
+    error_retries: int = 0,
+    shard: int = 0,
+    num_shards: int = 1,
+    pool_document_vectors: bool = False,
+    store_document_text: bool = True,
+    encoder: Optional[Encoder] = None,
+    flat_links: bool = False,
+    incremental: bool = False,
+    chunker: Optional[Chunker] = None,
+    lexical_index: Optional[str] = None,
+    tenant: Optional[str] = None,
+) -> ImportStats:
     """
     Import data into storage and index.
 
     Args:
         client: weaviate client.
-        source: source of data. Can be a string path to jsonl file OR iterable of dict with specified format.
+        source: source of data. Can be a string path to jsonl file OR iterable of dict with specified format
+            OR directory written by :func:`brainlet.export.export_index`. Exported objects are imported
+            with their vectors, see :func:`brainlet.export.import_export`.
         batch_size: batch size. The most common value with CPU accelerator: batch_size=1.
         progress: whether to show progress during importing.
+        dynamic: whether to adjust batch size dynamically based on the time weaviate takes to process a batch.
+        num_workers: number of threads sending batches to weaviate concurrently.
+        timeout_retries: number of retries of a batch after a request timeout.
+        connection_error_retries: number of retries of a batch after a connection error.
+        error_retries: number of retries of objects that weaviate failed to process. Zero disables retrying.
+        shard: index of jsonl file shard to import. Ignored for iterable source.
+        num_shards: number of jsonl file shards. See :func:`iter_data`.
+        pool_document_vectors: whether to compute document vector as the mean of its paragraph vectors
+            instead of vectorizing document text. It halves the load on the vectorizer.
+        store_document_text: whether to store document text. Without text, document hybrid search uses title only.
+        encoder: in-process encoder. If set, all vectors are computed locally and sent to weaviate with objects.
+        flat_links: whether to link paragraphs to documents with plain properties instead of cross-references.
+            Schema has to be built with the same option, see :func:`build_schema`.
+        incremental: whether to import only new and changed documents, comparing their :func:`content_hash`
+            with stored one. Paragraphs left from previous versions of changed documents are deleted.
+            Documents missing from source are deleted too, unless only one shard of file is imported.
+        chunker: if set, paragraphs are split and merged into chunks before import, see
+            :class:`brainlet.chunking.Chunker`. Schema has to be built with `chunked` option. With `incremental`,
+            only new and changed documents are chunked, so changed chunker options require a full import.
+        lexical_index: if set, :class:`brainlet.lexical.LexicalIndex` of imported documents is saved to this
+            directory. With `incremental`, unchanged documents are indexed too. Can't be built by shards.
+        tenant: tenant to import into, see :func:`get_collection`. Its schema has to be created first.
+
+    Returns: import statistics.
     """
-    data = iter_data(source) if isinstance(source, str) else source
+    # Export module builds on this one, so it is imported on use.
+    from brainlet.export import import_export, is_export
+
+    collection = get_collection(tenant)
+    if isinstance(source, str) and is_export(source):
+        if (
+            encoder is not None
+            or pool_document_vectors
+            or incremental
+            or chunker
+            or lexical_index
+        ):
+            raise ValueError(
+                "Exported index is imported with its vectors: encoder, vector pooling, "
+                "incremental import, chunking and lexical index are not supported"
+            )
+        if num_shards > 1:
+            raise ValueError("Exported index can't be imported by shards")
+        return import_export(
+            client,
+            source,
+            batch_size=batch_size,
+            progress=progress,
+            dynamic=dynamic,
+            num_workers=num_workers,
+            timeout_retries=timeout_retries,
+            connection_error_retries=connection_error_retries,
+            error_retries=error_retries,
+            store_document_text=store_document_text,
+            flat_links=flat_links,
+            tenant=tenant,
+        )
+
+    if lexical_index is not None and isinstance(source, str) and num_shards > 1:
+        raise ValueError("Lexical index can't be built by shards")
+
+    data: Iterable[dict]
+    if isinstance(source, str):
+        data = iter_data(source, shard, num_shards)
+    else:
+        data = source
 
     if progress:
-        # TODO: sorry for list, i'm too lasy to call `wc -l`.
-        data = tqdm(list(data))
+        # Data is streamed, so the total is known in advance only for whole files and sized collections.
+        if num_shards > 1:
+            data = tqdm(data, position=shard, desc=f"shard {shard}")
+        else:
+            total = count_lines(source) if isinstance(source, str) else None
+            data = tqdm(data, total=total)
+
+    stats = ImportStats(shard)
+    _configure_batch(
+        client,
+        stats,
+        batch_size,
+        dynamic,
+        num_workers,
+        timeout_retries,
+        connection_error_retries,
+        error_retries,
+    )
 
-    with client.batch(batch_size=batch_size) as batch:
+    start_time = time.perf_counter()
+    pending_documents: list[dict] = []
+
+    stored_hashes: dict[str, str] = {}
+    if incremental:
+        with timer("import.fetch_hashes"):
+            stored_hashes = fetch_document_hashes(client, tenant)
+    imported_urls: set[str] = set()
+    # Url and number of paragraphs of documents changed since previous import.
+    changed_documents: list[tuple[str, int]] = []
+    lexical_builder = None
+    if lexical_index is not None:
+        # Postings are spilled next to the index rather than to a possibly small system temporary directory.
+        os.makedirs(lexical_index, exist_ok=True)
+        lexical_builder = LexicalIndexBuilder(tmp_dir=lexical_index)
+
+    def add_pending_documents():
+        if encoder is not None:
+            _add_encoded_documents(
+                batch,
+                pending_documents,
+                encoder,
+                store_document_text,
+                pool_document_vectors,
+                flat_links,
+                collection,
+            )
+        else:
+            _add_pooled_documents(
+                client,
+                batch,
+                pending_documents,
+                store_document_text,
+                flat_links,
+                collection,
+            )
+        pending_documents.clear()
+
+    with client.batch as batch:
         for document in data:
-            doc_uuid = generate_uuid5(document["url"])
-            doc_object = {
-                "title": document["title"],
-                "text": "\n".join(document["paragraphs"]),
-                "url": document["url"],
-            }
-            batch.add_data_object(doc_object, "Document", doc_uuid)
-
-            for order, paragraph in enumerate(document["paragraphs"]):
-                par_uuid = generate_uuid5(f'{document["url"]}#{order}')
-                paragraph_object = {"text": paragraph, "order": order}
-                batch.add_data_object(paragraph_object, "Paragraph", par_uuid)
-                batch.add_reference(
-                    doc_uuid, "Document", "hasParagraphs", par_uuid, "Paragraph"
+            if lexical_builder is not None:
+                with timer("import.lexical_index"):
+                    lexical_builder.add(
+                        generate_uuid5(document["url"]),
+                        document["title"],
+                        "\n".join(document["paragraphs"]),
+                    )
+
+            if incremental:
+                imported_urls.add(document["url"])
+                stored_hash = stored_hashes.get(document["url"])
+                if stored_hash == content_hash(document):
+                    stats.skipped += 1
+                    continue
+
+            if chunker is not None:
+                # Stored hash is of source document, so unchanged documents are skipped before chunking.
+                with timer("import.chunk"):
+                    document = dict(
+                        chunker.chunk_document(document),
+                        contentHash=content_hash(document),
+                    )
+
+            if incremental and stored_hash is not None:
+                changed_documents.append((document["url"], len(document["paragraphs"])))
+
+            if encoder is not None or pool_document_vectors:
+                pending_documents.append(document)
+                if len(pending_documents) >= POOLING_CHUNK_SIZE:
+                    add_pending_documents()
+            else:
+                # Adding objects also sends full batches to weaviate.
+                with timer("import.add_document"):
+                    _add_document(
+                        batch,
+                        document,
+                        store_document_text,
+                        flat_links=flat_links,
+                        collection=collection,
+                    )
+                    _add_paragraphs(
+                        batch, document, flat_links=flat_links, collection=collection
+                    )
+
+            stats.documents += 1
+            stats.objects += len(document["paragraphs"]) + 1
+
+        if pending_documents:
+            add_pending_documents()
+
+    if incremental:
+        with timer("import.delete_stale"):
+            for url, num_paragraphs in changed_documents:
+                _delete_stale_paragraphs(
+                    client, url, num_paragraphs, flat_links, collection
                 )
-                batch.add_reference(
-                    par_uuid, "Paragraph", "inDocument", doc_uuid, "Document"
+            # A shard doesn't know documents of other shards.
+            if not isinstance(source, str) or num_shards == 1:
+                missing_urls = [
+                    url for url in stored_hashes if url not in imported_urls
+                ]
+                stats.deleted = delete_documents(
+                    client, missing_urls, flat_links, tenant=tenant
                 )
 
+    if lexical_builder is not None:
+        with timer("import.lexical_index"):
+            lexical_builder.save(lexical_index)  # type: ignore[arg-type]
+
+    stats.seconds = time.perf_counter() - start_time
+    REGISTRY.observe("import.total", stats.seconds)
+    _notify_index_changed()
+    return stats
+
+
+def _client_config(
+    url: str, startup_period: int, timeout_config: tuple
+) -> ClientConfig:
+    connect_timeout, read_timeout = timeout_config
+    return ClientConfig(
+        url,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        startup_period=startup_period,
+    )
+
+
+def _import_shard(
+    url: str,
+    startup_period: int,
+    timeout_config: tuple,
+    encoder_model: Optional[str],
+    shard: int,
+    kwargs: dict,
+) -> tuple[ImportStats, dict]:
+    # Forked processes inherit timings of the parent and previous shards, so only this shard's ones are sent back.
+    REGISTRY.reset()
+    client = create_client(_client_config(url, startup_period, timeout_config))
+    encoder = Encoder(encoder_model) if encoder_model is not None else None
+    stats = import_data(client, shard=shard, encoder=encoder, **kwargs)
+    return stats, REGISTRY.samples()
+
+
+def import_data_parallel(
+    url: str,
+    source: str,
+    num_shards: int,
+    startup_period: int = 60,
+    timeout_config: tuple = (10, 60),
+    encoder_model: Optional[str] = None,
+    node_urls: Optional[Sequence[str]] = None,
+    **kwargs,
+) -> list[ImportStats]:
+    """
+    Import jsonl file in several processes. Each process creates its own weaviate client and imports one shard of file.
+
+    Args:
+        url: weaviate url.
+        source: string path to jsonl file.
+        num_shards: number of shards and processes.
+        startup_period: time to wait for weaviate startup, seconds.
+        timeout_config: weaviate client (connect, read) timeouts, seconds.
+        encoder_model: model of in-process encoder. Each process loads its own encoder.
+        node_urls: urls of weaviate cluster nodes. Processes send batches to nodes in turn, so every node
+            coordinates its part of batches and forwards objects to the nodes of their shards. If None, `url` is used.
+        kwargs: other arguments of :func:`import_data`.
+
+    Returns: import statistics of every shard.
+    """
+    with ProcessPoolExecutor(num_shards) as executor:
+        futures = [
+            executor.submit(
+                _import_shard,
+                node_urls[shard % len(node_urls)] if node_urls else url,
+                startup_period,
+                timeout_config,
+                encoder_model,
+                shard,
+                dict(kwargs, source=source, num_shards=num_shards),
+            )
+            for shard in range(num_shards)
+        ]
+        results = [future.result() for future in futures]
+
+    stats = [shard_stats for shard_stats, _ in results]
+    if kwargs.get("incremental"):
+        # Shards don't delete documents missing from source, because each of them sees only its part of file.
+        client = create_client(_client_config(url, startup_period, timeout_config))
+        source_urls = {document["url"] for document in iter_data(source)}
+        with timer("import.delete_stale"):
+            missing_urls = [
+                url
+                for url in fetch_document_hashes(client, kwargs.get("tenant"))
+                if url not in source_urls
+            ]
+            stats[0].deleted = delete_documents(
+                client,
+                missing_urls,
+                kwargs.get("flat_links", False),
+                tenant=kwargs.get("tenant"),
+            )
+
+    # Collect stage timings of all processes.
+    for _, samples in results:
+        REGISTRY.merge(samples)
+
+    _notify_index_changed()
+    return stats
+
 
 @dataclass
 class Source:
@@ -171,67 +1164,488 @@ class Answer:
     support_text: Optional[str] = None
     answer: Optional[str] = None
     certainty: Optional[float] = None
+    # Vector certainty of the document nearest to the question, "two-stage" retrieval only.
+    score: Optional[float] = None
+
+
+# Paragraph properties required to build an answer. Tenants replace `Document` with their document class.
+ANSWER_PROPERTIES = [
+    "text",
+    "inDocument {... on Document {title, url }}",
+    "_additional {answer {hasAnswer certainty result startPosition endPosition} }",
+]
+FLAT_ANSWER_PROPERTIES = [
+    "text",
+    "documentTitle",
+    "documentUrl",
+    "_additional {answer {hasAnswer certainty result startPosition endPosition} }",
+]
+
+# Paragraph properties required to rebuild support text of chunks.
+CHUNK_ANSWER_PROPERTIES = ["order", "startOffset", "endOffset", "window", "windows"]
+
+# Available retrieval modes of :func:`ask_question`:
+# - "two-stage": find the most relevant document using hybrid search, then ask its paragraphs;
+# - "single-stage": ask paragraphs of the whole knowledge base in one request.
+RETRIEVAL_MODES = ("two-stage", "single-stage")
+
+
+def _parse_answer(paragraphs: list[dict], windows: Optional[list] = None) -> Answer:
+    # The most certain answer among paragraphs is chosen.
+    # If it is found in a window of split paragraph, the answer and its paragraph are added to `windows`.
+    best_answer, best_paragraph = Answer(False), None
+
+    for paragraph in paragraphs:
+        # Fetch answer result. What a mess... Working with graphql has never been so convenient.
+        if "inDocument" in paragraph:
+            source = Source(**paragraph["inDocument"][0])
+        else:
+            source = Source(paragraph["documentTitle"], paragraph["documentUrl"])
+        answer = paragraph["_additional"]["answer"]
+
+        if answer["hasAnswer"] and _more_certain(answer["certainty"], best_answer):
+            best_answer = Answer(
+                True,
+                source,
+                paragraph["text"],
+                answer["result"],
+                answer["certainty"],
+            )
+            best_paragraph = paragraph
+
+    if windows is not None and best_paragraph is not None:
+        if (best_paragraph.get("windows") or 1) > 1:
+            windows.append((best_answer, best_paragraph))
+    return best_answer
+
+
+def _more_certain(certainty: Optional[float], answer: Answer) -> bool:
+    if not answer.has_answer:
+        return True
+    return (certainty or 0.0) > (answer.certainty or 0.0)
+
+
+def _best_answer(answers: list[Answer]) -> Answer:
+    best_answer = Answer(False)
+    for answer in answers:
+        if answer.has_answer and _more_certain(answer.certainty, best_answer):
+            best_answer = answer
+    return best_answer
+
+
+def _escape(question: str) -> str:
+    # Escape quotes, unfortunately, weaviate doesn't escape it.
+    return question.replace('"', '\\"')
+
+
+def _document_query(
+    client: weaviate.Client,
+    question: str,
+    vector: Optional[list[float]],
+    limit: int = 1,
+    candidates: Optional[list[str]] = None,
+    collection: Collection = DEFAULT_COLLECTION,
+) -> GetBuilder:
+    # Retrieve most relevant documents using hybrid search, optionally only among candidates.
+    query = (
+        client.query.get(collection.document, ["_additional {id}"])
+        .with_hybrid(_escape(question), vector=vector)
+        .with_limit(limit)
+    )
+    if candidates:
+        query = query.with_where(_ids_filter(candidates))
+    return query
 
 
-def ask_question(client: weaviate.Client, question: str) -> Answer:
+def _relevance_query(
+    client: weaviate.Client,
+    question: str,
+    vector: Optional[list[float]],
+    candidates: Optional[list[str]] = None,
+    collection: Collection = DEFAULT_COLLECTION,
+) -> GetBuilder:
+    # Certainty of the nearest document by vector. Weaviate 1.18 fuses hybrid results by rank, so hybrid scores
+    # show agreement of vector and keyword rankings and are close to maximum for almost every question.
+    query = client.query.get(collection.document, ["_additional {certainty}"])
+    if vector is not None:
+        query = query.with_near_vector({"vector": vector})
+    else:
+        query = query.with_near_text({"concepts": [_escape(question)]})
+    query = query.with_limit(1)
+    if candidates:
+        query = query.with_where(_ids_filter(candidates))
+    return query
+
+
+def _paragraph_query(
+    client: weaviate.Client,
+    question: str,
+    document_id: Optional[str],
+    limit: int = 1,
+    flat_links: bool = False,
+    chunked: bool = False,
+    collection: Collection = DEFAULT_COLLECTION,
+) -> GetBuilder:
+    # Retrive most relevant paragraphs and try to extract answer.
+    if flat_links:
+        properties = FLAT_ANSWER_PROPERTIES
+    else:
+        properties = [
+            p.replace("... on Document ", f"... on {collection.document} ")
+            for p in ANSWER_PROPERTIES
+        ]
+    if chunked:
+        properties = properties + CHUNK_ANSWER_PROPERTIES
+    query = (
+        client.query.get(collection.paragraph, properties)
+        .with_ask({"question": _escape(question), "properties": ["text"]})
+        .with_limit(limit)
+    )
+    if document_id is not None:
+        query = query.with_where(
+            _paragraphs_filter([document_id], flat_links, collection)
+        )
+    return query
+
+
+def _run_queries(
+    client: weaviate.Client, queries: list[GetBuilder], stage: str
+) -> list[list]:
+    # Send all queries in one graphql request.
+    aliases = [f"q{i}" for i in range(len(queries))]
+    with timer(stage):
+        response = client.query.multi_get(
+            [query.with_alias(alias) for query, alias in zip(queries, aliases)]
+        ).do()
+    return [response["data"]["Get"][alias] for alias in aliases]
+
+
+def ask_questions(
+    client: weaviate.Client,
+    questions: list[str],
+    retrieval: str = "two-stage",
+    encoder: Optional[Encoder] = None,
+    top_k: int = 1,
+    confident_certainty: Optional[float] = None,
+    latency_budget: Optional[float] = None,
+    flat_links: bool = False,
+    chunked: bool = False,
+    lexical_index: Optional[LexicalIndex] = None,
+    skip_below: Optional[float] = None,
+    min_certainty: Optional[float] = None,
+    tenant: Optional[str] = None,
+) -> list[Answer]:
+    """
+    Ask several questions. Every retrieval stage of all questions is done in a single request.
+
+    Args:
+        client: weaviate client.
+        questions: list of string questions.
+        retrieval: retrieval mode, one of :data:`RETRIEVAL_MODES`. "two-stage" mode makes two sequential requests:
+            hybrid document search and paragraph answer extraction. "single-stage" mode skips document search
+            and extracts answer from the most relevant paragraph of the whole knowledge base in one request.
+        encoder: in-process encoder. If set, question vectors for document search are computed locally.
+            It is required if schema is built with `client_vectors`.
+        top_k: number of candidate documents ("two-stage") or paragraphs ("single-stage").
+            The most certain answer among candidates is returned.
+        confident_certainty: if set, the most relevant document is asked first, and the rest of top-k documents
+            are asked in one more request only for questions without an answer of at least this certainty.
+        latency_budget: if set, the rest of top-k documents are not asked once this time has passed, seconds.
+        flat_links: whether paragraphs are linked to documents with plain properties, see :func:`build_schema`.
+        chunked: whether paragraphs are chunks, see :func:`build_schema`. If an answer is found in a window
+            of split paragraph, its support text is the whole paragraph rebuilt from windows.
+        lexical_index: local BM25 index of documents, used in "two-stage" mode. Confident title matches are
+            asked without hybrid search, and hybrid search of other questions is limited to lexical candidates.
+            See :meth:`brainlet.lexical.LexicalIndex.lookup`.
+        skip_below: if set, questions whose nearest document has lower vector certainty are answered
+            with no answer right away, without asking paragraphs. Used in "two-stage" mode, questions
+            of confident lexical matches have no score and are always asked.
+        min_certainty: if set, less certain answers are replaced with no answer.
+            See :func:`brainlet.calibration.calibrate_thresholds` to fit both thresholds.
+        tenant: tenant whose knowledge base is asked, see :func:`get_collection`.
+
+    Returns: answer objects in the order of questions.
+    """
+    collection = get_collection(tenant)
+    with timer("ask.total"):
+        windows: Optional[list] = [] if chunked else None
+        answers = _ask_questions(
+            client,
+            questions,
+            retrieval,
+            encoder,
+            top_k,
+            confident_certainty,
+            latency_budget,
+            flat_links,
+            windows,
+            lexical_index,
+            skip_below,
+            collection,
+        )
+        if min_certainty is not None:
+            answers = [_gate_certainty(answer, min_certainty) for answer in answers]
+        if windows:
+            # Only final answers are rebuilt.
+            final = {id(answer) for answer in answers}
+            _rebuild_support_texts(
+                client, [(a, p) for a, p in windows if id(a) in final], collection
+            )
+        return answers
+
+
+def _gate_certainty(answer: Answer, min_certainty: float) -> Answer:
+    if answer.has_answer and (answer.certainty or 0.0) < min_certainty:
+        return Answer(False, score=answer.score)
+    return answer
+
+
+def _rebuild_support_texts(
+    client: weaviate.Client,
+    windows: list[tuple[Answer, dict]],
+    collection: Collection,
+):
+    # Fetch all windows of split paragraphs in one request and replace support texts of answers.
+    if not windows:
+        return
+    queries = []
+    for answer, paragraph in windows:
+        first = paragraph["order"] - paragraph["window"]
+        uuids = [
+            _paragraph_uuid(answer.source.url, order)  # type: ignore[union-attr]
+            for order in range(first, first + paragraph["windows"])
+        ]
+        queries.append(
+            client.query.get(collection.paragraph, ["text", "startOffset", "endOffset"])
+            .with_where(_ids_filter(uuids))
+            .with_limit(len(uuids))
+        )
+    for (answer, _), found in zip(
+        windows, _run_queries(client, queries, "ask.support_text")
+    ):
+        answer.support_text = rebuild_paragraph(
+            [(p["text"], p["startOffset"], p["endOffset"]) for p in found]
+        )
+
+
+def _ask_questions(
+    client: weaviate.Client,
+    questions: list[str],
+    retrieval: str,
+    encoder: Optional[Encoder],
+    top_k: int,
+    confident_certainty: Optional[float],
+    latency_budget: Optional[float],
+    flat_links: bool,
+    windows: Optional[list],
+    lexical_index: Optional[LexicalIndex],
+    skip_below: Optional[float],
+    collection: Collection,
+) -> list[Answer]:
+    start_time = time.perf_counter()
+    chunked = windows is not None
+
+    if retrieval not in RETRIEVAL_MODES:
+        raise ValueError(
+            f"Unknown retrieval mode {retrieval}. Use one of {RETRIEVAL_MODES}"
+        )
+
+    if not questions:
+        return []
+
+    if retrieval == "single-stage":
+        queries = [
+            _paragraph_query(
+                client, question, None, top_k, flat_links, chunked, collection
+            )
+            for question in questions
+        ]
+        paragraphs = _run_queries(client, queries, "ask.single_stage")
+        return [_parse_answer(p, windows) for p in paragraphs]
+
+    candidates: list[Optional[list[str]]] = [None] * len(questions)
+    document_ids: list[list[str]] = [[] for _ in questions]
+    scores: list[Optional[float]] = [None] * len(questions)
+    if lexical_index is not None:
+        with timer("ask.lexical"):
+            matches = [lexical_index.lookup(q, top_k) for q in questions]
+        for i, match in enumerate(matches):
+            if match.confident:
+                document_ids[i] = match.ids[:top_k]
+            elif lexical_index.candidates > 0:
+                candidates[i] = match.ids
+    # Confident lexical matches skip question vectorization and hybrid search.
+    searched = [i for i in range(len(questions)) if not document_ids[i]]
+
+    if searched:
+        if encoder is not None:
+            with timer("ask.encode"):
+                vectors = [
+                    vector.tolist()
+                    for vector in encoder.encode([questions[i] for i in searched])
+                ]
+        else:
+            vectors = [None] * len(searched)
+
+        # Relevance of every question is fetched in the same request as its documents.
+        queries = [
+            query
+            for i, vector in zip(searched, vectors)
+            for query in (
+                _document_query(
+                    client, questions[i], vector, top_k, candidates[i], collection
+                ),
+                _relevance_query(
+                    client, questions[i], vector, candidates[i], collection
+                ),
+            )
+        ]
+        results = _run_queries(client, queries, "ask.document_search")
+        for i, documents, nearest in zip(searched, results[::2], results[1::2]):
+            document_ids[i] = [document["_additional"]["id"] for document in documents]
+            if nearest:
+                scores[i] = nearest[0]["_additional"]["certainty"]
+
+    if skip_below is not None:
+        # Questions without relevant documents are not asked, the reader is the most costly stage.
+        for i, score in enumerate(scores):
+            if score is not None and score < skip_below:
+                document_ids[i] = []
+
+    # Without early exit all candidate documents are asked at once.
+    first_wave = 1 if confident_certainty is not None else top_k
+    answers = _ask_documents(
+        client,
+        questions,
+        [ids[:first_wave] for ids in document_ids],
+        [Answer(False) for _ in questions],
+        flat_links,
+        windows,
+        collection,
+    )
+
+    if first_wave < top_k:
+        elapsed = time.perf_counter() - start_time
+        if latency_budget is None or elapsed < latency_budget:
+            answers = _ask_documents(
+                client,
+                questions,
+                [
+                    ids[first_wave:]
+                    if not _confident(answer, confident_certainty)
+                    else []
+                    for ids, answer in zip(document_ids, answers)
+                ],
+                answers,
+                flat_links,
+                windows,
+                collection,
+            )
+
+    for answer, score in zip(answers, scores):
+        answer.score = score
+    return answers
+
+
+def _confident(answer: Answer, confident_certainty: Optional[float]) -> bool:
+    if not answer.has_answer or confident_certainty is None:
+        return False
+    return (answer.certainty or 0.0) >= confident_certainty
+
+
+def _ask_documents(
+    client: weaviate.Client,
+    questions: list[str],
+    document_ids: list[list[str]],
+    answers: list[Answer],
+    flat_links: bool,
+    windows: Optional[list] = None,
+    collection: Collection = DEFAULT_COLLECTION,
+) -> list[Answer]:
+    # Ask every question in its documents and rerank answers by certainty, all in one request.
+    pairs = [(i, id_) for i, ids in enumerate(document_ids) for id_ in ids]
+    if not pairs:
+        return answers
+
+    queries = [
+        _paragraph_query(
+            client,
+            questions[i],
+            id_,
+            flat_links=flat_links,
+            chunked=windows is not None,
+            collection=collection,
+        )
+        for i, id_ in pairs
+    ]
+    paragraphs = _run_queries(client, queries, "ask.paragraph_ask")
+
+    candidates: list[list[Answer]] = [[answer] for answer in answers]
+    for (i, _), found_paragraphs in zip(pairs, paragraphs):
+        candidates[i].append(_parse_answer(found_paragraphs, windows))
+    return [_best_answer(answers) for answers in candidates]
+
+
+def ask_question(client: weaviate.Client, question: str, **kwargs) -> Answer:
     """
     Ask question.
 
     Args:
         client: weaviate client.
         question: string question.
+        kwargs: other arguments of :func:`ask_questions`, e.g. retrieval mode and in-process encoder.
 
     Returns: answer object. If answer is found, then :attr:`has_answer` has value `True`.
 
     """
-    # Escape quotes, unfortunately, weaviate doesn't escape it.
-    question = question.replace('"', '\\"')
-
-    # Retrieve most relevant document using hybrid search
-    relevant_documents = (
-        client.query.get("Document", ["_additional {id}"])
-        .with_hybrid(question)
-        .with_limit(1)
-        .do()
-    )["data"]["Get"]["Document"]
-
-    if not relevant_documents:
-        return Answer(False)
-
-    # Retrive most relevant paragraph and try to extract answer.
-    relevant_article_id = relevant_documents[0]["_additional"]["id"]
-    requested_properties = [
-        "text",
-        "inDocument {... on Document {title, url }}",
-        "_additional {answer {hasAnswer certainty result startPosition endPosition} }",
-    ]
+    return ask_questions(client, [question], **kwargs)[0]
 
-    response = (
-        client.query.get("Paragraph", requested_properties)
-        .with_where(
-            {
-                "path": ["inDocument", "Document", "id"],
-                "operator": "Equal",
-                "valueString": relevant_article_id,
-            }
-        )
-        .with_ask({"question": question, "properties": ["text"]})
-        .with_limit(1)
-        .do()
+
+async def ask_question_async(
+    client: weaviate.Client,
+    question: str,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> Answer:
+    """
+    Ask question without blocking the running event loop.
+
+    Weaviate client is synchronous, so the blocking requests of :func:`ask_question` are dispatched to `executor`.
+    Pass a bounded executor to limit the number of in-flight requests to weaviate.
+
+    Args:
+        client: weaviate client.
+        question: string question.
+        executor: executor to run blocking requests in. If None, use the default executor of the event loop.
+        kwargs: other arguments of :func:`ask_question`.
+
+    Returns: answer object. If answer is found, then :attr:`has_answer` has value `True`.
+
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(ask_question, client, question, **kwargs)
     )
 
-    # Fetch answer result. What a mess... Working with graphql has never been so convenient.
-    source_info = response["data"]["Get"]["Paragraph"][0]["inDocument"][0]
-    support_text = response["data"]["Get"]["Paragraph"][0]["text"]
-    answer = response["data"]["Get"]["Paragraph"][0]["_additional"]["answer"]
 
-    if not answer["hasAnswer"]:
-        return Answer(False)
-    else:
-        return Answer(
-            True,
-            Source(source_info["title"], source_info["url"]),
-            support_text,
-            answer["result"],
-            answer["certainty"],
-        )
+async def ask_questions_async(
+    client: weaviate.Client,
+    questions: list[str],
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> list[Answer]:
+    """
+    Ask several questions without blocking the running event loop. See :func:`ask_question_async`.
+
+    Args:
+        client: weaviate client.
+        questions: list of string questions.
+        executor: executor to run blocking requests in. If None, use the default executor of the event loop.
+        kwargs: other arguments of :func:`ask_questions`.
+
+    Returns: answer objects in the order of questions.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(ask_questions, client, questions, **kwargs)
+    )
@@ -0,0 +1,63 @@
+from typing import Optional
+
+import numpy as np
+
+# The same model as in `t2v-transformers` container, so local vectors are compatible with weaviate ones.
+DEFAULT_MODEL = "sentence-transformers/multi-qa-MiniLM-L6-cos-v1"
+
+
+class Encoder:
+    """
+    In-process sentence encoder.
+
+    Requires `sentence-transformers` package: `pip install "brainlet[embedding]"`.
+
+    Args:
+        model_name: sentence-transformers model name or path.
+        batch_size: number of texts encoded in one forward pass.
+        device: torch device. If None, use cuda when it is available.
+        num_threads: number of CPU threads used by torch. If None, use torch default.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        batch_size: int = 64,
+        device: Optional[str] = None,
+        num_threads: Optional[int] = None,
+    ):
+        try:
+            import torch
+            from sentence_transformers import SentenceTransformer
+        except ImportError as error:
+            raise ImportError(
+                'In-process embedding requires sentence-transformers: pip install "brainlet[embedding]"'
+            ) from error
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Encode texts. Texts are sorted by length internally, so batches are padded as little as possible.
+
+        Args:
+            texts: list of texts.
+
+        Returns: float32 array of normalized vectors with shape `(len(texts), dim)`.
+        """
+        if not texts:
+            return np.empty(
+                (0, self.model.get_sentence_embedding_dimension()), np.float32
+            )
+
+        return self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
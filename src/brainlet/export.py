@@ -0,0 +1,284 @@
+import json
+import os
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+import weaviate
+from tqdm import tqdm
+
+from brainlet.core import (
+    DEFAULT_COLLECTION,
+    ImportStats,
+    _configure_batch,
+    _get_class,
+    _notify_index_changed,
+    _rename_classes,
+    create_schema,
+    get_collection,
+    iter_objects,
+)
+from brainlet.jsonl import open_binary, read_jsonl, write_jsonl
+from brainlet.metrics import REGISTRY, timer
+
+# Files of exported index: metadata, and objects and vectors of every class. Line `i` of objects file
+# corresponds to row `i` of vectors file. Files and schema use default class names, so an export of one tenant
+# can be imported into another.
+EXPORT_META_FILE = "meta.json"
+EXPORT_VERSION = 1
+EXPORT_CLASSES = ("Document", "Paragraph")
+CLUSTER_CONFIG_KEYS = ("shardingConfig", "replicationConfig")
+
+
+def _export_files(directory: str, class_name: str) -> tuple[str, str]:
+    return (
+        os.path.join(directory, f"{class_name}.jsonl"),
+        os.path.join(directory, f"{class_name}.f32"),
+    )
+
+
+def is_export(path: str) -> bool:
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, EXPORT_META_FILE))
+
+
+def read_export_meta(directory: str) -> dict:
+    with open(os.path.join(directory, EXPORT_META_FILE)) as file:
+        meta = json.load(file)
+    if meta.get("version") != EXPORT_VERSION:
+        raise ValueError(f"Unsupported export version {meta.get('version')}")
+    return meta
+
+
+def load_export_vectors(directory: str, class_name: str) -> np.ndarray:
+    """
+    Memory-map exported vectors of a class.
+
+    Returns: read-only float32 array with shape `(count, dim)`.
+    """
+    exported_class = read_export_meta(directory)["classes"][class_name]
+    _, vectors_file = _export_files(directory, class_name)
+    if exported_class["count"] == 0:
+        return np.empty((0, exported_class["dim"]), dtype=np.float32)
+    return np.memmap(
+        vectors_file,
+        dtype=np.float32,
+        mode="r",
+        shape=(exported_class["count"], exported_class["dim"]),
+    )
+
+
+def _is_reference(schema_property: dict) -> bool:
+    # Data types of references are class names, primitive types are lowercase.
+    return schema_property["dataType"][0][0].isupper()
+
+
+def _export_class(
+    client: weaviate.Client,
+    object_class: dict,
+    directory: str,
+    page_size: int,
+    progress: bool,
+    export_name: str,
+    document_class: str,
+) -> dict:
+    class_name = object_class["class"]
+    properties = [p["name"] for p in object_class["properties"] if not _is_reference(p)]
+    # Document side of cross-references is restored from paragraphs.
+    with_links = any(p["name"] == "inDocument" for p in object_class["properties"])
+    query_properties = properties + (
+        [f"inDocument {{... on {document_class} {{_additional {{id}}}}}}"]
+        if with_links
+        else []
+    )
+    objects_file, vectors_file = _export_files(directory, export_name)
+    dim = 0
+
+    def records() -> Iterator[dict]:
+        nonlocal dim
+        objects = iter_objects(
+            client, class_name, query_properties, with_vector=True, page_size=page_size
+        )
+        for obj in tqdm(objects, desc=class_name, disable=not progress):
+            vector = np.asarray(obj["_additional"]["vector"], dtype=np.float32)
+            if dim == 0:
+                dim = len(vector)
+            elif len(vector) != dim:
+                raise ValueError(f"{class_name} vectors have different dimensions")
+            vectors.write(vector.tobytes())
+
+            record = {
+                "id": obj["_additional"]["id"],
+                "properties": {
+                    name: obj[name] for name in properties if obj.get(name) is not None
+                },
+            }
+            if with_links and obj.get("inDocument"):
+                record["documentId"] = obj["inDocument"][0]["_additional"]["id"]
+            yield record
+
+    with open_binary(vectors_file, "wb") as vectors:
+        count = write_jsonl(records(), objects_file)
+    return {"count": count, "dim": dim}
+
+
+def export_index(
+    client: weaviate.Client,
+    directory: str,
+    page_size: int = 256,
+    progress: bool = False,
+    tenant: Optional[str] = None,
+) -> dict:
+    """
+    Export schema, objects and vectors of `Document` and `Paragraph` classes. Objects are paged with cursor
+    and streamed to disk, so memory usage doesn't depend on index size.
+
+    Directory gets `meta.json` with schema and object counts, and for every class a jsonl file of objects
+    and a raw float32 file of vectors, see :func:`load_export_vectors`. Import it back with :func:`brainlet.core.import_data`.
+
+    Args:
+        client: weaviate client.
+        directory: output directory. Created if missing, existing export is overwritten.
+        page_size: number of objects fetched in one request.
+        progress: whether to show progress.
+        tenant: tenant to export, see :func:`brainlet.core.get_collection`.
+
+    Returns: export metadata.
+    """
+    os.makedirs(directory, exist_ok=True)
+    collection = get_collection(tenant)
+    class_names = (collection.document, collection.paragraph)
+    schema = client.schema.get()
+    exported_schema = {
+        "classes": [
+            # Sharding and replication depend on the cluster, the importing cluster uses its own.
+            {k: v for k, v in object_class.items() if k not in CLUSTER_CONFIG_KEYS}
+            for object_class in schema["classes"]
+            if object_class["class"] in class_names
+        ]
+    }
+    meta: dict = {
+        "version": EXPORT_VERSION,
+        "schema": _rename_classes(exported_schema, collection, DEFAULT_COLLECTION),
+        "classes": {},
+    }
+    with timer("export.total"):
+        for export_name, class_name in zip(EXPORT_CLASSES, class_names):
+            meta["classes"][export_name] = _export_class(
+                client,
+                _get_class(schema, class_name),
+                directory,
+                page_size,
+                progress,
+                export_name,
+                collection.document,
+            )
+
+    with open(os.path.join(directory, EXPORT_META_FILE), "w") as file:
+        json.dump(meta, file, indent=2)
+    return meta
+
+
+def _iter_exported(
+    directory: str, class_name: str
+) -> Iterator[tuple[dict, np.ndarray]]:
+    objects_file, _ = _export_files(directory, class_name)
+    vectors = load_export_vectors(directory, class_name)
+    for i, record in enumerate(read_jsonl(objects_file)):
+        yield record, vectors[i]
+
+
+def import_export(
+    client: weaviate.Client,
+    directory: str,
+    batch_size: int = 8,
+    progress: bool = False,
+    dynamic: bool = False,
+    num_workers: int = 1,
+    timeout_retries: int = 3,
+    connection_error_retries: int = 3,
+    error_retries: int = 0,
+    store_document_text: bool = True,
+    flat_links: bool = False,
+    tenant: Optional[str] = None,
+) -> ImportStats:
+    """
+    Import index exported with :func:`export_index`. Objects keep their ids and vectors, so nothing is vectorized.
+    If document class of the tenant is missing, schema is created from the exported one.
+
+    Args:
+        client: weaviate client.
+        directory: export directory.
+        flat_links: whether the exported index links paragraphs to documents with plain properties.
+            Has to match the export.
+        tenant: tenant to import into, see :func:`brainlet.core.get_collection`. It may differ from the exported one.
+        other arguments: see :func:`brainlet.core.import_data`.
+
+    Returns: import statistics.
+    """
+    meta = read_export_meta(directory)
+    exported_flat_links = not any(
+        p["name"] == "inDocument"
+        for p in _get_class(meta["schema"], "Paragraph")["properties"]
+    )
+    if exported_flat_links != flat_links:
+        raise ValueError(
+            f"Export in {directory} was made with flat_links={exported_flat_links}"
+        )
+    collection = get_collection(tenant)
+    if not client.schema.exists(collection.document):
+        create_schema(
+            client, _rename_classes(meta["schema"], DEFAULT_COLLECTION, collection)
+        )
+
+    stats = ImportStats()
+    _configure_batch(
+        client,
+        stats,
+        batch_size,
+        dynamic,
+        num_workers,
+        timeout_retries,
+        connection_error_retries,
+        error_retries,
+    )
+    start_time = time.perf_counter()
+
+    with client.batch as batch:
+        for export_name, class_name in zip(
+            EXPORT_CLASSES, (collection.document, collection.paragraph)
+        ):
+            objects = _iter_exported(directory, export_name)
+            total = meta["classes"][export_name]["count"]
+            for record, vector in tqdm(
+                objects, total=total, desc=class_name, disable=not progress
+            ):
+                properties = record["properties"]
+                if class_name == collection.document:
+                    stats.documents += 1
+                    if not store_document_text:
+                        properties.pop("text", None)
+                batch.add_data_object(
+                    properties, class_name, record["id"], vector.tolist()
+                )
+                stats.objects += 1
+
+                if "documentId" in record:
+                    batch.add_reference(
+                        record["id"],
+                        collection.paragraph,
+                        "inDocument",
+                        record["documentId"],
+                        collection.document,
+                    )
+                    batch.add_reference(
+                        record["documentId"],
+                        collection.document,
+                        "hasParagraphs",
+                        record["id"],
+                        collection.paragraph,
+                    )
+
+    stats.seconds = time.perf_counter() - start_time
+    REGISTRY.observe("import.total", stats.seconds)
+    _notify_index_changed()
+    return stats
@@ -0,0 +1,125 @@
+import bz2
+import gzip
+import io
+import json
+from typing import IO, Any, Iterable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Size of read and write buffers, bytes.
+BUFFER_SIZE = 1 << 20
+# Extensions of compressed files. Compressed files are decompressed on the fly.
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".zst", ".zstd")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON with orjson if it is installed, otherwise with stdlib.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize object to compact UTF-8 JSON with orjson if it is installed, otherwise with stdlib.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def is_compressed(filename: str) -> bool:
+    return filename.endswith(COMPRESSED_EXTENSIONS)
+
+
+def open_binary(filename: str, mode: str = "rb") -> IO[bytes]:
+    """
+    Open buffered binary file. Compression is chosen by file extension: `.gz`, `.bz2`, `.zst` or `.zstd`.
+
+    Zstandard requires `zstandard` package: `pip install "brainlet[fast]"`.
+
+    Args:
+        filename: path to file.
+        mode: "rb", "wb" or "ab".
+
+    Returns: file object.
+    """
+    if filename.endswith(".gz"):
+        file: Any = gzip.open(filename, mode)
+    elif filename.endswith(".bz2"):
+        file = bz2.open(filename, mode)
+    elif filename.endswith((".zst", ".zstd")):
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError(
+                'Zstandard files require zstandard: pip install "brainlet[fast]"'
+            ) from error
+        file = zstandard.open(filename, mode)
+    else:
+        return open(filename, mode, buffering=BUFFER_SIZE)
+
+    if "r" in mode:
+        return io.BufferedReader(file, BUFFER_SIZE)
+    return io.BufferedWriter(file, BUFFER_SIZE)
+
+
+def read_jsonl(
+    filename: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Iterate over samples of jsonl file. Empty lines are skipped.
+
+    Args:
+        filename: path to jsonl file, optionally compressed, see :func:`open_binary`.
+        start: first byte of the range to read. A line belongs to the range that contains its first byte.
+        end: end of the range to read, exclusive. If None, file is read till the end.
+
+    Yields: samples.
+    """
+    with open_binary(filename) as file:
+        if start > 0:
+            # Skip the line started before the range.
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        for line in file:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            if not line.isspace():
+                yield loads(line)
+
+
+def write_jsonl(
+    data: Iterable[Any], filename: str, append: bool = False, chunk_size: int = 1024
+) -> int:
+    """
+    Write samples to jsonl file. Samples are serialized and written by chunks.
+
+    Args:
+        data: samples.
+        filename: path to jsonl file, optionally compressed, see :func:`open_binary`.
+        append: whether to append to existing file.
+        chunk_size: number of samples written at once.
+
+    Returns: number of written samples.
+    """
+    count = 0
+    chunk: list[bytes] = []
+    with open_binary(filename, "ab" if append else "wb") as file:
+        for sample in data:
+            chunk.append(dumps(sample))
+            chunk.append(b"\n")
+            if len(chunk) >= 2 * chunk_size:
+                file.write(b"".join(chunk))
+                count += len(chunk) // 2
+                chunk.clear()
+        file.write(b"".join(chunk))
+        count += len(chunk) // 2
+    return count
@@ -0,0 +1,335 @@
+import json
+import os
+import re
+import tempfile
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+RE_TERM = re.compile(r"\w+")
+# Question words and the most frequent English words. They match almost every document and make
+# postings of a query long.
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have how in is it its of on or that the their "
+    "this to was were what when where which who whom whose why with".split()
+)
+LEXICAL_VERSION = 1
+FIELDS = ("title", "text")
+# Size of stored document ids, uuid strings.
+ID_SIZE = 36
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase words of text without stopwords.
+    """
+    return [term for term in RE_TERM.findall(text.lower()) if term not in STOPWORDS]
+
+
+class _FieldBuilder:
+    # Postings of a field as parallel arrays of (document, term, term frequency), and document lengths.
+    # Postings are sorted by term and spilled to disk in runs of `run_size`, so memory doesn't grow with corpus.
+    def __init__(self, directory: str, name: str, run_size: int) -> None:
+        self.directory = directory
+        self.name = name
+        self.run_size = run_size
+        self.runs = 0
+        self.documents = array("i")
+        self.terms = array("i")
+        self.frequencies = array("i")
+        self.lengths = array("i")
+
+    def add(self, document: int, term_ids: list[int]):
+        for term, frequency in Counter(term_ids).items():
+            self.documents.append(document)
+            self.terms.append(term)
+            self.frequencies.append(frequency)
+        self.lengths.append(len(term_ids))
+        if len(self.terms) >= self.run_size:
+            self._spill()
+
+    def _run_file(self, run: int, part: str) -> str:
+        return os.path.join(self.directory, f"{self.name}.{run}.{part}.npy")
+
+    def _spill(self):
+        if not self.terms:
+            return
+        documents = np.frombuffer(self.documents, dtype=np.int32)
+        terms = np.frombuffer(self.terms, dtype=np.int32)
+        frequencies = np.frombuffer(self.frequencies, dtype=np.int32)
+        # Documents are added in order, so postings of every term are ordered by document within and across runs.
+        order = np.argsort(terms, kind="stable")
+        np.save(self._run_file(self.runs, "terms"), terms[order])
+        np.save(self._run_file(self.runs, "documents"), documents[order])
+        np.save(
+            self._run_file(self.runs, "frequencies"),
+            np.minimum(frequencies[order], np.iinfo(np.uint16).max).astype(np.uint16),
+        )
+        self.runs += 1
+        self.documents, self.terms, self.frequencies = (
+            array("i"),
+            array("i"),
+            array("i"),
+        )
+
+    def save(self, directory: str, name: str, num_terms: int):
+        self._spill()
+
+        def load(run: int, part: str) -> np.ndarray:
+            return np.load(self._run_file(run, part), mmap_mode="r")
+
+        counts = [
+            np.bincount(load(run, "terms"), minlength=num_terms)
+            for run in range(self.runs)
+        ]
+        offsets = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(sum(counts, np.zeros(num_terms, dtype=np.int64)), out=offsets[1:])
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+        np.save(
+            os.path.join(directory, f"{name}.lengths.npy"),
+            np.frombuffer(self.lengths, dtype=np.int32),
+        )
+
+        # Runs are merged into memory-mapped output: postings of a term in a run follow ones of previous runs.
+        outputs = {}
+        for part, dtype in (("documents", np.int32), ("frequencies", np.uint16)):
+            filename = os.path.join(directory, f"{name}.{part}.npy")
+            if offsets[-1] == 0:
+                np.save(filename, np.empty(0, dtype=dtype))
+            else:
+                outputs[part] = np.lib.format.open_memmap(
+                    filename, mode="w+", dtype=dtype, shape=(int(offsets[-1]),)
+                )
+        if not outputs:
+            return
+        written = offsets[:-1].copy()
+        for run, run_counts in enumerate(counts):
+            terms = load(run, "terms")
+            run_offsets = np.zeros(num_terms, dtype=np.int64)
+            np.cumsum(run_counts[:-1], out=run_offsets[1:])
+            positions = written[terms] + np.arange(len(terms)) - run_offsets[terms]
+            for part, output in outputs.items():
+                output[positions] = load(run, part)
+            written += run_counts
+        for output in outputs.values():
+            output.flush()
+
+
+class LexicalIndexBuilder:
+    """
+    Build :class:`LexicalIndex` of document titles and texts. Postings are spilled to temporary files
+    in sorted runs and merged when saved, so memory usage depends on the number of distinct terms and documents
+    rather than on the size of texts.
+
+    Args:
+        run_size: number of postings of a field kept in memory before they are spilled.
+        tmp_dir: directory of temporary files. If None, system temporary directory is used.
+    """
+
+    def __init__(self, run_size: int = 1 << 22, tmp_dir: Optional[str] = None) -> None:
+        self._tmp = tempfile.TemporaryDirectory(dir=tmp_dir, prefix="lexical-")
+        self.terms: dict[str, int] = {}
+        self.num_documents = 0
+        # Ids are appended to a file of fixed-size records, see `ids.npy`.
+        self._ids = open(os.path.join(self._tmp.name, "ids.bin"), "wb")
+        self.fields = {
+            name: _FieldBuilder(self._tmp.name, name, run_size) for name in FIELDS
+        }
+        # Terms of every title, used to recognize title lookups.
+        self.title_offsets = array("q", [0])
+        self.title_terms = array("i")
+
+    def _term_ids(self, text: str) -> list[int]:
+        return [self.terms.setdefault(term, len(self.terms)) for term in tokenize(text)]
+
+    def add(self, document_id: str, title: str, text: str):
+        document = self.num_documents
+        self.num_documents += 1
+        self._ids.write(document_id.encode()[:ID_SIZE].ljust(ID_SIZE, b"\0"))
+        title_ids = self._term_ids(title)
+        self.fields["title"].add(document, title_ids)
+        self.fields["text"].add(document, self._term_ids(text))
+        self.title_terms.extend(sorted(set(title_ids)))
+        self.title_offsets.append(len(self.title_terms))
+
+    def save(self, directory: str):
+        """
+        Save index to directory and remove temporary files. The builder can't be used afterwards.
+        """
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "terms.txt"), "w") as file:
+            file.writelines(term + "\n" for term in self.terms)
+        self._ids.close()
+        ids = np.lib.format.open_memmap(
+            os.path.join(directory, "ids.npy"),
+            mode="w+",
+            dtype=f"S{ID_SIZE}",
+            shape=(self.num_documents,),
+        )
+        if self.num_documents:
+            ids[:] = np.memmap(
+                self._ids.name, dtype=f"S{ID_SIZE}", mode="r", shape=ids.shape
+            )
+            ids.flush()
+        del ids
+        for name, field in self.fields.items():
+            field.save(directory, name, len(self.terms))
+        np.save(
+            os.path.join(directory, "title_terms.offsets.npy"),
+            np.frombuffer(self.title_offsets, dtype=np.int64),
+        )
+        np.save(
+            os.path.join(directory, "title_terms.npy"),
+            np.frombuffer(self.title_terms, dtype=np.int32),
+        )
+        with open(os.path.join(directory, "meta.json"), "w") as file:
+            json.dump(
+                {"version": LEXICAL_VERSION, "documents": self.num_documents}, file
+            )
+        self._tmp.cleanup()
+
+
+@dataclass
+class LexicalMatch:
+    # Document ids ordered by score.
+    ids: list[str]
+    # Whether the best document is a title match clearly ahead of others, see :meth:`LexicalIndex.lookup`.
+    confident: bool
+
+
+class LexicalIndex:
+    """
+    Memory-mapped BM25 index of document titles and texts, built by :func:`brainlet.core.import_data`
+    with `lexical_index` option.
+
+    Args:
+        directory: index directory.
+        candidates: number of best documents returned by :meth:`lookup`.
+        margin: the best document is confident if its score is at least `margin` times the second best one.
+        title_weight: weight of title scores relative to text scores.
+        k1: BM25 term frequency saturation.
+        b: BM25 length normalization.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        candidates: int = 100,
+        margin: float = 1.5,
+        title_weight: float = 2.0,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        with open(os.path.join(directory, "meta.json")) as file:
+            meta = json.load(file)
+        if meta["version"] != LEXICAL_VERSION:
+            raise ValueError(f"Unsupported lexical index version {meta['version']}")
+
+        with open(os.path.join(directory, "terms.txt")) as file:
+            self.terms = {line.rstrip("\n"): i for i, line in enumerate(file)}
+
+        def load(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+
+        self.ids = load("ids")
+        self.fields = {
+            name: {
+                part: load(f"{name}.{part}")
+                for part in ("offsets", "documents", "frequencies", "lengths")
+            }
+            for name in FIELDS
+        }
+        self.average_lengths = {
+            name: max(float(np.mean(field["lengths"])), 1.0) if len(self.ids) else 1.0
+            for name, field in self.fields.items()
+        }
+        self.title_offsets = load("title_terms.offsets")
+        self.title_terms = load("title_terms")
+
+        self.candidates = candidates
+        self.margin = margin
+        self.title_weight = title_weight
+        self.k1 = k1
+        self.b = b
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _field_scores(
+        self, name: str, term_ids: list[int], weight: float
+    ) -> tuple[list[np.ndarray], list[np.ndarray]]:
+        field = self.fields[name]
+        lengths = field["lengths"]
+        documents, scores = [], []
+        for term in term_ids:
+            start, end = field["offsets"][term], field["offsets"][term + 1]
+            if start == end:
+                continue
+            term_documents = np.asarray(field["documents"][start:end])
+            frequencies = np.asarray(field["frequencies"][start:end], dtype=np.float32)
+            idf = np.log1p((len(self.ids) - (end - start) + 0.5) / (end - start + 0.5))
+            norm = self.k1 * (
+                1
+                - self.b
+                + self.b * lengths[term_documents] / self.average_lengths[name]
+            )
+            documents.append(term_documents)
+            scores.append(
+                weight * idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+            )
+        return documents, scores
+
+    def search(self, text: str, k: int) -> list[tuple[int, float]]:
+        """
+        Find the best documents by BM25 score of title and text.
+
+        Returns: positions of documents in the index and their scores, best first.
+        """
+        term_ids = sorted({self.terms[t] for t in tokenize(text) if t in self.terms})
+        title_documents, title_scores = self._field_scores(
+            "title", term_ids, self.title_weight
+        )
+        text_documents, text_scores = self._field_scores("text", term_ids, 1.0)
+        if not title_documents and not text_documents:
+            return []
+
+        documents, inverse = np.unique(
+            np.concatenate(title_documents + text_documents), return_inverse=True
+        )
+        scores = np.bincount(
+            inverse, weights=np.concatenate(title_scores + text_scores)
+        )
+        k = min(k, len(documents))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(documents[i]), float(scores[i])) for i in best]
+
+    def _title_match(self, document: int, text: str) -> bool:
+        start, end = self.title_offsets[document], self.title_offsets[document + 1]
+        question_terms = {self.terms.get(t) for t in tokenize(text)}
+        return start < end and all(
+            term in question_terms for term in self.title_terms[start:end]
+        )
+
+    def lookup(self, text: str, top_k: int = 1) -> LexicalMatch:
+        """
+        Find candidate documents of a question. The match is confident if all title terms of the best document
+        occur in the question and its score is `margin` times higher than the second best one, e.g. "who founded
+        Acme Corporation?" and the document titled "Acme Corporation".
+
+        Args:
+            text: question.
+            top_k: minimal number of returned documents, if there are so many matching ones.
+
+        Returns: `candidates` or `top_k` best documents, whichever is more.
+        """
+        limit = max(self.candidates, top_k)
+        found = self.search(text, max(limit, 2))
+        ids = [self.ids[document].decode() for document, _ in found[:limit]]
+        confident = bool(found) and self._title_match(found[0][0], text)
+        if confident and len(found) > 1:
+            confident = found[0][1] >= self.margin * found[1][1]
+        return LexicalMatch(ids, confident)
@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+# Histogram buckets, seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Prometheus-like histogram of durations. Recent observations are also kept to compute percentiles.
+
+    Args:
+        buckets: upper bounds of buckets, seconds. `+Inf` bucket is added implicitly.
+        window: number of recent observations kept for percentiles.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, window: int = 10000):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque = deque(maxlen=window)
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def state(self) -> dict:
+        """
+        Counters and recent observations, see :meth:`merge`.
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "bucket_counts": list(self.bucket_counts),
+            "recent": list(self.recent),
+        }
+
+    def merge(self, state: dict):
+        """
+        Add counters and recent observations of another histogram with the same buckets.
+        """
+        self.count += state["count"]
+        self.sum += state["sum"]
+        self.bucket_counts = [
+            a + b for a, b in zip(self.bucket_counts, state["bucket_counts"])
+        ]
+        self.recent.extend(state["recent"])
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(list(self.recent), q)) if self.recent else 0.0
+
+
+class Registry:
+    """
+    Registry of stage duration histograms.
+
+    Hooks are called with stage name and duration after every observation, e.g. to send timings elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: dict[str, Histogram] = {}
+        self.hooks: list[Callable[[str, float], None]] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[str, float], None]):
+        self.hooks.append(hook)
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            if stage not in self.histograms:
+                self.histograms[stage] = Histogram()
+            self.histograms[stage].observe(seconds)
+        for hook in self.hooks:
+            hook(stage, seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Measure duration of the block and observe it as `stage`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def samples(self) -> dict[str, dict]:
+        """
+        State of every stage histogram. Used to transfer timings between processes.
+        """
+        with self._lock:
+            return {stage: h.state() for stage, h in self.histograms.items()}
+
+    def merge(self, samples: dict[str, dict]):
+        """
+        Add histograms of another registry, e.g. of a worker process. Hooks are not called, because
+        the observations were already reported where they were made.
+        """
+        with self._lock:
+            for stage, state in samples.items():
+                if stage not in self.histograms:
+                    self.histograms[stage] = Histogram()
+                self.histograms[stage].merge(state)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def prometheus(self, name: str = "brainlet_stage_duration_seconds") -> str:
+        """
+        Render histograms in prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {name} Duration of brainlet pipeline stages.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    lines.append(
+                        f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                    )
+                lines.append(
+                    f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self, prefix: Optional[str] = None) -> str:
+        """
+        Render table with count, mean, p50, p99 and total duration of every stage.
+
+        Args:
+            prefix: if set, only stages starting with it are rendered.
+        """
+        rows = [
+            f"{'stage':<24} {'count':>8} {'mean, s':>8} {'p50, s':>8} {'p99, s':>8} {'total, s':>9}"
+        ]
+        with self._lock:
+            for stage, h in sorted(self.histograms.items()):
+                if prefix is not None and not stage.startswith(prefix):
+                    continue
+                rows.append(
+                    f"{stage:<24} {h.count:>8} {h.sum / h.count:>8.3f} {h.percentile(50):>8.3f} "
+                    f"{h.percentile(99):>8.3f} {h.sum:>9.2f}"
+                )
+        return "\n".join(rows)
+
+
+# Global registry used by brainlet pipeline.
+REGISTRY = Registry()
+timer = REGISTRY.timer
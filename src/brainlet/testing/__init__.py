@@ -0,0 +1,3 @@
+"""
+Test doubles for brainlet tests and offline benchmarks. They are not part of brainlet API and are not used by it.
+"""
@@ -0,0 +1,414 @@
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, Optional
+
+# Leaf conditions of graphql `where` filters, e.g. `{path: ["id"] operator: Equal valueString: "..."}`.
+RE_CONDITION = re.compile(
+    r'path:\s*\[([^\]]*)\]\s*operator:\s*(\w+)\s*value\w+:\s*("(?:[^"\\]|\\.)*"|[-\d.]+)'
+)
+RE_LIMIT = re.compile(r"\blimit:\s*(\d+)")
+RE_AFTER = re.compile(r'\bafter:\s*"([^"]*)"')
+RE_BEACON = re.compile(r"weaviate://[^/]+/(?:(\w+)/)?([0-9a-f-]{36})(?:/(\w+))?")
+RE_CLASS_QUERY = re.compile(r"\s*(\w+)\s*(:\s*(\w+))?\s*")
+
+
+def _parse_beacon(beacon: str) -> tuple[str, str, str]:
+    # Class, id and reference property of beacon like `weaviate://localhost/Paragraph/<id>/inDocument`.
+    match = RE_BEACON.match(beacon)
+    if match is None:
+        raise ValueError(f"Invalid beacon {beacon}")
+    return match.groups()  # type: ignore[return-value]
+
+
+def _read_balanced(text: str, start: int) -> int:
+    # Return index after the bracket group starting at `start`, skipping brackets inside string literals.
+    opening, closing = text[start], {"(": ")", "{": "}", "[": "]"}[text[start]]
+    depth, i, in_string = 0, start, False
+    while i < len(text):
+        char = text[i]
+        if in_string:
+            if char == "\\":
+                i += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError(f"Unbalanced graphql query: {text}")
+
+
+def _top_level_fields(fields: str) -> list[str]:
+    # Names of requested fields, nested selections like `_additional {id}` are dropped.
+    names, depth = [], 0
+    for token in re.findall(r"[{}]|[\w.]+", fields):
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            depth -= 1
+        elif depth == 0:
+            names.append(token)
+    return names
+
+
+def parse_get_query(query: str) -> Iterator[tuple[str, str, str, str]]:
+    """
+    Split graphql `Get` query into class queries.
+
+    Yields: alias (class name if not aliased), class name, arguments and fields of every class query.
+    """
+    position = query.index("Get") + len("Get")
+    position = query.index("{", position) + 1
+    while True:
+        match = RE_CLASS_QUERY.match(query, position)
+        if match is None:
+            return
+        alias, class_name = match.group(1), match.group(3) or match.group(1)
+        position = match.end()
+
+        arguments = ""
+        if query[position] == "(":
+            end = _read_balanced(query, position)
+            arguments, position = query[position + 1 : end - 1], end
+        position = query.index("{", position)
+        end = _read_balanced(query, position)
+        fields, position = query[position + 1 : end - 1], end
+        yield alias, class_name, arguments, fields
+
+
+class FakeWeaviate:
+    """
+    In-process HTTP server imitating the part of weaviate API used by brainlet: schema, batch import,
+    batch delete and graphql `Get` queries with `hybrid`, `ask`, `nearText`, `nearVector`, `where`, `limit` and `after`.
+
+    Search is not real: queries return the first matching objects ordered by id with pseudo-random hybrid scores
+    and vector certainties, and every paragraph "answers" with its first words. It is meant to measure brainlet's own overhead and to run tests without containers.
+
+    Args:
+        graphql_latency: delay of every graphql request, seconds. Imitates vectorization and answer extraction.
+        batch_latency: delay of every batch request, seconds.
+        port: port to listen on. Zero means any free port.
+    """
+
+    def __init__(
+        self, graphql_latency: float = 0.0, batch_latency: float = 0.0, port: int = 0
+    ):
+        self.graphql_latency = graphql_latency
+        self.batch_latency = batch_latency
+        self.classes: dict[str, dict] = {}
+        # Objects of every class: id -> {"properties": ..., "vector": ...}.
+        self.objects: dict[str, dict[str, dict]] = {}
+        self.requests = 0
+        # Ids of objects referencing or naming (flat links) every document: (class, document id) -> ids.
+        self._links: dict[tuple[str, str], set[str]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "FakeWeaviate":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeWeaviate":
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def count(self, class_name: str) -> int:
+        return len(self.objects.get(class_name, {}))
+
+    # Schema.
+
+    def _create_class(self, object_class: dict):
+        with self._lock:
+            self.classes[object_class["class"]] = object_class
+            self.objects.setdefault(object_class["class"], {})
+
+    def _delete_class(self, class_name: str):
+        with self._lock:
+            self.classes.pop(class_name, None)
+            self.objects.pop(class_name, None)
+            for key in [key for key in self._links if key[0] == class_name]:
+                del self._links[key]
+
+    # Batch.
+
+    def _add_objects(self, objects: list[dict]) -> list[dict]:
+        with self._lock:
+            for obj in objects:
+                properties = dict(obj.get("properties", {}))
+                self.objects.setdefault(obj["class"], {})[obj["id"]] = {
+                    "properties": properties,
+                    "vector": obj.get("vector"),
+                }
+                if "documentId" in properties:
+                    self._link(obj["class"], properties["documentId"], obj["id"])
+        return [{"id": obj["id"], "result": {}} for obj in objects]
+
+    def _add_references(self, references: list[dict]) -> list[dict]:
+        with self._lock:
+            for reference in references:
+                from_class, from_id, name = _parse_beacon(reference["from"])
+                to_class, to_id, _ = _parse_beacon(reference["to"])
+                obj = self.objects.get(from_class, {}).get(from_id)
+                if obj is not None:
+                    obj["properties"].setdefault(name, []).append(
+                        {"beacon": reference["to"], "class": to_class, "id": to_id}
+                    )
+                    self._link(from_class, to_id, from_id)
+        return [{"result": {"status": "SUCCESS"}} for _ in references]
+
+    def _link(self, class_name: str, document_id: str, object_id: str):
+        self._links.setdefault((class_name, document_id), set()).add(object_id)
+
+    def _candidates(self, class_name: str, where: dict) -> Optional[set[str]]:
+        # Ids of objects that may match `Or` of `Equal` filters on ids or document links, None if all may match.
+        # Avoids scanning all paragraphs for every two-stage query.
+        operands = where["operands"] if where["operator"] == "Or" else [where]
+        candidates: set[str] = set()
+        for condition in operands:
+            if condition["operator"] != "Equal":
+                return None
+            value = next(v for k, v in condition.items() if k.startswith("value"))
+            if condition["path"] == ["id"]:
+                candidates.add(value)
+            elif len(condition["path"]) == 3 or condition["path"] == ["documentId"]:
+                candidates |= self._links.get((class_name, value), set())
+            else:
+                return None
+        return candidates
+
+    def _matches(self, object_id: str, obj: dict, where: dict) -> bool:
+        # Supports filters used by brainlet: `And`, `Or` and comparisons of ids, properties and reference ids.
+        operator = where["operator"]
+        if operator in ("And", "Or"):
+            results = (self._matches(object_id, obj, w) for w in where["operands"])
+            return all(results) if operator == "And" else any(results)
+
+        value = next(v for k, v in where.items() if k.startswith("value"))
+        path = where["path"]
+        if path == ["id"]:
+            actual = [object_id]
+        elif len(path) == 3:
+            actual = [ref["id"] for ref in obj["properties"].get(path[0], [])]
+        else:
+            actual = [obj["properties"].get(path[0])]
+
+        if operator == "Equal":
+            return value in actual
+        if operator == "GreaterThanEqual":
+            return any(a is not None and a >= value for a in actual)
+        raise ValueError(f"Unsupported operator {operator}")
+
+    def _delete_objects(self, match: dict) -> dict:
+        with self._lock:
+            objects = self.objects.get(match["class"], {})
+            ids = [
+                i for i, obj in objects.items() if self._matches(i, obj, match["where"])
+            ]
+            for object_id in ids:
+                del objects[object_id]
+        return {
+            "match": match,
+            "results": {"matches": len(ids), "successful": len(ids), "failed": 0},
+        }
+
+    # Graphql.
+
+    def _graphql_where(self, arguments: str) -> Optional[dict]:
+        # Graphql filters of brainlet are comparisons joined with `Or`.
+        conditions = [
+            {
+                "path": json.loads(f"[{path}]"),
+                "operator": operator,
+                "value": json.loads(value),
+            }
+            for path, operator, value in RE_CONDITION.findall(arguments)
+        ]
+        if not conditions:
+            return None
+        return {"operator": "Or", "operands": conditions}
+
+    def _answer(self, text: str) -> dict:
+        words = text.split()
+        return {
+            "hasAnswer": bool(words),
+            "certainty": (zlib.crc32(text.encode()) % 1000) / 1000 if words else None,
+            "result": " ".join(words[:3]) if words else None,
+            "startPosition": 0,
+            "endPosition": len(" ".join(words[:3])),
+        }
+
+    def _reference(self, reference: dict, fields: list[str]) -> dict:
+        properties = (
+            self.objects.get(reference["class"], {})
+            .get(reference["id"], {})
+            .get("properties", {})
+        )
+        result = {k: v for k, v in properties.items() if k in fields}
+        if "_additional" in fields:
+            result["_additional"] = {"id": reference["id"]}
+        return result
+
+    def _get(self, class_name: str, arguments: str, fields: str) -> list[dict]:
+        limit_match = RE_LIMIT.search(arguments)
+        after_match = RE_AFTER.search(arguments)
+        where = self._graphql_where(arguments)
+
+        with self._lock:
+            stored = self.objects.get(class_name, {})
+            candidates = self._candidates(class_name, where) if where else None
+            if candidates is None:
+                objects = sorted(stored.items())
+            else:
+                objects = sorted((i, stored[i]) for i in candidates if i in stored)
+            if after_match is not None:
+                objects = [(i, obj) for i, obj in objects if i > after_match.group(1)]
+            if where is not None:
+                objects = [
+                    (i, obj) for i, obj in objects if self._matches(i, obj, where)
+                ]
+            if limit_match is not None:
+                objects = objects[: int(limit_match.group(1))]
+
+            names = _top_level_fields(fields)
+            results = []
+            for object_id, obj in objects:
+                properties = obj["properties"]
+                result = {
+                    name: properties.get(name)
+                    for name in names
+                    if name != "_additional"
+                    and not isinstance(properties.get(name), list)
+                }
+                additional: dict = {"id": object_id}
+                if "vector" in fields:
+                    additional["vector"] = obj["vector"] or [0.0]
+                if "hybrid:" in arguments and "score" in fields:
+                    # Deterministic pseudo-random score, a string like in weaviate.
+                    additional["score"] = str(
+                        (zlib.crc32(object_id.encode()) % 1000) / 1000
+                    )
+                if "near" in arguments and "certainty" in fields:
+                    additional["certainty"] = (
+                        zlib.crc32(object_id.encode()) % 1000
+                    ) / 1000
+                if "ask:" in arguments:
+                    additional["answer"] = self._answer(
+                        obj["properties"].get("text", "")
+                    )
+                result["_additional"] = additional
+
+                for name, value in properties.items():
+                    match = re.search(
+                        name + r"\s*\{\.\.\. on \w+\s*\{([^}]*)\}", fields
+                    )
+                    if isinstance(value, list) and match is not None:
+                        referenced = _top_level_fields(match.group(1))
+                        result[name] = [
+                            self._reference(ref, referenced) for ref in value
+                        ]
+                results.append(result)
+        return results
+
+    def _graphql(self, query: str) -> dict:
+        return {
+            "data": {
+                "Get": {
+                    alias: self._get(class_name, arguments, fields)
+                    for alias, class_name, arguments, fields in parse_get_query(query)
+                }
+            }
+        }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length)) if length else None
+
+            def _respond(self, status: int, data=None):
+                body = json.dumps(data).encode() if data is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                fake.requests += 1
+                if self.path == "/v1/.well-known/ready":
+                    self._respond(200)
+                elif self.path == "/v1/meta":
+                    self._respond(200, {"version": "1.18.2", "modules": {}})
+                elif self.path == "/v1/schema":
+                    self._respond(200, {"classes": list(fake.classes.values())})
+                elif self.path.startswith("/v1/schema/"):
+                    object_class = fake.classes.get(self.path.split("/")[3])
+                    self._respond(200 if object_class else 404, object_class)
+                else:
+                    self._respond(404)
+
+            def do_POST(self):
+                fake.requests += 1
+                body = self._body()
+                if self.path == "/v1/graphql":
+                    time.sleep(fake.graphql_latency)
+                    self._respond(200, fake._graphql(body["query"]))
+                elif self.path.startswith("/v1/batch/objects"):
+                    time.sleep(fake.batch_latency)
+                    self._respond(200, fake._add_objects(body["objects"]))
+                elif self.path.startswith("/v1/batch/references"):
+                    time.sleep(fake.batch_latency)
+                    self._respond(200, fake._add_references(body))
+                elif self.path == "/v1/schema":
+                    fake._create_class(body)
+                    self._respond(200, body)
+                elif self.path.startswith("/v1/schema/"):
+                    object_class = fake.classes[self.path.split("/")[3]]
+                    object_class.setdefault("properties", []).append(body)
+                    self._respond(200, body)
+                else:
+                    self._respond(404)
+
+            def do_DELETE(self):
+                fake.requests += 1
+                body = self._body()
+                if self.path.startswith("/v1/batch/objects"):
+                    time.sleep(fake.batch_latency)
+                    self._respond(200, fake._delete_objects(body["match"]))
+                elif self.path.startswith("/v1/schema/"):
+                    fake._delete_class(self.path.split("/")[3])
+                    self._respond(200)
+                else:
+                    self._respond(404)
+
+        return Handler
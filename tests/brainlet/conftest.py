@@ -0,0 +1,29 @@
+import pytest
+from weaviate import Client
+
+from brainlet.testing.fake_weaviate import FakeWeaviate
+
+
+@pytest.fixture(scope="module")
+def fake():
+    with FakeWeaviate() as fake:
+        yield fake
+
+
+@pytest.fixture(scope="function")
+def fake_client(fake) -> Client:
+    client = Client(fake.url, startup_period=10)
+    client.schema.delete_all()
+    return client
+
+
+@pytest.fixture(scope="session")
+def articles():
+    return [
+        {
+            "url": f"https://en.wikipedia.org/wiki?curid={i}",
+            "title": f"Article {i}",
+            "paragraphs": [f"Paragraph {j} of article {i}." for j in range(3)],
+        }
+        for i in range(5)
+    ]
@@ -54,8 +54,52 @@ def weaviate_client_with_data(weaviate_client: Client):
     weaviate_client.schema.delete_all()
 
 
+def test_health():
+    response = test_client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_ask_invalid_tenant():
+    response = test_client.get("/", params={"question": "why?", "tenant": "a/b"})
+    assert response.status_code == 422
+    response = test_client.post("/batch", json={"questions": ["why?"], "tenant": "-"})
+    assert response.status_code == 422
+
+
 def test_ask(weaviate_client_with_data: Client):
     response = test_client.get("/", params={"question": "what is anarchism?"})
     assert response.status_code == 200
     assert response.json()["has_answer"]
     assert response.json()["answer"] == "a political philosophy and movement"
+
+
+def test_ask_without_cache(weaviate_client_with_data: Client):
+    question = "who wrote anarchism?"
+    before = test_client.get("/cache").json()
+    response = test_client.get("/", params={"question": question, "cache": "false"})
+    assert response.status_code == 200
+    assert test_client.get("/cache").json() == before
+
+
+def test_ask_batch(weaviate_client_with_data: Client):
+    questions = ["what is anarchism?", "What is anarchism", "what is albedo?"]
+    response = test_client.post("/batch", json={"questions": questions})
+    assert response.status_code == 200
+
+    answers = response.json()
+    assert len(answers) == 3
+    assert answers[0] == answers[1]
+    assert answers[0]["answer"] == "a political philosophy and movement"
+    assert answers[2]["source"]["title"] == "Albedo"
+
+
+def test_metrics(weaviate_client_with_data: Client):
+    test_client.get("/", params={"question": "what is albedo?"})
+    response = test_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert (
+        'brainlet_stage_duration_seconds_count{stage="api.request GET /"}'
+        in response.text
+    )
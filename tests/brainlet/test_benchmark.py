@@ -0,0 +1,48 @@
+import numpy as np
+
+from brainlet.benchmark import (
+    benchmark_cluster,
+    brute_force_neighbours,
+    estimate_index_memory,
+)
+from brainlet.testing.fake_weaviate import FakeWeaviate
+from brainlet.jsonl import write_jsonl
+
+
+def test_brute_force_neighbours():
+    vectors = np.eye(4, dtype=np.float32)
+    query = np.array([0.8, 0.6, 0.0, 0.0], dtype=np.float32)
+
+    assert brute_force_neighbours(vectors, query, 2) == {0, 1}
+    assert brute_force_neighbours(vectors, query, 10) == {0, 1, 2, 3}
+
+
+def test_estimate_index_memory():
+    assert estimate_index_memory(1000, 384, 16) == 1000 * (384 * 4 + 32 * 8)
+
+
+def test_benchmark_cluster(tmp_path):
+    source = str(tmp_path / "sample.jsonl")
+    write_jsonl(
+        [
+            {
+                "url": f"https://example.com/{i}",
+                "title": f"Title {i}",
+                "paragraphs": ["a", "b"],
+            }
+            for i in range(10)
+        ],
+        source,
+    )
+    with FakeWeaviate() as fake:
+        results = benchmark_cluster(
+            [fake.url], source, shards=[1, 2], num_questions=5, concurrency=2
+        )
+        assert fake.classes["Paragraph"]["shardingConfig"] == {"desiredCount": 2}
+        assert fake.classes["Paragraph"]["replicationConfig"] == {"factor": 1}
+
+    assert [(r.shards, r.replicas, r.objects) for r in results] == [
+        (1, 1, 30),
+        (2, 1, 30),
+    ]
+    assert all(r.ask_rps > 0 for r in results)
@@ -0,0 +1,110 @@
+import pytest
+
+from brainlet.cache import (
+    AnswerCache,
+    CacheBackend,
+    SQLiteCacheBackend,
+    normalize_question,
+)
+from brainlet.core import Answer, Source
+
+answer = Answer(True, Source("Anarchism", "url"), "text", "a political philosophy", 0.5)
+
+
+@pytest.fixture
+def backend(tmp_path) -> SQLiteCacheBackend:
+    return SQLiteCacheBackend(str(tmp_path / "cache.sqlite"))
+
+
+def test_normalize_question():
+    assert normalize_question("  What is   Anarchism?? ") == "what is anarchism"
+
+
+def test_cache_hit_miss():
+    cache = AnswerCache()
+
+    assert cache.get("what is anarchism?") is None
+    cache.set("what is anarchism?", answer)
+
+    assert cache.get("What is anarchism") == answer
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_cache_tenants():
+    cache = AnswerCache()
+    cache.set("what is anarchism?", answer, tenant="acme")
+
+    assert cache.get("what is anarchism?") is None
+    assert cache.get("what is anarchism?", "other") is None
+    assert cache.get("What is anarchism", "acme") == answer
+
+
+def test_cache_lru():
+    cache = AnswerCache(maxsize=2)
+    cache.set("first", answer)
+    cache.set("second", answer)
+    cache.get("first")
+    cache.set("third", answer)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == answer
+    assert cache.get("third") == answer
+
+
+def test_cache_ttl(monkeypatch):
+    cache = AnswerCache(ttl=10)
+    monkeypatch.setattr("brainlet.cache.time.time", lambda: 100.0)
+    cache.set("question", answer)
+
+    monkeypatch.setattr("brainlet.cache.time.time", lambda: 105.0)
+    assert cache.get("question") == answer
+
+    monkeypatch.setattr("brainlet.cache.time.time", lambda: 111.0)
+    assert cache.get("question") is None
+
+
+def test_cache_shared_backend(backend: SQLiteCacheBackend):
+    first, second = AnswerCache(backend=backend), AnswerCache(backend=backend)
+    first.set("question", Answer(False))
+
+    assert second.get("question") == Answer(False)
+
+    first.invalidate()
+    assert second.get("question") is None
+
+
+def test_cache_backend_without_local_storage(backend: SQLiteCacheBackend):
+    cache = AnswerCache(maxsize=0, backend=backend)
+    cache.set("question", answer)
+
+    assert cache.get("question") == answer
+    assert cache.stats() == {"hits": 1, "misses": 0, "size": 0}
+
+
+def test_cache_backend_cleared_by_other_process(backend: SQLiteCacheBackend, tmp_path):
+    cache = AnswerCache(backend=backend)
+    cache.set("question", answer)
+
+    SQLiteCacheBackend(str(tmp_path / "cache.sqlite")).clear()
+
+    assert cache.get("question") is None
+
+
+def test_sqlite_backend_evicts_expired_and_oldest(tmp_path, monkeypatch):
+    backend = SQLiteCacheBackend(
+        str(tmp_path / "cache.sqlite"), maxsize=2, ttl=10, cleanup_interval=1
+    )
+    backend.set("expired", {"created": 80.0})
+    monkeypatch.setattr("brainlet.cache.time.time", lambda: 100.0)
+    for i in range(3):
+        backend.set(f"key{i}", {"created": 95.0 + i})
+
+    assert backend.get("expired") is None
+    assert backend.get("key0") is None
+    assert backend.get("key1") == {"created": 96.0}
+    assert backend.get("key2") == {"created": 97.0}
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()  # type: ignore[abstract]
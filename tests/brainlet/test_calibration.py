@@ -0,0 +1,41 @@
+import pytest
+
+from brainlet.calibration import calibrate_thresholds, threshold_curve
+
+# Unanswerable q2 and q3 have wrong answers, q2 is uncertain. q5 is a confident lexical match without score.
+SCORES = {
+    "q1": {"score": 0.8, "certainty": 0.9},
+    "q2": {"score": 0.9, "certainty": 0.2},
+    "q3": {"score": 0.2, "certainty": 0.5},
+    "q4": {"score": 0.1, "certainty": None},
+    "q5": {"score": None, "certainty": 0.7},
+}
+EVALUATION = {
+    "q1": {"exact": 1, "f1": 1.0, "has_answer": True},
+    "q2": {"exact": 0, "f1": 0.0, "has_answer": False},
+    "q3": {"exact": 0, "f1": 0.0, "has_answer": False},
+    "q4": {"exact": 1, "f1": 1.0, "has_answer": False},
+    "q5": {"exact": 1, "f1": 1.0, "has_answer": True},
+}
+
+
+def test_threshold_curve():
+    curve = threshold_curve(SCORES, EVALUATION)
+    assert [t.skip_below for t in curve] == [None, 0.2, 0.8, 0.9]
+    assert [t.skipped for t in curve] == [0.0, 0.2, 0.4, 0.6]
+    # Wrong answers are gated by certainty until the correct answer of q1 is skipped.
+    assert [t.f1 for t in curve] == pytest.approx([100.0, 100.0, 100.0, 80.0])
+    assert all(0.5 < t.min_certainty <= 0.7 for t in curve[:2])
+    # Once q3 is skipped, only q2 has to be gated.
+    assert all(0.2 < t.min_certainty <= 0.5 for t in curve[2:])
+
+
+@pytest.mark.parametrize("max_f1_loss, expected", [(0.0, 0.9), (-30.0, 0.8)])
+def test_calibrate_thresholds(max_f1_loss, expected):
+    # F1 without thresholds is 60.
+    assert calibrate_thresholds(SCORES, EVALUATION, max_f1_loss).skip_below == expected
+
+
+def test_threshold_curve_missing_scores():
+    with pytest.raises(ValueError):
+        threshold_curve({"q1": SCORES["q1"]}, EVALUATION)
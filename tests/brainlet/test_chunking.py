@@ -0,0 +1,114 @@
+import pytest
+
+from brainlet.chunking import Chunker, rebuild_paragraph
+from brainlet.core import ask_question, build_schema, create_schema, import_data
+
+
+def words(count: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+@pytest.mark.parametrize("num_tokens", [1, 10, 11, 25, 99])
+@pytest.mark.parametrize("overlap", [0, 3])
+def test_split_windows(num_tokens, overlap):
+    paragraph = words(num_tokens)
+    windows = Chunker(max_tokens=10, min_tokens=0, overlap=overlap).split(paragraph)
+
+    sizes = [len(paragraph[start:end].split()) for start, end in windows]
+    assert max(sizes) <= 10
+    assert max(sizes) == min(sizes)
+    assert windows[0][0] == 0 and windows[-1][1] == len(paragraph)
+    assert rebuild_paragraph([(paragraph[s:e], s, e) for s, e in windows]) == paragraph
+    if len(windows) > 1:
+        shared = set(paragraph[slice(*windows[0])].split()) & set(
+            paragraph[slice(*windows[1])].split()
+        )
+        assert len(shared) >= overlap
+
+
+def test_chunk_merges_short_neighbours():
+    paragraphs = [words(2, "a"), words(2, "b"), words(25, "c"), words(5, "d")]
+    chunks = Chunker(max_tokens=10, min_tokens=4).chunk(paragraphs)
+
+    assert [(c.paragraph, c.paragraphs, c.window, c.windows) for c in chunks] == [
+        (0, 2, 0, 1),
+        (2, 1, 0, 3),
+        (2, 1, 1, 3),
+        (2, 1, 2, 3),
+        (3, 1, 0, 1),
+    ]
+    assert chunks[0].text == paragraphs[0] + "\n" + paragraphs[1]
+    for chunk in chunks[1:4]:
+        assert paragraphs[2][chunk.start : chunk.end] == chunk.text
+
+
+def test_chunk_merges_short_tail():
+    paragraphs = [words(6, "a"), words(1, "b")]
+    chunks = Chunker(max_tokens=10, min_tokens=4).chunk(paragraphs)
+
+    assert len(chunks) == 1
+    assert chunks[0].paragraphs == 2
+    assert chunks[0].end == len(paragraphs[1])
+
+
+def test_chunk_merges_short_neighbours_of_split_paragraph():
+    paragraphs = ["short one", words(37), "x"]
+    chunks = Chunker(max_tokens=10, min_tokens=3, overlap=2).chunk(paragraphs)
+
+    assert [(c.paragraph, c.paragraphs, c.window, c.windows) for c in chunks] == [
+        (0, 2, 0, 1)
+    ] + [(1, 1, window, 5) for window in range(5)]
+    assert chunks[0].text == "short one\nx"
+    assert chunks[0].end == 1
+
+    # Short tail after split paragraph is merged into the chunk before it.
+    chunks = Chunker(max_tokens=10, min_tokens=3).chunk([words(4), words(25), "x"])
+    assert [(c.paragraph, c.paragraphs) for c in chunks[:1]] == [(0, 2)]
+    assert len(chunks) == 4
+
+
+def test_chunker_invalid_overlap():
+    with pytest.raises(ValueError):
+        Chunker(max_tokens=10, overlap=10)
+
+
+def test_import_incremental_chunked(fake, fake_client, articles, monkeypatch):
+    chunker = Chunker(max_tokens=4, min_tokens=1, overlap=0)
+    create_schema(fake_client, build_schema(chunked=True))
+    import_data(fake_client, articles, incremental=True, chunker=chunker)
+    num_paragraphs = fake.count("Paragraph")
+
+    chunked = []
+    chunk_document = chunker.chunk_document
+    monkeypatch.setattr(
+        chunker,
+        "chunk_document",
+        lambda document: chunked.append(document["url"]) or chunk_document(document),
+    )
+    changed = dict(articles[0], paragraphs=articles[0]["paragraphs"][:1])
+    stats = import_data(
+        fake_client, [changed] + articles[1:], incremental=True, chunker=chunker
+    )
+
+    assert stats.skipped == 4
+    assert chunked == [changed["url"]]
+    assert fake.count("Paragraph") < num_paragraphs
+
+
+@pytest.mark.parametrize("retrieval", ["two-stage", "single-stage"])
+def test_ask_chunked_support_text(fake, fake_client, retrieval):
+    paragraph = " ".join(f"Word{i}." for i in range(100))
+    document = {
+        "url": "https://example.com",
+        "title": "Long",
+        "paragraphs": [paragraph],
+    }
+    create_schema(fake_client, build_schema(chunked=True))
+    stats = import_data(
+        fake_client, [document], chunker=Chunker(max_tokens=50, min_tokens=5, overlap=4)
+    )
+    assert stats.objects == 1 + 5
+
+    answer = ask_question(fake_client, "Which word?", retrieval=retrieval, chunked=True)
+    assert answer.has_answer
+    assert answer.support_text == paragraph
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from weaviate import Client
+
+from brainlet import cli
+from brainlet.core import create_schema, import_data
+from brainlet.jsonl import write_jsonl
+
+
+@pytest.fixture(scope="module")
+def client(fake, articles) -> Client:
+    client = Client(fake.url, startup_period=10)
+    client.schema.delete_all()
+    create_schema(client)
+    import_data(client, articles)
+    return client
+
+
+@pytest.fixture(scope="function")
+def questions_file(tmp_path) -> str:
+    filename = str(tmp_path / "questions.jsonl")
+    write_jsonl(
+        [{"id": f"q{i}", "question": f"Which article {i}?"} for i in range(10)],
+        filename,
+    )
+    return filename
+
+
+def test_inference_order_and_resume(client, questions_file, tmp_path):
+    output_file = tmp_path / "answers.json"
+    output_file.write_text(json.dumps({"q0": "saved", "q5": "saved"}))
+    scores_file = tmp_path / "scores.json"
+
+    cli.inference(
+        client,
+        questions_file,
+        str(output_file),
+        "two-stage",
+        concurrency=3,
+        batch_size=2,
+        scores_file=str(scores_file),
+    )
+
+    answers = json.loads(output_file.read_text())
+    assert list(answers) == ["q0", "q5"] + [f"q{i}" for i in range(10) if i % 5]
+    assert answers["q0"] == answers["q5"] == "saved"
+    assert all(answers[f"q{i}"].startswith("Paragraph") for i in range(10) if i % 5)
+    assert set(json.loads(scores_file.read_text())) == set(answers) - {"q0", "q5"}
+
+
+def test_inference_keeps_answers_on_failure(
+    client, questions_file, tmp_path, monkeypatch
+):
+    ask_questions = cli.ask_questions
+    calls = []
+
+    def fail_third_batch(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 3:
+            raise ConnectionError("weaviate is down")
+        return ask_questions(*args, **kwargs)
+
+    monkeypatch.setattr(cli, "ask_questions", fail_third_batch)
+    output_file = tmp_path / "answers.json"
+    with pytest.raises(ConnectionError):
+        cli.inference(
+            client, questions_file, str(output_file), "two-stage", batch_size=3
+        )
+
+    assert list(json.loads(output_file.read_text())) == [f"q{i}" for i in range(6)]
@@ -0,0 +1,39 @@
+import pytest
+from weaviate.exceptions import WeaviateStartUpError
+
+from brainlet.client import ClientConfig, ManagedClient, wait_for_weaviate
+from brainlet.testing.fake_weaviate import FakeWeaviate
+
+UNAVAILABLE_URL = "http://127.0.0.1:1"
+
+
+def test_wait_for_weaviate_timeout():
+    with pytest.raises(WeaviateStartUpError):
+        wait_for_weaviate(UNAVAILABLE_URL, startup_period=0.5, max_retry_delay=0.1)
+
+
+def test_managed_client_retries_after_error():
+    managed = ManagedClient(ClientConfig(UNAVAILABLE_URL, startup_period=0.1))
+    assert not managed.connected
+
+    with pytest.raises(WeaviateStartUpError):
+        managed.get()
+    assert not managed.connected
+    assert managed.error is not None
+
+    with FakeWeaviate() as fake:
+        managed.config.url = fake.url
+        assert managed.get().is_ready()
+        assert managed.connected
+        assert managed.error is None
+        managed.close()
+    assert not managed.connected
+
+
+def test_managed_client_pool_size():
+    with FakeWeaviate() as fake:
+        managed = ManagedClient(ClientConfig(fake.url, pool_size=3))
+        managed.connect_in_background(jitter=0.01).join()
+        session = managed.get()._connection._session
+        assert session.get_adapter(fake.url)._pool_maxsize == 3
+        managed.close()
@@ -1,9 +1,30 @@
+import asyncio
 import os
 
 import pytest
 from weaviate import Client
 
-from brainlet.core import create_schema, import_data, ask_question
+from brainlet.core import (
+    Answer,
+    create_schema,
+    delete_schema,
+    import_data,
+    import_data_parallel,
+    ask_question,
+    ask_question_async,
+    ask_questions,
+    count_lines,
+    iter_data,
+    build_schema,
+    DEFAULT_SCHEMA,
+    INDEX_PROFILES,
+    content_hash,
+    get_collection,
+)
+from brainlet.export import export_index
+from brainlet.jsonl import write_jsonl
+from brainlet.metrics import REGISTRY
+from brainlet.testing.fake_weaviate import FakeWeaviate
 
 WEAVIATE_CLIENT_URL = os.getenv("WEAVIATE_CLIENT_URL", "http://127.0.0.1:8080")
 
@@ -41,6 +62,93 @@ def test_data():
     ]
 
 
+@pytest.mark.parametrize(
+    "content, expected", [("", 0), ("a\n", 1), ("a\nb", 2), ("a\n\nb\n", 3)]
+)
+def test_count_lines(tmp_path, content, expected):
+    filename = tmp_path / "data.jsonl"
+    filename.write_text(content)
+    assert count_lines(str(filename), chunk_size=2) == expected
+
+
+@pytest.mark.parametrize("num_shards", [1, 2, 3, 7])
+def test_iter_data_shards(tmp_path, num_shards):
+    filename = tmp_path / "data.jsonl"
+    filename.write_text(
+        "".join(f'{{"id": {i}, "text": "{"x" * i}"}}\n' for i in range(10)) + "\n"
+    )
+
+    samples = [
+        sample["id"]
+        for shard in range(num_shards)
+        for sample in iter_data(str(filename), shard, num_shards)
+    ]
+    assert samples == list(range(10))
+
+
+def test_build_schema_client_vectors():
+    schema = build_schema(client_vectors=True)
+    document_class, paragraph_class = schema["classes"]
+
+    assert document_class["vectorizer"] == "none"
+    assert all("moduleConfig" not in p for p in document_class["properties"])
+    assert paragraph_class["vectorizer"] == "text2vec-transformers"
+    assert build_schema() == DEFAULT_SCHEMA
+
+
+def test_build_schema_flat_links():
+    schema = build_schema(flat_links=True)
+    document_class, paragraph_class = schema["classes"]
+
+    assert "hasParagraphs" not in [p["name"] for p in document_class["properties"]]
+    assert [p["name"] for p in paragraph_class["properties"]] == [
+        "text",
+        "order",
+        "documentId",
+        "documentTitle",
+        "documentUrl",
+    ]
+
+
+def test_build_schema_cluster():
+    for object_class in build_schema(shards=3, virtual_per_physical=64, replicas=2)[
+        "classes"
+    ]:
+        assert object_class["shardingConfig"] == {
+            "desiredCount": 3,
+            "virtualPerPhysical": 64,
+        }
+        assert object_class["replicationConfig"] == {"factor": 2}
+
+    with pytest.raises(ValueError):
+        build_schema(replicas=0)
+
+
+def test_build_schema_tenant():
+    document_class, paragraph_class = build_schema(tenant="acme")["classes"]
+    assert document_class["class"] == "AcmeDocument"
+    assert paragraph_class["class"] == "AcmeParagraph"
+    assert {"name": "inDocument", "dataType": ["AcmeDocument"]} in paragraph_class[
+        "properties"
+    ]
+    assert get_collection() == get_collection(None)
+
+    with pytest.raises(ValueError):
+        get_collection("acme corp")
+
+
+@pytest.mark.parametrize("profile", list(INDEX_PROFILES))
+def test_build_schema_index_profile(profile):
+    schema = build_schema(index_profile=profile)
+
+    for object_class in schema["classes"]:
+        assert object_class["vectorIndexConfig"] == INDEX_PROFILES[profile]
+    assert build_schema(index_profile="high-recall") == DEFAULT_SCHEMA
+
+    with pytest.raises(ValueError):
+        build_schema(index_profile="unknown")
+
+
 def test_create_default_schema(client: Client):
     create_schema(client)
     assert client.schema.exists("Document")
@@ -59,7 +167,11 @@ def test_create_default_schema_overwrite(client: Client):
 
 def test_import_data(client, test_data):
     create_schema(client)
-    import_data(client, test_data)
+    stats = import_data(client, test_data)
+
+    assert stats.documents == 1
+    assert stats.objects == 4
+    assert stats.failures == 0
 
     assert (
         len(client.query.get("Document", "title").do()["data"]["Get"]["Document"]) == 1
@@ -69,6 +181,51 @@ def test_import_data(client, test_data):
     )
 
 
+def test_import_data_incremental(client, test_data):
+    create_schema(client)
+    import_data(client, test_data)
+
+    stats = import_data(client, test_data, incremental=True)
+    assert (stats.documents, stats.skipped, stats.deleted) == (0, 1, 0)
+
+    changed = dict(test_data[0], paragraphs=test_data[0]["paragraphs"][:2])
+    other = {"url": "https://example.com", "title": "Other", "paragraphs": ["Text."]}
+    stats = import_data(client, [changed, other], incremental=True)
+    assert (stats.documents, stats.skipped, stats.deleted) == (2, 0, 0)
+    paragraphs = client.query.get("Paragraph", "text").do()["data"]["Get"]["Paragraph"]
+    assert len(paragraphs) == 3
+
+    stats = import_data(client, [other], incremental=True)
+    assert (stats.documents, stats.skipped, stats.deleted) == (0, 1, 1)
+    paragraphs = client.query.get("Paragraph", "text").do()["data"]["Get"]["Paragraph"]
+    assert paragraphs == [{"text": "Text."}]
+
+
+def test_content_hash(test_data):
+    document = test_data[0]
+
+    assert content_hash(document) == content_hash(dict(document))
+    assert content_hash(document) != content_hash(dict(document, title="Other"))
+
+
+def test_import_data_pool_document_vectors(client, test_data):
+    create_schema(client)
+    import_data(client, test_data, pool_document_vectors=True)
+
+    documents = (client.query.get("Document", "title").with_additional("vector").do())[
+        "data"
+    ]["Get"]["Document"]
+    paragraphs = (client.query.get("Paragraph", "text").with_additional("vector").do())[
+        "data"
+    ]["Get"]["Paragraph"]
+
+    expected = [
+        sum(components) / len(paragraphs)
+        for components in zip(*(p["_additional"]["vector"] for p in paragraphs))
+    ]
+    assert documents[0]["_additional"]["vector"] == pytest.approx(expected, abs=1e-5)
+
+
 def test_ask_question(client, test_data):
     create_schema(client)
     import_data(client, test_data)
@@ -81,6 +238,17 @@ def test_ask_question(client, test_data):
     assert answer.certainty > 0
 
 
+def test_ask_questions(client, test_data):
+    create_schema(client)
+    import_data(client, test_data)
+
+    questions = ["What is an anarchism?", "You shouldn't find any answers. Really."]
+    answers = ask_questions(client, questions)
+
+    assert [answer.has_answer for answer in answers] == [True, False]
+    assert answers[0] == ask_question(client, questions[0])
+
+
 def test_ask_question_not_found(client, test_data):
     create_schema(client)
     import_data(client, test_data)
@@ -91,3 +259,144 @@ def test_ask_question_not_found(client, test_data):
     assert answer.support_text is None
     assert answer.answer is None
     assert answer.certainty is None
+
+
+def test_ask_question_async(client, test_data):
+    create_schema(client)
+    import_data(client, test_data)
+
+    answer = asyncio.run(ask_question_async(client, "What is an anarchism?"))
+
+    assert answer.has_answer
+    assert answer.answer
+
+
+def test_ask_question_single_stage(client, test_data):
+    create_schema(client)
+    import_data(client, test_data)
+
+    answer = ask_question(client, "What is an anarchism?", retrieval="single-stage")
+
+    assert answer.has_answer
+    assert answer.source.title == "Anarchism"
+    assert answer.answer
+
+
+@pytest.mark.parametrize("confident_certainty", [None, 0.0, 1.1])
+def test_ask_question_top_k(client, test_data, confident_certainty):
+    create_schema(client)
+    import_data(client, test_data)
+
+    answer = ask_question(
+        client,
+        "What is an anarchism?",
+        top_k=2,
+        confident_certainty=confident_certainty,
+    )
+
+    assert answer.has_answer
+    assert answer.certainty >= ask_question(client, "What is an anarchism?").certainty
+
+
+def test_ask_question_flat_links(client, test_data):
+    create_schema(client, build_schema(flat_links=True))
+    import_data(client, test_data, flat_links=True)
+
+    answer = ask_question(client, "What is an anarchism?", flat_links=True)
+
+    assert answer.has_answer
+    assert answer.source.title == "Anarchism"
+    assert answer.answer
+
+
+def test_import_data_parallel_timings(fake, fake_client, test_data, tmp_path):
+    source = str(tmp_path / "source.jsonl")
+    write_jsonl(test_data * 4, source)
+    create_schema(fake_client)
+
+    counts = []
+    for _ in range(3):
+        import_data_parallel(fake.url, source, 2)
+        counts.append(REGISTRY.histograms["import.total"].count)
+
+    # Every import adds timings of its own shards only.
+    assert counts[1] - counts[0] == counts[2] - counts[1] == 2
+
+
+def test_import_incremental_deletes_missing(fake, fake_client, articles):
+    create_schema(fake_client)
+    import_data(fake_client, articles, incremental=True)
+    stats = import_data(fake_client, articles[:3], incremental=True)
+
+    assert stats.skipped == 3
+    assert stats.deleted == 2
+    assert fake.count("Document") == 3
+    assert fake.count("Paragraph") == 9
+
+
+def test_ask_thresholds(fake, fake_client, articles):
+    create_schema(fake_client, overwrite=True)
+    import_data(fake_client, articles)
+
+    answer = ask_question(fake_client, "Which paragraph?")
+    assert answer.has_answer
+    assert answer.score is not None
+
+    # Questions below the score threshold are not asked.
+    requests = fake.requests
+    skipped = ask_question(
+        fake_client, "Which paragraph?", skip_below=answer.score + 0.01
+    )
+    assert fake.requests - requests == 1
+    assert skipped == Answer(False, score=answer.score)
+
+    assert (
+        ask_question(fake_client, "Which paragraph?", skip_below=answer.score) == answer
+    )
+    assert ask_question(
+        fake_client, "Which paragraph?", min_certainty=answer.certainty + 0.01
+    ) == Answer(False, score=answer.score)
+
+
+def test_tenants(fake, fake_client, articles, tmp_path):
+    create_schema(fake_client, overwrite=True)
+    import_data(fake_client, articles)
+    create_schema(fake_client, tenant="acme", overwrite=True)
+    import_data(fake_client, articles[:2], tenant="acme")
+    assert fake.count("AcmeDocument") == 2
+    assert fake.count("AcmeParagraph") == 6
+
+    # Questions are routed to the classes of their tenant.
+    answer = ask_question(fake_client, "Which article?", tenant="acme")
+    assert answer.source.title in ("Article 0", "Article 1")
+    export_index(fake_client, str(tmp_path), tenant="acme")
+
+    # Rebuilding a tenant keeps other knowledge bases.
+    create_schema(fake_client, tenant="acme", overwrite=True)
+    assert fake.count("AcmeDocument") == 0
+    assert fake.count("Document") == 5
+    import_data(fake_client, str(tmp_path), tenant="acme")
+    assert fake.count("AcmeParagraph") == 6
+
+    assert delete_schema(fake_client, "acme")
+    assert not fake_client.schema.exists("AcmeDocument")
+    assert fake.count("Document") == 5
+    assert not delete_schema(fake_client, "acme")
+
+
+def test_import_data_parallel_node_urls(articles, tmp_path):
+    source = str(tmp_path / "source.jsonl")
+    write_jsonl(articles, source)
+    with FakeWeaviate() as first, FakeWeaviate() as second:
+        for node in (first, second):
+            create_schema(Client(node.url))
+        stats = import_data_parallel(
+            first.url, source, 2, node_urls=[first.url, second.url]
+        )
+
+        # Every process sends its shard of file to its own node.
+        assert [s.documents for s in stats] == [
+            first.count("Document"),
+            second.count("Document"),
+        ]
+        assert first.count("Document") > 0 and second.count("Document") > 0
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from brainlet.embedding import Encoder
+
+
+@pytest.fixture(scope="module")
+def encoder() -> Encoder:
+    return Encoder(batch_size=2)
+
+
+def test_encode(encoder: Encoder):
+    vectors = encoder.encode(
+        ["what is anarchism?", "Anarchism is a political philosophy.", "albedo"]
+    )
+
+    assert vectors.shape == (3, 384)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_encode_empty(encoder: Encoder):
+    assert encoder.encode([]).shape == (0, 384)
@@ -0,0 +1,46 @@
+import pytest
+from weaviate import Client
+
+from brainlet.core import (
+    ask_question,
+    build_schema,
+    create_schema,
+    import_data,
+    iter_objects,
+)
+from brainlet.export import export_index, load_export_vectors
+from brainlet.testing.fake_weaviate import FakeWeaviate
+
+
+@pytest.mark.parametrize("flat_links", [False, True])
+def test_export_and_import(fake, fake_client, articles, tmp_path, flat_links):
+    create_schema(fake_client, build_schema(flat_links=flat_links))
+    import_data(fake_client, articles, flat_links=flat_links)
+    paragraphs = {
+        obj["_additional"]["id"]: obj
+        for obj in iter_objects(fake_client, "Paragraph", ["text"], with_vector=True)
+    }
+
+    meta = export_index(fake_client, str(tmp_path), page_size=4)
+    assert meta["classes"]["Document"]["count"] == 5
+    assert meta["classes"]["Paragraph"]["count"] == 15
+    assert load_export_vectors(str(tmp_path), "Paragraph").shape == (15, 1)
+
+    with FakeWeaviate() as target:
+        target_client = Client(target.url)
+        stats = import_data(target_client, str(tmp_path), flat_links=flat_links)
+
+        assert stats.documents == 5
+        assert stats.objects == 20
+        imported = {
+            obj["_additional"]["id"]: obj
+            for obj in iter_objects(
+                target_client, "Paragraph", ["text"], with_vector=True
+            )
+        }
+        assert imported == paragraphs
+        answer = ask_question(target_client, "Which article?", flat_links=flat_links)
+        assert answer.source.title.startswith("Article")
+
+        with pytest.raises(ValueError):
+            import_data(target_client, str(tmp_path), flat_links=not flat_links)
@@ -0,0 +1,39 @@
+import pytest
+
+from brainlet.core import (
+    ask_question,
+    build_schema,
+    create_schema,
+    import_data,
+    iter_objects,
+)
+from brainlet.testing.fake_weaviate import parse_get_query
+
+
+def test_parse_get_query():
+    query = (
+        '{Get {first: Paragraph(where: {path: ["id"] operator: Equal valueString: "a{"}) '
+        "{text _additional {id}} Document (limit: 1) {title}}}"
+    )
+    assert [
+        (alias, name, fields) for alias, name, _, fields in parse_get_query(query)
+    ] == [
+        ("first", "Paragraph", "text _additional {id}"),
+        ("Document", "Document", "title"),
+    ]
+
+
+@pytest.mark.parametrize("flat_links", [False, True])
+def test_import_and_ask(fake, fake_client, articles, flat_links):
+    create_schema(fake_client, build_schema(flat_links=flat_links))
+    stats = import_data(fake_client, articles, batch_size=4, flat_links=flat_links)
+
+    assert stats.documents == 5
+    assert fake.count("Document") == 5
+    assert fake.count("Paragraph") == 15
+    assert len(list(iter_objects(fake_client, "Paragraph", page_size=4))) == 15
+
+    answer = ask_question(fake_client, "Which article?", flat_links=flat_links)
+    assert answer.has_answer
+    assert answer.source.title.startswith("Article")
+    assert answer.source.url in {document["url"] for document in articles}
@@ -0,0 +1,27 @@
+import pytest
+
+from brainlet import jsonl
+from brainlet.jsonl import read_jsonl, write_jsonl
+
+SAMPLES = [
+    {"url": str(i), "title": "Título", "paragraphs": ["a", "b"]} for i in range(5)
+]
+
+
+@pytest.mark.parametrize("extension", ["", ".gz", ".bz2"])
+def test_write_read_jsonl(tmp_path, extension):
+    filename = str(tmp_path / f"data.jsonl{extension}")
+
+    assert write_jsonl(iter(SAMPLES), filename, chunk_size=2) == len(SAMPLES)
+    assert list(read_jsonl(filename)) == SAMPLES
+
+    write_jsonl(SAMPLES[:1], filename, append=True)
+    assert list(read_jsonl(filename)) == SAMPLES + SAMPLES[:1]
+
+
+def test_stdlib_backend(tmp_path, monkeypatch):
+    fast_dumps = [jsonl.dumps(sample) for sample in SAMPLES]
+    monkeypatch.setattr(jsonl, "orjson", None)
+
+    assert [jsonl.dumps(sample) for sample in SAMPLES] == fast_dumps
+    assert [jsonl.loads(line) for line in fast_dumps] == SAMPLES
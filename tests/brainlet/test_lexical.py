@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from brainlet.core import ask_question, create_schema, import_data
+from brainlet.lexical import LexicalIndex, LexicalIndexBuilder, tokenize
+
+DOCUMENTS = [
+    ("id-anarchism", "Anarchism", "Anarchism is a political philosophy and movement."),
+    (
+        "id-albedo",
+        "Albedo",
+        "Albedo is the measure of diffuse reflection of solar radiation.",
+    ),
+    (
+        "id-politics",
+        "Political science",
+        "Political science studies politics and anarchism.",
+    ),
+]
+
+
+@pytest.fixture()
+def index_directory(tmp_path):
+    builder = LexicalIndexBuilder()
+    for document_id, title, text in DOCUMENTS:
+        builder.add(document_id, title, text)
+    builder.save(str(tmp_path))
+    return str(tmp_path)
+
+
+def test_tokenize():
+    assert tokenize("What is the Albedo of Earth?") == ["albedo", "earth"]
+
+
+def test_search(index_directory):
+    index = LexicalIndex(index_directory)
+    assert len(index) == 3
+
+    found = index.search("solar reflection", 10)
+    assert [document for document, _ in found] == [1]
+    # Title matches are weighted higher than text ones.
+    assert [d for d, _ in index.search("anarchism politics", 10)] == [0, 2]
+    assert index.search("unknown words", 10) == []
+
+
+@pytest.mark.parametrize(
+    "question, ids, confident",
+    [
+        ("what is anarchism?", ["id-anarchism", "id-politics"], True),
+        ("what does political science study?", ["id-politics", "id-anarchism"], True),
+        ("which philosophy is political?", ["id-politics", "id-anarchism"], False),
+        ("what is it?", [], False),
+    ],
+)
+def test_lookup(index_directory, question, ids, confident):
+    match = LexicalIndex(index_directory, candidates=2).lookup(question)
+    assert match.ids == ids
+    assert match.confident == confident
+
+
+def test_lookup_returns_top_k(index_directory):
+    match = LexicalIndex(index_directory, candidates=0).lookup("anarchism politics", 2)
+    assert match.ids == ["id-anarchism", "id-politics"]
+
+
+def test_builder_spills_runs(index_directory, tmp_path):
+    tmp_dir = tmp_path / "tmp"
+    tmp_dir.mkdir()
+    builder = LexicalIndexBuilder(run_size=2, tmp_dir=str(tmp_dir))
+    for document_id, title, text in DOCUMENTS:
+        builder.add(document_id, title, text)
+    assert builder.fields["text"].runs > 1
+    builder.save(str(tmp_path / "index"))
+
+    expected = LexicalIndex(index_directory)
+    spilled = LexicalIndex(str(tmp_path / "index"))
+    assert list(spilled.ids) == list(expected.ids)
+    for name, field in expected.fields.items():
+        for part, values in field.items():
+            assert np.array_equal(spilled.fields[name][part], values)
+    # Temporary files are removed.
+    assert os.listdir(tmp_dir) == []
+
+
+def test_ask_lexical_index(fake, fake_client, articles, tmp_path):
+    create_schema(fake_client)
+    import_data(fake_client, articles, lexical_index=str(tmp_path))
+    lexical_index = LexicalIndex(str(tmp_path), candidates=2)
+
+    # Confident title match is asked without hybrid search.
+    requests = fake.requests
+    answer = ask_question(
+        fake_client, "What is in Article 3?", lexical_index=lexical_index
+    )
+    assert fake.requests - requests == 1
+    assert answer.source.title == "Article 3"
+
+    requests = fake.requests
+    answer = ask_question(fake_client, "Which paragraph?", lexical_index=lexical_index)
+    assert fake.requests - requests == 2
+    assert answer.has_answer
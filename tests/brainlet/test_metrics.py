@@ -0,0 +1,85 @@
+import pytest
+
+from brainlet.metrics import Histogram, Registry
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in [0.05, 0.5, 0.5, 2.0]:
+        histogram.observe(value)
+
+    assert histogram.bucket_counts == [1, 3]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.05)
+    assert histogram.percentile(50) == pytest.approx(0.5)
+
+
+def test_registry_timer_and_hooks():
+    registry = Registry()
+    observed = []
+    registry.add_hook(lambda stage, seconds: observed.append(stage))
+
+    with registry.timer("ask.total"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.timer("ask.total"):
+            raise ValueError
+
+    assert registry.histograms["ask.total"].count == 2
+    assert observed == ["ask.total", "ask.total"]
+
+
+def test_registry_merge():
+    first, second = Registry(), Registry()
+    first.observe("import.total", 1.0)
+    second.observe("import.total", 2.0)
+
+    first.merge(second.samples())
+
+    assert first.histograms["import.total"].count == 2
+    assert first.histograms["import.total"].sum == pytest.approx(3.0)
+
+
+def test_registry_merge_beyond_window():
+    first, second = Registry(), Registry()
+    observed = []
+    first.add_hook(lambda stage, seconds: observed.append(stage))
+    window = Histogram().recent.maxlen
+    for _ in range(window + 5):
+        second.observe("import.add_document", 0.02)
+
+    first.merge(second.samples())
+
+    histogram = first.histograms["import.add_document"]
+    assert histogram.count == window + 5
+    assert histogram.sum == pytest.approx(0.02 * (window + 5))
+    assert histogram.bucket_counts[histogram.buckets.index(0.025)] == window + 5
+    assert len(histogram.recent) == window
+    assert observed == []
+
+
+def test_registry_prometheus():
+    registry = Registry()
+    registry.observe("ask.total", 0.2)
+
+    text = registry.prometheus()
+
+    assert "# TYPE brainlet_stage_duration_seconds histogram" in text
+    assert (
+        'brainlet_stage_duration_seconds_bucket{stage="ask.total",le="0.25"} 1' in text
+    )
+    assert (
+        'brainlet_stage_duration_seconds_bucket{stage="ask.total",le="0.1"} 0' in text
+    )
+    assert 'brainlet_stage_duration_seconds_count{stage="ask.total"} 1' in text
+
+
+def test_registry_summary():
+    registry = Registry()
+    registry.observe("ask.total", 0.2)
+    registry.observe("import.total", 1.0)
+
+    summary = registry.summary("ask.")
+
+    assert "ask.total" in summary
+    assert "import.total" not in summary